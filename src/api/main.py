@@ -89,7 +89,7 @@ except Exception as e:
     print(f"Warning: Milvus HTTP client error - {e}")
 
 try:
-    from src.query_processing.query_parser import QueryParser
+    from src.query_processing.query_parser import get_query_parser
     QUERY_PARSER_AVAILABLE = True
 except ImportError:
     QUERY_PARSER_AVAILABLE = False
@@ -616,8 +616,7 @@ async def lifespan(app: FastAPI):
         # Try to initialize query parser
         if QUERY_PARSER_AVAILABLE:
             try:
-                from src.query_processing.query_parser import QueryParser
-                query_parser = QueryParser()
+                query_parser = get_query_parser()
                 app_logger.info("✅ Query parser initialized")
             except Exception as e:
                 app_logger.error(f"Failed to initialize query parser: {e}")
@@ -676,8 +675,13 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     try:
+        if retrieval_engine is not None and hasattr(retrieval_engine, "close"):
+            await retrieval_engine.close()
         if milvus_client:
-            milvus_client.close()
+            if hasattr(milvus_client, "aclose"):
+                await milvus_client.aclose()
+            else:
+                milvus_client.close()
         app_logger.info("API shutdown completed")
     except Exception as e:
         app_logger.error(f"Error during shutdown: {e}")
@@ -996,7 +1000,8 @@ async def process_query(request: QueryRequest, background_tasks: BackgroundTasks
             if MILVUS_AVAILABLE:
                 try:
                     from src.vector_db.milvus_http_client import MilvusHTTPClient
-                    milvus_client_instance = MilvusHTTPClient()
+                    # Reuse the app-wide pooled client when startup created one
+                    milvus_client_instance = milvus_client or MilvusHTTPClient()
                     cuisine = parsed_query.get('cuisine_type', 'Italian')
                     location = parsed_query.get('location', 'Manhattan')
                     
@@ -1031,6 +1036,7 @@ async def process_query(request: QueryRequest, background_tasks: BackgroundTasks
                             app_logger.info(f"🔍 Raw record {i} top_dish_name: {rec.get('top_dish_name')}")
                             app_logger.info(f"🔍 Raw record {i} dish_name: {rec.get('dish_name')}")
                             
+                            final_score = float(rec.get('final_score', rec.get('top_dish_final_score', 0.8)))
                             formatted_rec = {
                                 "id": rec.get('restaurant_id', f"rec_{i}"),
                                 "restaurant_name": rec.get('restaurant_name', 'Restaurant'),
@@ -1038,11 +1044,11 @@ async def process_query(request: QueryRequest, background_tasks: BackgroundTasks
                                 "cuisine_type": rec.get('cuisine_type', cuisine),
                                 "neighborhood": rec.get('neighborhood', neighborhood or location),
                                 "description": _generate_dish_description(rec, neighborhood or location),  # Generate better description
-                                "final_score": float(rec.get('final_score', rec.get('top_dish_final_score', 0.8))),  # Use correct field name
+                                "final_score": final_score,  # Use correct field name
                                 "rating": float(rec.get('rating', 4.5)),  # Use actual rating from data
                                 "price_range": rec.get('price_range', "$$"),  # Use actual price range if available
                                 "source": "milvus_http_search",  # This tells UI it's from HTTP client
-                                "confidence": float(rec.get('final_score', rec.get('top_dish_final_score', 0.8))),  # Use correct field name
+                                "confidence": final_score,  # Use correct field name
                                 # Keep original fields for compatibility
                                 "topic_score": float(rec.get('topic_score', rec.get('top_dish_topic_mentions', 0.0))),  # Use correct field name
                                 "recommendation_score": float(rec.get('recommendation_score', rec.get('hybrid_quality_score', 0.8)))  # Use correct field name
@@ -8,6 +8,23 @@ import redis.asyncio as redis
 from src.utils.config import get_settings
 from src.utils.logger import app_logger
 
+# Faster JSON (de)serialization for cached values when orjson is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_dumps(value: Any) -> bytes:
+    """Serialize a value to JSON bytes, accepting non-string dict keys like json.dumps."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value).encode('utf-8')
+
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
 
 class CacheManager:
     """Redis cache manager for storing API responses and processed data."""
@@ -88,7 +105,7 @@ class CacheManager:
         try:
             value = await self.redis_client.get(key)
             if value:
-                return json.loads(value.decode('utf-8'))
+                return _json_loads(value)
             return None
         except Exception as e:
             # Don't log cache errors as they're expected when Redis is not available
@@ -100,7 +117,7 @@ class CacheManager:
             return False
         
         try:
-            serialized_value = json.dumps(value)
+            serialized_value = _json_dumps(value)
             await self.redis_client.setex(key, expire, serialized_value)
             return True
         except Exception as e:
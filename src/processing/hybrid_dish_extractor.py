@@ -129,12 +129,12 @@ class HybridDishExtractor:
         location_expansions = self.complexity_detector.get_location_dish_expansions(dish, location)
         
         # Get cuisine-specific expansions from query parser
-        from src.query_processing.query_parser import QueryParser
-        query_parser = QueryParser()
+        from src.query_processing.query_parser import get_query_parser
+        query_parser = get_query_parser()
         cuisine_expansions = query_parser.expand_dish_name(dish, cuisine)
         
         # Combine and prioritize location-specific variants
-        all_expansions = location_expansions + cuisine_expansions
+        all_expansions = [*location_expansions, *cuisine_expansions]
         
         # Remove duplicates while preserving order
         seen = set()
@@ -3,8 +3,12 @@ Enhanced Retrieval Engine for Discovery Collections and traditional collections.
 Handles both the new AI-driven discovery data and existing restaurant/dish data.
 """
 import asyncio
+import functools
+import heapq
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import List, Dict, Optional, Any, Tuple
-from openai import AsyncOpenAI
 from src.utils.config import get_settings
 from src.utils.logger import app_logger
 from src.vector_db.milvus_client import MilvusClient
@@ -12,6 +16,169 @@ from src.vector_db.discovery_collections import DiscoveryCollections
 from src.query_processing.retrieval_engine import RetrievalEngine
 
 
+# Embedding micro-batching: flush after this many texts or this many seconds
+EMBED_MAX_BATCH = 32
+EMBED_MAX_LATENCY = 0.01
+
+# Result cache for discovery search helpers
+RESULT_CACHE_MAX_SIZE = 512
+RESULT_CACHE_TTL_SECONDS = 300
+
+# Areas covered by the discovery collections; OpenAI fallback is skipped for these
+SUPPORTED_LOCATIONS = frozenset({"Manhattan", "Jersey City", "Hoboken"})
+SUPPORTED_CUISINES = frozenset({"Italian", "Indian", "Chinese", "American", "Mexican"})
+
+# Parser confidence at which restaurant_name is treated as an exact name
+EXACT_NAME_CONFIDENCE = 0.9
+
+# Fields read by the result converters; avoids pulling embeddings and embedding_text
+FAMOUS_FIELDS = (
+    "restaurant_name", "famous_dish", "city", "neighborhood", "cuisine_type",
+    "fame_score", "dish_popularity", "rating", "review_count", "quality_score",
+    "price_range", "cultural_significance", "restaurant_id"
+)
+POPULAR_FIELDS = (
+    "dish_name", "city", "primary_cuisine", "popularity_score", "frequency",
+    "avg_sentiment", "restaurant_count", "cultural_significance", "reasoning",
+    "confidence_score"
+)
+NEIGHBORHOOD_FIELDS = (
+    "restaurant_name", "restaurant_id", "neighborhood", "cuisine_type", "top_dish_name",
+    "top_dish_sentiment_score", "top_dish_final_score", "top_dish_topic_mentions",
+    "rating", "restaurant_rank", "hybrid_quality_score", "total_dishes", "analysis_confidence"
+)
+
+
+def _fail_pending(batch: List[Tuple[str, asyncio.Future]], error: BaseException) -> None:
+    """Fail every still-waiting caller in an embedding batch with the given error."""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+def _cached_results(method):
+    """Cache a discovery helper's converted results in the engine's bounded TTL LRU.
+
+    Keys are the helper name plus its arguments, with strings lower-cased and
+    stripped so equivalent queries share an entry. Empty results (which is also
+    what the helpers return on error) are never cached.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        def canonical(value):
+            return value.strip().lower() if isinstance(value, str) else value
+        
+        key = (
+            method.__name__,
+            tuple(canonical(a) for a in args),
+            tuple(sorted((k, canonical(v)) for k, v in kwargs.items()))
+        )
+        
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            cached_at, results = cached
+            if time.monotonic() - cached_at < RESULT_CACHE_TTL_SECONDS:
+                self._result_cache.move_to_end(key)
+                return [dict(r) for r in results]
+            del self._result_cache[key]
+        
+        results = await method(self, *args, **kwargs)
+        if results:
+            self._result_cache[key] = (time.monotonic(), [dict(r) for r in results])
+            if len(self._result_cache) > RESULT_CACHE_MAX_SIZE:
+                self._result_cache.popitem(last=False)
+        return results
+    
+    return wrapper
+
+
+@dataclass(slots=True)
+class PopularDishRecommendation:
+    """Popular dish hit; slotted so ranking reads attributes instead of dict keys."""
+    dish_name: str
+    location: str
+    cuisine_type: str
+    popularity_score: float
+    frequency: int
+    avg_sentiment: float
+    restaurant_count: int
+    cultural_significance: str
+    reasoning: str
+    confidence: float
+    similarity_score: float
+    type: str = "popular_dish"
+    restaurant_name: str = "Multiple locations"  # Popular dishes span multiple restaurants
+    restaurant_id: str = ""
+    neighborhood: str = ""
+    source: str = "popular_dish"
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Spelled out rather than dataclasses.asdict, which deep-copies every field;
+        # this runs once per returned hit
+        return {
+            "dish_name": self.dish_name,
+            "location": self.location,
+            "cuisine_type": self.cuisine_type,
+            "popularity_score": self.popularity_score,
+            "frequency": self.frequency,
+            "avg_sentiment": self.avg_sentiment,
+            "restaurant_count": self.restaurant_count,
+            "cultural_significance": self.cultural_significance,
+            "reasoning": self.reasoning,
+            "confidence": self.confidence,
+            "similarity_score": self.similarity_score,
+            "type": self.type,
+            "restaurant_name": self.restaurant_name,
+            "restaurant_id": self.restaurant_id,
+            "neighborhood": self.neighborhood,
+            "source": self.source,
+        }
+
+
+@dataclass(slots=True)
+class FamousRestaurantRecommendation:
+    """Famous restaurant hit; slotted so ranking reads attributes instead of dict keys."""
+    dish_name: str
+    restaurant_name: str
+    restaurant_id: str
+    location: str
+    neighborhood: str
+    cuisine_type: str
+    fame_score: float
+    dish_popularity: float
+    restaurant_rating: float
+    review_count: int
+    quality_score: float
+    price_range: int
+    cultural_significance: str
+    similarity_score: float
+    match_score: float = 1.0  # Default high match for famous restaurants
+    confidence: float = 0.85  # High confidence for famous restaurants
+    type: str = "famous_restaurant"
+    source: str = "famous_restaurant"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dish_name": self.dish_name,
+            "restaurant_name": self.restaurant_name,
+            "restaurant_id": self.restaurant_id,
+            "location": self.location,
+            "neighborhood": self.neighborhood,
+            "cuisine_type": self.cuisine_type,
+            "fame_score": self.fame_score,
+            "dish_popularity": self.dish_popularity,
+            "restaurant_rating": self.restaurant_rating,
+            "review_count": self.review_count,
+            "quality_score": self.quality_score,
+            "price_range": self.price_range,
+            "cultural_significance": self.cultural_significance,
+            "similarity_score": self.similarity_score,
+            "match_score": self.match_score,
+            "confidence": self.confidence,
+            "type": self.type,
+            "source": self.source,
+        }
+
 
 class EnhancedRetrievalEngine(RetrievalEngine):
     """Enhanced retrieval engine with discovery collections support."""
@@ -22,6 +189,36 @@ class EnhancedRetrievalEngine(RetrievalEngine):
         self._embedding_cache = {}
         self.settings = get_settings()
         
+        # Micro-batching queue: concurrent embedding requests share one API call
+        self._embed_queue: Optional[asyncio.Queue] = None
+        self._embed_worker: Optional[asyncio.Task] = None
+        self._embed_batches: set = set()  # in-flight batch tasks, referenced until done
+        
+        # (helper, canonical args) -> (cached_at, results); see _cached_results
+        self._result_cache: "OrderedDict[tuple, Tuple[float, List[Dict]]]" = OrderedDict()
+        
+        # Set by warmup() once every discovery collection has been loaded
+        self._discovery_loaded = False
+    
+    async def close(self):
+        """Stop the embedding batch worker, fail queued requests and close the shared OpenAI client."""
+        for task in [self._embed_worker, *self._embed_batches]:
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._embed_worker = None
+        # Requests still queued would otherwise wait forever on a worker that is gone
+        if self._embed_queue is not None:
+            queued = []
+            while not self._embed_queue.empty():
+                queued.append(self._embed_queue.get_nowait())
+            _fail_pending(queued, RuntimeError("Retrieval engine closed"))
+        await self.client.close()
+        
     async def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text using OpenAI."""
         if not text:
@@ -36,13 +233,13 @@ class EnhancedRetrievalEngine(RetrievalEngine):
         
         try:
             app_logger.debug(f"Generating embedding for text: {text[:50]}...")
-            client = AsyncOpenAI()
-            response = await client.embeddings.create(
-                model="text-embedding-3-small",
-                input=text
-            )
+            if self._embed_worker is None or self._embed_worker.done():
+                self._embed_queue = asyncio.Queue()
+                self._embed_worker = asyncio.create_task(self._embedding_batch_worker())
             
-            embedding = response.data[0].embedding
+            future = asyncio.get_running_loop().create_future()
+            await self._embed_queue.put((text, future))
+            embedding = await future
             self._embedding_cache[cache_key] = embedding
             
             app_logger.debug(f"Successfully generated embedding with {len(embedding)} dimensions")
@@ -52,6 +249,55 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             app_logger.error(f"Error generating embedding: {e}")
             vector_dim = getattr(self.settings, 'vector_dimension', 1536)  # Default to OpenAI embedding dimension
             return [0.0] * vector_dim
+    
+    async def _embedding_batch_worker(self):
+        """Drain queued embedding requests and resolve them with one API call per batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._embed_queue.get()]
+            deadline = loop.time() + EMBED_MAX_LATENCY
+            try:
+                while len(batch) < EMBED_MAX_BATCH:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._embed_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                _fail_pending(batch, RuntimeError("Retrieval engine closed"))
+                raise
+            
+            # API calls run as tasks so a slow one doesn't hold up the next batch window
+            task = asyncio.create_task(self._resolve_embedding_batch(batch))
+            self._embed_batches.add(task)
+            task.add_done_callback(self._embed_batches.discard)
+    
+    async def _resolve_embedding_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Embed one batch with a single API call and hand each vector to its waiting caller."""
+        # Callers that were cancelled while queued aren't sent
+        batch = [(text, future) for text, future in batch if not future.done()]
+        if not batch:
+            return
+        try:
+            response = await self.client.embeddings.create(
+                model="text-embedding-3-small",
+                input=[text for text, _ in batch]
+            )
+            data = sorted(response.data, key=lambda d: d.index)
+            for (_, future), item in zip(batch, data):
+                if not future.done():
+                    future.set_result(item.embedding)
+            # A short response must not leave the unmatched callers waiting forever
+            if len(data) < len(batch):
+                _fail_pending(batch[len(data):], RuntimeError(f"Embedding response had {len(data)} of {len(batch)} vectors"))
+            app_logger.debug(f"Embedded batch of {len(batch)} texts")
+        except asyncio.CancelledError:
+            _fail_pending(batch, RuntimeError("Retrieval engine closed"))
+            raise
+        except Exception as e:
+            _fail_pending(batch, e)
         
     async def get_recommendations(self, parsed_query: Dict[str, Any], max_results: int = 10) -> Tuple[List[Dict], bool, Optional[str]]:
         """Get recommendations using enhanced discovery collections + fallback to traditional."""
@@ -68,6 +314,15 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             if discovery_results:
                 app_logger.info("✅ Using discovery collections with OpenAI enhancement")
                 return discovery_results, False, None
+            elif (parsed_query.get("location") in SUPPORTED_LOCATIONS
+                    and parsed_query.get("cuisine_type") in SUPPORTED_CUISINES):
+                # Supported area: retry discovery with the broader famous-restaurants search
+                # instead of paying for GPT-4o
+                app_logger.info("🔁 Supported location and cuisine, retrying discovery with famous restaurants")
+                famous_restaurants = await self._get_discovery_famous_restaurants(parsed_query, max_results)
+                if famous_restaurants:
+                    return famous_restaurants, False, None
+                return [], True, "No discovery results for supported location and cuisine"
             else:
                 app_logger.info("🤖 Using OpenAI fallback for intelligent recommendations")
                 return await self._get_openai_fallback_recommendations(parsed_query, max_results)
@@ -114,7 +369,7 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             
             # 1. Get neighborhood analysis results (Phase 2 data)
             collection_name = 'discovery_neighborhood_analysis'
-            if self.milvus_client.has_collection(collection_name):
+            if await asyncio.to_thread(self.milvus_client.has_collection, collection_name):
                 # Build filter expression
                 filter_expr = f'city == "{city}" and cuisine_type == "{cuisine_type}"'
                 if neighborhood:
@@ -125,12 +380,13 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                 query_vector = await self._generate_embedding(embedding_text)
                 
                 # Search using Milvus client
-                results = self.milvus_client.search_collection(
+                results = await asyncio.to_thread(
+                    self.milvus_client.search_collection,
                     collection_name=collection_name,
                     query_vector=query_vector,
                     filter_expr=filter_expr,
                     limit=max_results,
-                    output_fields=["*"]
+                    output_fields=list(NEIGHBORHOOD_FIELDS)
                 )
                 
                 if results and results[0]:
@@ -163,6 +419,7 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                                 continue
                             seen_restaurants.add(restaurant_key)
                             
+                            final_score = float(get_field(entity, 'top_dish_final_score', 0.0))
                             recommendation = {
                                 "type": "discovery_dish",
                                 "dish_name": get_field(entity, 'top_dish_name', 'Unknown'),
@@ -172,8 +429,8 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                                 "neighborhood": get_field(entity, 'neighborhood', ''),
                                 "cuisine_type": cuisine_type,
                                 "sentiment_score": float(get_field(entity, 'top_dish_sentiment_score', 0.0)),
-                                "recommendation_score": float(get_field(entity, 'top_dish_final_score', 0.0)),
-                                "final_score": float(get_field(entity, 'top_dish_final_score', 0.0)),
+                                "recommendation_score": final_score,
+                                "final_score": final_score,
                                 "topic_mentions": int(get_field(entity, 'top_dish_topic_mentions', 0)),
                                 "restaurant_rating": float(get_field(entity, 'rating', 0.0)),
                                 "restaurant_rank": int(get_field(entity, 'restaurant_rank', 1)),
@@ -186,11 +443,11 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                             recommendations.append(recommendation)
             
             # 2. Add famous restaurants for this cuisine (Phase 1 data) - PRIORITY
-            famous_restaurants = await self._get_famous_restaurants_by_cuisine(city, cuisine_type, max_results // 2)
+            famous_restaurants = await self._search_famous(city=city, cuisine=cuisine_type, max_results=max_results // 2)
             recommendations.extend(famous_restaurants)
             
             # 3. Add popular dishes for this cuisine (Phase 1 data)
-            popular_dishes = await self._get_popular_dishes_by_cuisine(city, cuisine_type, max_results // 4)
+            popular_dishes = await self._search_popular(city=city, cuisine=cuisine_type, max_results=max_results // 4)
             recommendations.extend(popular_dishes)
             
             # Remove duplicates and sort by quality
@@ -247,7 +504,7 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             
             # 1. Search neighborhood analysis for dishes (Phase 2 data)
             collection_name = 'discovery_neighborhood_analysis'
-            if self.milvus_client.has_collection(collection_name):
+            if await asyncio.to_thread(self.milvus_client.has_collection, collection_name):
                 # Build filter for city and dish name (fuzzy match)
                 filter_expr = f'city == "{city}" and top_dish_name like "%{dish_name}%"'
                 
@@ -256,12 +513,13 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                 query_vector = await self._generate_embedding(embedding_text)
                 
                 # Search using Milvus client
-                results = self.milvus_client.search_collection(
+                results = await asyncio.to_thread(
+                    self.milvus_client.search_collection,
                     collection_name=collection_name,
                     query_vector=query_vector,
                     filter_expr=filter_expr,
                     limit=max_results,
-                    output_fields=["*"]
+                    output_fields=list(NEIGHBORHOOD_FIELDS)
                 )
                 
                 if results and results[0]:
@@ -291,6 +549,7 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                             dish_query = dish_name.lower()
                             match_score = 1.0 if dish_query in dish_in_data or dish_in_data in dish_query else 0.5
                             
+                            final_score = float(get_field(entity, 'top_dish_final_score', 0.0))
                             recommendation = {
                                 "type": "discovery_dish",
                                 "dish_name": get_field(entity, 'top_dish_name', 'Unknown'),
@@ -300,8 +559,8 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                                 "neighborhood": get_field(entity, 'neighborhood', ''),
                                 "cuisine_type": get_field(entity, 'cuisine_type', ''),
                                 "sentiment_score": float(get_field(entity, 'top_dish_sentiment_score', 0.0)),
-                                "recommendation_score": float(get_field(entity, 'top_dish_final_score', 0.0)),
-                                "final_score": float(get_field(entity, 'top_dish_final_score', 0.0)),
+                                "recommendation_score": final_score,
+                                "final_score": final_score,
                                 "topic_mentions": int(get_field(entity, 'top_dish_topic_mentions', 0)),
                                 "restaurant_rating": float(get_field(entity, 'rating', 0.0)),
                                 "restaurant_rank": int(get_field(entity, 'restaurant_rank', 1)),
@@ -314,11 +573,11 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                             recommendations.append(recommendation)
             
             # 2. Add famous restaurants known for this dish (Phase 1 data) - PRIORITY
-            famous_restaurants = await self._get_famous_restaurants_by_dish(city, dish_name, max_results // 2)
+            famous_restaurants = await self._search_famous(city=city, dish=dish_name, max_results=max_results // 2)
             recommendations.extend(famous_restaurants)
             
             # 3. Add popular dishes that match this dish (Phase 1 data)
-            popular_dishes = await self._get_popular_dishes_by_dish(city, dish_name, max_results // 4)
+            popular_dishes = await self._search_popular(city=city, dish=dish_name, max_results=max_results // 4)
             recommendations.extend(popular_dishes)
             
             # Remove duplicates and sort by match score and quality
@@ -373,18 +632,19 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             
             # 1. Get top dishes from neighborhood analysis
             collection_name = 'discovery_neighborhood_analysis'
-            if self.milvus_client.has_collection(collection_name):
+            if await asyncio.to_thread(self.milvus_client.has_collection, collection_name):
                 try:
                     filter_expr = f'city == "{city}"'
                     embedding_text = f"{location} best restaurants"
                     query_vector = await self._generate_embedding(embedding_text)
                     
-                    results = self.milvus_client.search_collection(
+                    results = await asyncio.to_thread(
+                        self.milvus_client.search_collection,
                         collection_name=collection_name,
                         query_vector=query_vector,
                         filter_expr=filter_expr,
                         limit=max_results,
-                        output_fields=["*"]
+                        output_fields=list(NEIGHBORHOOD_FIELDS)
                     )
                     
                     if results and results[0]:
@@ -409,6 +669,7 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                                     continue
                                 seen_restaurants.add(restaurant_key)
                                 
+                                final_score = float(get_field(entity, 'top_dish_final_score', 0.0))
                                 recommendation = {
                                     "type": "discovery_dish",
                                     "dish_name": get_field(entity, 'top_dish_name', 'Unknown'),
@@ -418,8 +679,8 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                                     "neighborhood": get_field(entity, 'neighborhood', ''),
                                     "cuisine_type": get_field(entity, 'cuisine_type', ''),
                                     "sentiment_score": float(get_field(entity, 'top_dish_sentiment_score', 0.0)),
-                                    "recommendation_score": float(get_field(entity, 'top_dish_final_score', 0.0)),
-                                    "final_score": float(get_field(entity, 'top_dish_final_score', 0.0)),
+                                    "recommendation_score": final_score,
+                                    "final_score": final_score,
                                     "restaurant_rating": float(get_field(entity, 'rating', 0.0)),
                                     "restaurant_rank": int(get_field(entity, 'restaurant_rank', 1)),
                                     "hybrid_quality_score": float(get_field(entity, 'hybrid_quality_score', 0.0)),
@@ -434,18 +695,19 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             
             # 2. Get popular dishes for the city
             collection_name = 'discovery_popular_dishes'
-            if self.milvus_client.has_collection(collection_name) and len(recommendations) < max_results:
+            if await asyncio.to_thread(self.milvus_client.has_collection, collection_name) and len(recommendations) < max_results:
                 try:
                     filter_expr = f'city == "{city}"'
                     embedding_text = f"{location} popular dishes"
                     query_vector = await self._generate_embedding(embedding_text)
                     
-                    results = self.milvus_client.search_collection(
+                    results = await asyncio.to_thread(
+                        self.milvus_client.search_collection,
                         collection_name=collection_name,
                         query_vector=query_vector,
                         filter_expr=filter_expr,
                         limit=max_results // 3,
-                        output_fields=["*"]
+                        output_fields=list(POPULAR_FIELDS)
                     )
                     
                     if results and results[0]:
@@ -483,7 +745,7 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                     app_logger.warning(f"Error querying popular dishes collection: {e}")
             
             # 3. Add famous restaurants for the city (Phase 1 data) - PRIORITY
-            famous_restaurants = await self._get_famous_restaurants_by_location(city, max_results // 2)
+            famous_restaurants = await self._search_famous(city=city, max_results=max_results // 2)
             recommendations.extend(famous_restaurants)
             
             # Remove duplicates and sort by various scores
@@ -539,25 +801,33 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             
             # Search famous restaurants by name
             collection_name = 'discovery_famous_restaurants'
-            if not self.milvus_client.has_collection(collection_name):
+            if not await asyncio.to_thread(self.milvus_client.has_collection, collection_name):
                 return []
             
-            # Build filter expression
+            # Confident exact name: scalar lookup skips embedding generation and ANN search
+            if self._has_exact_restaurant_name(parsed_query):
+                exact_matches = await self._get_famous_restaurant_by_exact_name(restaurant_name, city, max_results, confidence=0.9)
+                if exact_matches:
+                    app_logger.info(f"🔍 Discovery restaurant-specific: exact match for '{restaurant_name}'")
+                    return exact_matches
+            
+            # Build filter expression (indexed equality terms before the like scan)
             filter_expr = f'restaurant_name like "%{restaurant_name}%"'
             if city:
-                filter_expr += f' and city == "{city}"'
+                filter_expr = f'city == "{city}" and {filter_expr}'
             
             # Generate embedding for search
             embedding_text = f"{restaurant_name} restaurant {city if city else ''}"
             query_vector = await self._generate_embedding(embedding_text)
             
             # Search using Milvus client
-            results = self.milvus_client.search_collection(
+            results = await asyncio.to_thread(
+                self.milvus_client.search_collection,
                 collection_name=collection_name,
                 query_vector=query_vector,
                 filter_expr=filter_expr,
                 limit=max_results,
-                output_fields=["*"]
+                output_fields=list(FAMOUS_FIELDS)
             )
             
             if not results or not results[0]:
@@ -599,11 +869,13 @@ class EnhancedRetrievalEngine(RetrievalEngine):
                     }
                     recommendations.append(recommendation)
             
-            # Sort by fame score and similarity
-            recommendations.sort(key=lambda r: (r.get("fame_score", 0), r.get("similarity_score", 0)), reverse=True)
-            
             app_logger.info(f"🔍 Discovery restaurant-specific: found {len(recommendations)} results")
-            return recommendations[:max_results]
+            
+            # Top-K by fame score and similarity
+            return heapq.nlargest(
+                max_results, recommendations,
+                key=lambda r: (r.get("fame_score", 0), r.get("similarity_score", 0))
+            )
             
         except Exception as e:
             app_logger.error(f"Error in discovery restaurant-specific search: {e}")
@@ -621,198 +893,151 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             if city and " in " in city:
                 city = city.split(" in ")[0].strip()
             
-            # Build search based on available criteria
-            if city and cuisine_type:
-                return await self._get_famous_restaurants_by_cuisine(city, cuisine_type, max_results)
-            elif city and dish_name:
-                return await self._get_famous_restaurants_by_dish(city, dish_name, max_results)
-            elif city:
-                return await self._get_famous_restaurants_by_location(city, max_results)
-            elif cuisine_type:
-                return await self._get_famous_restaurants_by_cuisine(None, cuisine_type, max_results)
-            elif dish_name:
-                return await self._get_famous_restaurants_by_dish(None, dish_name, max_results)
-            else:
-                # General famous restaurants query
-                return await self._get_all_famous_restaurants(max_results)
+            restaurant_name = parsed_query.get("restaurant_name")
+            if restaurant_name and self._has_exact_restaurant_name(parsed_query):
+                exact_matches = await self._get_famous_restaurant_by_exact_name(restaurant_name, city, max_results)
+                if exact_matches:
+                    return exact_matches
+            
+            # Cuisine takes precedence over dish when both are present
+            return await self._search_famous(
+                city=city,
+                cuisine=cuisine_type,
+                dish=None if cuisine_type else dish_name,
+                max_results=max_results
+            )
                 
         except Exception as e:
             app_logger.error(f"Error in discovery famous restaurants search: {e}")
             return []
     
-    async def _get_famous_restaurants_by_location(self, city: str, max_results: int) -> List[Dict]:
-        """Get famous restaurants in a specific city."""
+    def _has_exact_restaurant_name(self, parsed_query: Dict[str, Any]) -> bool:
+        """Check whether the parser is confident the restaurant name is exact."""
+        confidence = parsed_query.get("confidence") or {}
         try:
-            collection_name = 'discovery_famous_restaurants'
-            if not self.milvus_client.has_collection(collection_name):
-                return []
-            
-            # Build filter for city
-            filter_expr = f'city == "{city}"'
-            
-            # Generate embedding for search
-            embedding_text = f"{city} famous restaurants"
-            query_vector = await self._generate_embedding(embedding_text)
-            
-            # Search using Milvus client
-            results = self.milvus_client.search_collection(
-                collection_name=collection_name,
-                query_vector=query_vector,
-                filter_expr=filter_expr,
-                limit=max_results,
-                output_fields=["*"]
-            )
-            
-            return self._convert_famous_restaurants_results(results, max_results)
-            
-        except Exception as e:
-            app_logger.error(f"Error getting famous restaurants by location: {e}")
-            return []
+            return float(confidence.get("restaurant_name") or 0.0) >= EXACT_NAME_CONFIDENCE
+        except (TypeError, ValueError):
+            return False
     
-    async def _get_famous_restaurants_by_cuisine(self, city: Optional[str], cuisine_type: str, max_results: int) -> List[Dict]:
-        """Get famous restaurants for a specific cuisine."""
+    async def _get_famous_restaurant_by_exact_name(self, restaurant_name: str, city: Optional[str], max_results: int,
+                                                   confidence: float = 0.85) -> List[Dict]:
+        """Look up famous restaurants by exact name with a scalar query instead of ANN search."""
         try:
-            collection_name = 'discovery_famous_restaurants'
-            if not self.milvus_client.has_collection(collection_name):
-                return []
-            
-            # Build filter for cuisine and optionally city
-            filter_expr = f'cuisine_type == "{cuisine_type}"'
+            escaped_name = restaurant_name.replace('"', '\\"')
+            filter_expr = f'restaurant_name == "{escaped_name}"'
             if city:
                 filter_expr += f' and city == "{city}"'
             
-            # Generate embedding for search
-            embedding_text = f"{cuisine_type} famous restaurants {city if city else ''}"
-            query_vector = await self._generate_embedding(embedding_text)
-            
-            # Search using Milvus client
-            results = self.milvus_client.search_collection(
-                collection_name=collection_name,
-                query_vector=query_vector,
+            rows = await asyncio.to_thread(
+                self.milvus_client.query_collection,
+                collection_name='discovery_famous_restaurants',
                 filter_expr=filter_expr,
                 limit=max_results,
-                output_fields=["*"]
+                output_fields=list(FAMOUS_FIELDS)
             )
             
-            return self._convert_famous_restaurants_results(results, max_results)
+            recommendations = [
+                FamousRestaurantRecommendation(
+                    dish_name=row.get('famous_dish', 'Unknown'),
+                    restaurant_name=row.get('restaurant_name', restaurant_name),
+                    restaurant_id=row.get('restaurant_id', ''),
+                    location=row.get('city', city or ''),
+                    neighborhood=row.get('neighborhood', ''),
+                    cuisine_type=row.get('cuisine_type', ''),
+                    fame_score=float(row.get('fame_score', 0.0)),
+                    dish_popularity=float(row.get('dish_popularity', 0.0)),
+                    restaurant_rating=float(row.get('rating', 0.0)),
+                    review_count=int(row.get('review_count', 0)),
+                    quality_score=float(row.get('quality_score', 0.0)),
+                    price_range=int(row.get('price_range', 2)),
+                    cultural_significance=row.get('cultural_significance', ''),
+                    similarity_score=1.0,  # Exact name match
+                    confidence=confidence
+                )
+                for row in rows
+            ]
+            recommendations.sort(key=lambda r: r.fame_score, reverse=True)
+            
+            return [r.to_dict() for r in recommendations[:max_results]]
             
         except Exception as e:
-            app_logger.error(f"Error getting famous restaurants by cuisine: {e}")
+            app_logger.error(f"Error looking up famous restaurant by exact name: {e}")
             return []
     
-    async def _get_famous_restaurants_by_dish(self, city: Optional[str], dish_name: str, max_results: int) -> List[Dict]:
-        """Get famous restaurants known for a specific dish."""
+    @_cached_results
+    async def _search_famous(self, *, city: Optional[str] = None, cuisine: Optional[str] = None,
+                             dish: Optional[str] = None, max_results: int) -> List[Dict]:
+        """Search famous restaurants filtered by whichever of city/cuisine/dish are given."""
         try:
             collection_name = 'discovery_famous_restaurants'
-            if not self.milvus_client.has_collection(collection_name):
+            if not await asyncio.to_thread(self.milvus_client.has_collection, collection_name):
                 return []
             
-            # Build filter for dish and optionally city
-            filter_expr = f'famous_dish like "%{dish_name}%"'
+            # Indexed equality terms before the like scan
+            terms = []
             if city:
-                filter_expr += f' and city == "{city}"'
-            
-            # Generate embedding for search
-            embedding_text = f"{dish_name} famous restaurants {city if city else ''}"
+                terms.append(f'city == "{city}"')
+            if cuisine:
+                terms.append(f'cuisine_type == "{cuisine}"')
+            if dish:
+                terms.append(f'famous_dish like "%{dish}%"')
+            filter_expr = " and ".join(terms) or None
+            
+            if cuisine or dish:
+                embedding_text = f"{cuisine or dish} famous restaurants {city if city else ''}"
+            elif city:
+                embedding_text = f"{city} famous restaurants"
+            else:
+                embedding_text = "famous restaurants recommendations"
             query_vector = await self._generate_embedding(embedding_text)
             
-            # Search using Milvus client
-            results = self.milvus_client.search_collection(
+            results = await asyncio.to_thread(
+                self.milvus_client.search_collection,
                 collection_name=collection_name,
                 query_vector=query_vector,
                 filter_expr=filter_expr,
                 limit=max_results,
-                output_fields=["*"]
+                output_fields=list(FAMOUS_FIELDS)
             )
             
             return self._convert_famous_restaurants_results(results, max_results)
             
         except Exception as e:
-            app_logger.error(f"Error getting famous restaurants by dish: {e}")
+            app_logger.error(f"Error searching famous restaurants: {e}")
             return []
     
-    async def _get_all_famous_restaurants(self, max_results: int) -> List[Dict]:
-        """Get all famous restaurants (general query)."""
-        try:
-            collection_name = 'discovery_famous_restaurants'
-            if not self.milvus_client.has_collection(collection_name):
-                return []
-            
-            # Generate embedding for general search
-            embedding_text = "famous restaurants recommendations"
-            query_vector = await self._generate_embedding(embedding_text)
-            
-            # Search using Milvus client
-            results = self.milvus_client.search_collection(
-                collection_name=collection_name,
-                query_vector=query_vector,
-                filter_expr=None,
-                limit=max_results,
-                output_fields=["*"]
-            )
-            
-            return self._convert_famous_restaurants_results(results, max_results)
-            
-        except Exception as e:
-            app_logger.error(f"Error getting all famous restaurants: {e}")
-            return []
-    
-    async def _get_popular_dishes_by_cuisine(self, city: str, cuisine_type: str, max_results: int) -> List[Dict]:
-        """Get popular dishes for a specific cuisine in a city."""
+    @_cached_results
+    async def _search_popular(self, *, city: str, cuisine: Optional[str] = None,
+                              dish: Optional[str] = None, max_results: int) -> List[Dict]:
+        """Search popular dishes in a city filtered by cuisine or (fuzzy) dish name."""
         try:
             collection_name = 'discovery_popular_dishes'
-            if not self.milvus_client.has_collection(collection_name):
+            if not await asyncio.to_thread(self.milvus_client.has_collection, collection_name):
                 return []
             
-            # Build filter for city and cuisine
-            filter_expr = f'city == "{city}" and primary_cuisine == "{cuisine_type}"'
+            terms = [f'city == "{city}"']
+            if cuisine:
+                terms.append(f'primary_cuisine == "{cuisine}"')
+            if dish:
+                terms.append(f'dish_name like "%{dish}%"')
+            filter_expr = " and ".join(terms)
             
-            # Generate embedding for search
-            embedding_text = f"{city} {cuisine_type} popular dishes"
+            embedding_text = f"{city} {cuisine or dish} popular dishes"
             query_vector = await self._generate_embedding(embedding_text)
             
-            # Search using Milvus client
-            results = self.milvus_client.search_collection(
+            results = await asyncio.to_thread(
+                self.milvus_client.search_collection,
                 collection_name=collection_name,
                 query_vector=query_vector,
                 filter_expr=filter_expr,
                 limit=max_results,
-                output_fields=["*"]
+                output_fields=list(POPULAR_FIELDS)
             )
             
             return self._convert_popular_dishes_results(results, max_results)
             
         except Exception as e:
-            app_logger.error(f"Error getting popular dishes by cuisine: {e}")
-            return []
-    
-    async def _get_popular_dishes_by_dish(self, city: str, dish_name: str, max_results: int) -> List[Dict]:
-        """Get popular dishes that match a specific dish name."""
-        try:
-            collection_name = 'discovery_popular_dishes'
-            if not self.milvus_client.has_collection(collection_name):
-                return []
-            
-            # Build filter for city and dish name (fuzzy match)
-            filter_expr = f'city == "{city}" and dish_name like "%{dish_name}%"'
-            
-            # Generate embedding for search
-            embedding_text = f"{city} {dish_name} popular dishes"
-            query_vector = await self._generate_embedding(embedding_text)
-            
-            # Search using Milvus client
-            results = self.milvus_client.search_collection(
-                collection_name=collection_name,
-                query_vector=query_vector,
-                filter_expr=filter_expr,
-                limit=max_results,
-                output_fields=["*"]
-            )
-            
-            return self._convert_popular_dishes_results(results, max_results)
-            
-        except Exception as e:
-            app_logger.error(f"Error getting popular dishes by dish: {e}")
+            app_logger.error(f"Error searching popular dishes: {e}")
             return []
     
     def _convert_popular_dishes_results(self, results: List, max_results: int) -> List[Dict]:
@@ -833,30 +1058,24 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             for hit in hits:
                 entity = hit.entity
                 
-                recommendation = {
-                    "type": "popular_dish",
-                    "dish_name": get_field(entity, 'dish_name', 'Unknown'),
-                    "restaurant_name": "Multiple locations",  # Popular dishes span multiple restaurants
-                    "restaurant_id": "",
-                    "location": get_field(entity, 'city', ''),
-                    "neighborhood": "",
-                    "cuisine_type": get_field(entity, 'primary_cuisine', ''),
-                    "popularity_score": float(get_field(entity, 'popularity_score', 0.0)),
-                    "frequency": int(get_field(entity, 'frequency', 0)),
-                    "avg_sentiment": float(get_field(entity, 'avg_sentiment', 0.0)),
-                    "restaurant_count": int(get_field(entity, 'restaurant_count', 0)),
-                    "cultural_significance": get_field(entity, 'cultural_significance', ''),
-                    "reasoning": get_field(entity, 'reasoning', ''),
-                    "confidence": float(get_field(entity, 'confidence_score', 0.8)),
-                    "source": "popular_dish",
-                    "similarity_score": float(hit.score)
-                }
-                recommendations.append(recommendation)
+                recommendations.append(PopularDishRecommendation(
+                    dish_name=get_field(entity, 'dish_name', 'Unknown'),
+                    location=get_field(entity, 'city', ''),
+                    cuisine_type=get_field(entity, 'primary_cuisine', ''),
+                    popularity_score=float(get_field(entity, 'popularity_score', 0.0)),
+                    frequency=int(get_field(entity, 'frequency', 0)),
+                    avg_sentiment=float(get_field(entity, 'avg_sentiment', 0.0)),
+                    restaurant_count=int(get_field(entity, 'restaurant_count', 0)),
+                    cultural_significance=get_field(entity, 'cultural_significance', ''),
+                    reasoning=get_field(entity, 'reasoning', ''),
+                    confidence=float(get_field(entity, 'confidence_score', 0.8)),
+                    similarity_score=float(hit.score)
+                ))
         
-        # Sort by popularity score and similarity
-        recommendations.sort(key=lambda r: (r.get("popularity_score", 0), r.get("similarity_score", 0)), reverse=True)
+        # Top-K by popularity score and similarity
+        top = heapq.nlargest(max_results, recommendations, key=lambda r: (r.popularity_score, r.similarity_score))
         
-        return recommendations[:max_results]
+        return [r.to_dict() for r in top]
     
     def _convert_famous_restaurants_results(self, results: List, max_results: int) -> List[Dict]:
         """Convert famous restaurants search results to recommendation format."""
@@ -876,45 +1095,64 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             for hit in hits:
                 entity = hit.entity
                 
-                # Calculate match score for dish name if applicable
-                match_score = 1.0  # Default high match for famous restaurants
-                
-                recommendation = {
-                    "type": "famous_restaurant",
-                    "dish_name": get_field(entity, 'famous_dish', 'Unknown'),
-                    "restaurant_name": get_field(entity, 'restaurant_name', 'Unknown'),
-                    "restaurant_id": get_field(entity, 'restaurant_id', ''),
-                    "location": get_field(entity, 'city', ''),
-                    "neighborhood": get_field(entity, 'neighborhood', ''),
-                    "cuisine_type": get_field(entity, 'cuisine_type', ''),
-                    "fame_score": float(get_field(entity, 'fame_score', 0.0)),
-                    "dish_popularity": float(get_field(entity, 'dish_popularity', 0.0)),
-                    "restaurant_rating": float(get_field(entity, 'rating', 0.0)),
-                    "review_count": int(get_field(entity, 'review_count', 0)),
-                    "quality_score": float(get_field(entity, 'quality_score', 0.0)),
-                    "price_range": int(get_field(entity, 'price_range', 2)),
-                    "cultural_significance": get_field(entity, 'cultural_significance', ''),
-                    "match_score": match_score,
-                    "confidence": 0.85,  # High confidence for famous restaurants
-                    "source": "famous_restaurant",
-                    "similarity_score": float(hit.score)
-                }
-                recommendations.append(recommendation)
+                recommendations.append(FamousRestaurantRecommendation(
+                    dish_name=get_field(entity, 'famous_dish', 'Unknown'),
+                    restaurant_name=get_field(entity, 'restaurant_name', 'Unknown'),
+                    restaurant_id=get_field(entity, 'restaurant_id', ''),
+                    location=get_field(entity, 'city', ''),
+                    neighborhood=get_field(entity, 'neighborhood', ''),
+                    cuisine_type=get_field(entity, 'cuisine_type', ''),
+                    fame_score=float(get_field(entity, 'fame_score', 0.0)),
+                    dish_popularity=float(get_field(entity, 'dish_popularity', 0.0)),
+                    restaurant_rating=float(get_field(entity, 'rating', 0.0)),
+                    review_count=int(get_field(entity, 'review_count', 0)),
+                    quality_score=float(get_field(entity, 'quality_score', 0.0)),
+                    price_range=int(get_field(entity, 'price_range', 2)),
+                    cultural_significance=get_field(entity, 'cultural_significance', ''),
+                    similarity_score=float(hit.score)
+                ))
         
-        # Sort by fame score and similarity
-        recommendations.sort(key=lambda r: (r.get("fame_score", 0), r.get("similarity_score", 0)), reverse=True)
+        # Top-K by fame score and similarity
+        top = heapq.nlargest(max_results, recommendations, key=lambda r: (r.fame_score, r.similarity_score))
         
-        return recommendations[:max_results]
+        return [r.to_dict() for r in top]
 
+    async def warmup(self):
+        """Load all discovery collections once, concurrently, so later calls never pay for load().
+        
+        A collection that fails to load leaves the engine cold, so the next call retries.
+        """
+        if self._discovery_loaded:
+            return
+        
+        collections = [c for c in self.discovery_collections.collections.values() if c]
+        results = await asyncio.gather(
+            *(asyncio.to_thread(collection.load) for collection in collections),
+            return_exceptions=True
+        )
+        failed = 0
+        for collection, result in zip(collections, results):
+            if isinstance(result, Exception):
+                failed += 1
+                app_logger.warning(f"Failed to preload discovery collection {collection.name}: {result}")
+        
+        if failed:
+            app_logger.warning(f"Preloaded {len(collections) - failed} of {len(collections)} discovery collections")
+            return
+        self._discovery_loaded = True
+        app_logger.info(f"Preloaded {len(collections)} discovery collections")
+    
     async def get_discovery_stats(self) -> Dict[str, Any]:
         """Get statistics about discovery collections."""
         try:
+            # No-op once every collection has loaded
+            await self.warmup()
+            
             stats = {}
             
             for collection_name, collection in self.discovery_collections.collections.items():
                 if collection:
                     try:
-                        collection.load()  # Ensure collection is loaded
                         stats[collection_name] = {
                             "num_entities": collection.num_entities,
                             "schema_fields": [field.name for field in collection.schema.fields]
@@ -937,13 +1175,6 @@ class EnhancedRetrievalEngine(RetrievalEngine):
             restaurant_name = parsed_query.get("restaurant_name", "")
             query_type = parsed_query.get("intent", "unknown")
             
-            # Check if location or cuisine is outside supported areas
-            supported_locations = ['Manhattan', 'Jersey City', 'Hoboken']
-            supported_cuisines = ['Italian', 'Indian', 'Chinese', 'American', 'Mexican']
-            
-            location_unsupported = location and location not in supported_locations
-            cuisine_unsupported = cuisine_type and cuisine_type not in supported_cuisines
-            
             # Build context for OpenAI
             context_parts = []
             if location:
@@ -1033,11 +1264,7 @@ Note: If the location or cuisine type is outside your primary knowledge base, pr
     async def _call_openai_for_recommendations(self, system_prompt: str, user_prompt: str) -> List[Dict]:
         """Call OpenAI to generate restaurant recommendations."""
         try:
-            from openai import AsyncOpenAI
-            
-            client = AsyncOpenAI()
-            
-            response = await client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": system_prompt},
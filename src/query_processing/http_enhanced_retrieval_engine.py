@@ -3,21 +3,302 @@ HTTP-Enhanced Retrieval Engine for Discovery Collections.
 Compatible with MilvusHTTPClient instead of the old MilvusClient.
 """
 import asyncio
-from typing import List, Dict, Optional, Any, Tuple
+import functools
+import hashlib
+import json
+import math
+import operator
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 # Try to import OpenAI with fallback
 try:
-    from openai import AsyncOpenAI
+    from openai import AsyncOpenAI, RateLimitError
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
     AsyncOpenAI = None
+    RateLimitError = None
+
+# aiohttp-backed transport for the OpenAI SDK (openai>=1.80 with the aiohttp extra)
+try:
+    from openai import DefaultAioHttpClient
+    OPENAI_AIOHTTP_AVAILABLE = True
+except ImportError:
+    OPENAI_AIOHTTP_AVAILABLE = False
+    DefaultAioHttpClient = None
+
+# HTTP/2 multiplexing for the httpx transport needs the h2 package (openai[http2])
+try:
+    import h2  # noqa: F401
+    import httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 from src.utils.config import get_settings
 from src.utils.logger import app_logger
 from src.vector_db.milvus_http_client import MilvusHTTPClient
 from src.vector_db.discovery_collections import DiscoveryCollections
 
+# asyncio.TaskGroup (structured concurrency) is only available on Python 3.11+
+TASKGROUP_AVAILABLE = sys.version_info >= (3, 11)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Upper bound on cached query embeddings (LRU eviction beyond this)
+EMBEDDING_CACHE_MAX_SIZE = 2048
+
+
+_FINAL_SCORE = operator.methodcaller('get', 'final_score', 0.5)
+
+# Raw Milvus result fields read by _format_recommendation, extracted in one C-level call.
+# Fields whose fallback depends on the call site default to the _MISSING sentinel.
+# The defaults are merged into a plain dict ({**_RESULT_DEFAULTS, **result}) rather than
+# viewed through a ChainMap: ChainMap.__getitem__ runs in Python for every key, which
+# costs more than the one C-level dict merge.
+_MISSING = object()
+_RESULT_FIELDS = operator.itemgetter(
+    'restaurant_id', 'restaurant_name', 'top_dish_name', 'cuisine_type', 'neighborhood',
+    'top_dish_final_score', 'rating', 'top_dish_topic_mentions', 'hybrid_quality_score'
+)
+_RESULT_DEFAULTS = {
+    'restaurant_id': _MISSING,
+    'restaurant_name': _MISSING,
+    'top_dish_name': _MISSING,
+    'cuisine_type': _MISSING,
+    'neighborhood': _MISSING,
+    'top_dish_final_score': 0.8,
+    'rating': 4.5,
+    'top_dish_topic_mentions': 0.0,
+    'hybrid_quality_score': 0.8,
+}
+
+# Recommendation description templates, filled by _format_recommendation
+_DESCRIPTION_TEMPLATE = "Try the {dish} at {restaurant} in {place}. Highly recommended!".format
+_DESCRIPTION_TEMPLATE_NO_PLACE = "Try the {dish} at {restaurant}. Highly recommended!".format
+
+
+
+@dataclass(slots=True, frozen=True)
+class DiscoveryRecommendation:
+    """Formatted discovery hit; slotted so result sets stay compact until the API boundary."""
+    id: str
+    restaurant_name: str
+    dish_name: str
+    cuisine_type: Optional[str]
+    neighborhood: Optional[str]
+    description: str
+    final_score: float
+    rating: float
+    price_range: str
+    source: str
+    confidence: float
+    topic_score: float
+    recommendation_score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Spelled out rather than dataclasses.asdict, which deep-copies every field and
+        # costs far more than the formatting itself
+        return {
+            "id": self.id,
+            "restaurant_name": self.restaurant_name,
+            "dish_name": self.dish_name,
+            "cuisine_type": self.cuisine_type,
+            "neighborhood": self.neighborhood,
+            "description": self.description,
+            "final_score": self.final_score,
+            "rating": self.rating,
+            "price_range": self.price_range,
+            "source": self.source,
+            "confidence": self.confidence,
+            "topic_score": self.topic_score,
+            "recommendation_score": self.recommendation_score,
+        }
+
+
+def _as_dicts(recommendations: List[Any]) -> List[Dict]:
+    """Convert formatted recommendations to plain dicts; OpenAI fallback dicts pass through."""
+    return [rec.to_dict() if isinstance(rec, DiscoveryRecommendation) else rec for rec in recommendations]
+
+
+_ZERO_VECTORS: Dict[int, Tuple[float, ...]] = {}
+
+
+def _zero_vector(dim: int) -> Tuple[float, ...]:
+    """Return a shared, immutable zero vector of the given dimension."""
+    vector = _ZERO_VECTORS.get(dim)
+    if vector is None:
+        vector = _ZERO_VECTORS[dim] = (0.0,) * dim
+    return vector
+
+
+def _quantize_embedding(embedding: List[float]) -> Tuple[float, array]:
+    """Symmetric int8 quantization: one byte per dimension plus a per-vector scale."""
+    scale = max(map(abs, embedding), default=0.0) / 127 or 1.0
+    return scale, array('b', [round(value / scale) for value in embedding])
+
+
+def _dequantize_embedding(entry: Tuple[float, array]) -> List[float]:
+    """Restore float values from a quantized cache entry."""
+    scale, values = entry
+    return [value * scale for value in values]
+
+
+class EmbeddingDiskCache:
+    """SQLite-backed store for quantized embeddings that survives process restarts."""
+    
+    def __init__(self, path: str, model: str = EMBEDDING_MODEL):
+        self._key_salt = model.encode()[:64]
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, scale REAL NOT NULL, data BLOB NOT NULL)"
+        )
+        self._conn.commit()
+    
+    def _key(self, text: str) -> str:
+        return hashlib.blake2b(text.encode(), key=self._key_salt, digest_size=16).hexdigest()
+    
+    def get(self, text: str) -> Optional[Tuple[float, array]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT scale, data FROM embeddings WHERE key = ?", (self._key(text),)
+            ).fetchone()
+        if row is None:
+            return None
+        values = array('b')
+        values.frombytes(row[1])
+        return row[0], values
+    
+    def set(self, text: str, entry: Tuple[float, array]) -> None:
+        scale, values = entry
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, scale, data) VALUES (?, ?, ?)",
+                (self._key(text), scale, values.tobytes())
+            )
+            self._conn.commit()
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+# Streamed dish fallback replies: entries of the "by_index" array are decoded as soon as they close
+_BY_INDEX_RE = re.compile(r'"by_index"\s*:\s*\[')
+_ENTRY_SEPARATOR_RE = re.compile(r'[\s,]*')
+_JSON_DECODER = json.JSONDecoder()
+FALLBACK_STREAM_PREAMBLE_CHARS = 200  # give up on a reply that hasn't opened "by_index" by now
+
+
+class _ByIndexStreamParser:
+    """Incrementally decode the entries of a streamed ``{"by_index": [...]}`` reply."""
+    
+    __slots__ = ("_buffer", "_pos")
+    
+    def __init__(self):
+        self._buffer = ""
+        self._pos: Optional[int] = None  # start of the next undecoded entry
+    
+    def feed(self, text: str) -> List[Any]:
+        """Append streamed text and return the array entries completed by it.
+        
+        Raises ValueError when the reply has clearly gone off-format.
+        """
+        self._buffer += text
+        buffer = self._buffer
+        if self._pos is None:
+            match = _BY_INDEX_RE.search(buffer)
+            if match is None:
+                if len(buffer) > FALLBACK_STREAM_PREAMBLE_CHARS:
+                    raise ValueError("reply does not contain a by_index array")
+                return []
+            self._pos = match.end()
+        elif '}' not in text:
+            # An entry can only have completed if this chunk closed an object
+            return []
+        
+        entries = []
+        while True:
+            pos = _ENTRY_SEPARATOR_RE.match(buffer, self._pos).end()
+            if pos >= len(buffer) or buffer[pos] == ']':
+                return entries
+            try:
+                entry, self._pos = _JSON_DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Entry still incomplete; retry once more text arrives
+                return entries
+            entries.append(entry)
+
+# Quality indicators that route dish queries to the popular dishes collection first
+_QUALITY_RE = re.compile(r'\b(best|popular|famous|legendary|top|amazing|outstanding|excellent)', re.IGNORECASE)
+
+# How long the Milvus collection listing is reused before refetching
+COLLECTIONS_CACHE_TTL_SECONDS = 60
+
+# OpenAI dish fallback response cache
+FALLBACK_CACHE_TTL_SECONDS = 3600
+FALLBACK_NEGATIVE_CACHE_TTL_SECONDS = 300  # empty answers, e.g. for gibberish dish names
+FALLBACK_CACHE_MAX_SIZE = 256
+
+# Semantic fallback cache: reuse answers for the same cuisine and location when the
+# dish name embeddings are this similar (cosine)
+SEMANTIC_CACHE_SIMILARITY = 0.92
+SEMANTIC_CACHE_MAX_SIZE = 256
+
+# Static instructions for the OpenAI dish fallback. Kept byte-identical across calls
+# (dynamic values live in the user message) so provider-side prompt caching applies.
+DISH_FALLBACK_SYSTEM_PROMPT = """You recommend restaurant dishes. Each user message lists one or more numbered
+requests of the form "i. dish=<dish>; cuisine=<cuisine or any>; location=<location>; k=<count>".
+The requested dish isn't available in our database, so for every request suggest k alternative dishes that are:
+1. Similar to the requested dish in taste, style, or concept
+2. Popular and well-loved in the given location
+3. From the given cuisine if one is specified
+4. Actually available at top restaurants in the given location
+
+Respond with JSON only, with exactly one entry per request, in request order:
+{
+    "by_index": [
+        {
+            "recommendations": [
+                {
+                    "dish_name": "alternative dish name",
+                    "description": "why this dish is great and similar to the requested dish",
+                    "similarity": "how it relates to the requested dish",
+                    "restaurant_suggestion": "type of restaurant to look for"
+                }
+            ]
+        }
+    ]
+}"""
+
+# Dish fallback generation budget (per request in a batch) and sampling temperature
+FALLBACK_MAX_TOKENS = 800
+FALLBACK_TOKENS_PER_DISH = 80
+FALLBACK_TOKENS_OVERHEAD = 150
+FALLBACK_TEMPERATURE = 0.3
+
+# Concurrent dish fallbacks are coalesced into one chat completion
+FALLBACK_MAX_BATCH = 8
+FALLBACK_MAX_LATENCY = 0.02  # seconds to wait for more requests before sending a batch
+
+# Rate-limit protection for OpenAI calls
+OPENAI_CONCURRENCY = 8
+OPENAI_MAX_ATTEMPTS = 5
+OPENAI_BACKOFF_BASE_SECONDS = 1.0
+OPENAI_BACKOFF_MAX_SECONDS = 30.0
+OPENAI_TIMEOUT_SECONDS = 60.0
+OPENAI_MAX_CONNECTIONS = 50
+
 
 class HTTPEnhancedRetrievalEngine:
     """Enhanced retrieval engine with discovery collections support using HTTP client."""
@@ -25,82 +306,307 @@ class HTTPEnhancedRetrievalEngine:
     def __init__(self, milvus_client: MilvusHTTPClient):
         self.milvus_client = milvus_client
         self.discovery_collections = DiscoveryCollections()
-        self._embedding_cache = {}
+        # Embeddings are stored int8-quantized to keep the cache small
+        self._embedding_cache: "OrderedDict[str, Tuple[float, array]]" = OrderedDict()
+        # Optional second tier persisted on disk (EMBEDDING_CACHE_PATH)
+        self._embedding_disk_cache: Optional[EmbeddingDiskCache] = None
+        self._inflight_embeddings: Dict[str, asyncio.Future] = {}
+        self._fallback_cache: "OrderedDict[Tuple[str, str, str, int], Tuple[float, List[Dict]]]" = OrderedDict()
+        self._inflight_fallbacks: Dict[Tuple[str, str, str, int], asyncio.Future] = {}
+        self._fallback_queue: Optional[asyncio.Queue] = None
+        self._fallback_worker: Optional[asyncio.Task] = None
+        self._fallback_batches: set = set()  # in-flight batch tasks, referenced until done
+        # (expires_at, cuisine, location, dish vector, max_results, recommendations); see _semantic_fallback_lookup
+        self._semantic_fallback_cache: "deque[Tuple[float, str, str, List[float], int, List[Dict]]]" = deque(maxlen=SEMANTIC_CACHE_MAX_SIZE)
+        # Intent → discovery handler; unknown intents fall back to famous restaurants
+        self._discovery_dispatch = {
+            "location_cuisine": self._get_discovery_location_cuisine,
+            # Cuisine-only queries are treated as location_cuisine with a default location
+            "cuisine_general": self._get_discovery_location_cuisine,
+            "location_dish": self._get_discovery_location_dish,
+            "location_general": self._get_discovery_location_general,
+            "restaurant_specific": self._get_discovery_restaurant_specific,
+        }
         self.settings = get_settings()
+        cache_path = getattr(self.settings, 'embedding_cache_path', None)
+        if cache_path:
+            try:
+                self._embedding_disk_cache = EmbeddingDiskCache(cache_path)
+            except Exception as e:
+                app_logger.warning(f"⚠️ Could not open embedding disk cache at {cache_path}: {e}")
+        self._collections_cache: Optional[Tuple[float, List[str]]] = None
+        self._collection_names: Dict[str, Optional[str]] = {}
+        self._openai_sem = asyncio.Semaphore(getattr(self.settings, 'openai_concurrency', OPENAI_CONCURRENCY))
+        # Shared OpenAI client so the underlying connection pool is reused across calls
+        self._openai = None
+        if OPENAI_AVAILABLE:
+            try:
+                self._openai = self._build_openai_client()
+            except Exception as e:
+                app_logger.warning(f"⚠️ Could not initialize OpenAI client: {e}")
+    
+    @staticmethod
+    def _build_openai_client() -> "AsyncOpenAI":
+        """Create the shared OpenAI client: aiohttp transport, else HTTP/2 httpx, else the SDK default."""
+        if OPENAI_AIOHTTP_AVAILABLE:
+            try:
+                return AsyncOpenAI(http_client=DefaultAioHttpClient())
+            except Exception as e:
+                # e.g. the SDK supports it but the aiohttp extra is missing
+                app_logger.warning(f"⚠️ aiohttp OpenAI transport unavailable, using httpx: {e}")
+        if HTTP2_AVAILABLE:
+            # Multiplex concurrent requests over one TLS connection
+            return AsyncOpenAI(http_client=httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(OPENAI_TIMEOUT_SECONDS, connect=5.0),
+                limits=httpx.Limits(max_connections=OPENAI_MAX_CONNECTIONS)
+            ))
+        return AsyncOpenAI()
+    
+    async def _call_openai(self, request, **kwargs):
+        """Run an OpenAI request under the concurrency limit, retrying rate limits with backoff."""
+        for attempt in range(1, OPENAI_MAX_ATTEMPTS + 1):
+            try:
+                async with self._openai_sem:
+                    return await request(**kwargs)
+            except RateLimitError as e:
+                if attempt == OPENAI_MAX_ATTEMPTS:
+                    raise
+                delay = self._retry_after_seconds(e)
+                if delay is None:
+                    # Exponential backoff with full jitter
+                    delay = random.uniform(0, min(OPENAI_BACKOFF_MAX_SECONDS, OPENAI_BACKOFF_BASE_SECONDS * 2 ** attempt))
+                app_logger.warning(f"⏳ OpenAI rate limited (attempt {attempt}/{OPENAI_MAX_ATTEMPTS}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _retry_after_seconds(error: Exception) -> Optional[float]:
+        """Read the Retry-After header from a rate-limit error, if present."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        try:
+            return min(float(headers.get("retry-after")), OPENAI_BACKOFF_MAX_SECONDS)
+        except (TypeError, ValueError):
+            return None
+    
+    async def _get_collections(self) -> List[str]:
+        """List Milvus collections, reusing the last listing for COLLECTIONS_CACHE_TTL_SECONDS."""
+        now = time.monotonic()
+        if self._collections_cache and now - self._collections_cache[0] < COLLECTIONS_CACHE_TTL_SECONDS:
+            return self._collections_cache[1]
+        
+        collections = await self.milvus_client.list_collections()
+        self._collection_names.clear()
+        # Only cache successful listings so a transient failure is retried next call
+        self._collections_cache = (now, collections) if collections else None
+        return collections
+    
+    async def _find_collection(self, marker: str) -> Optional[str]:
+        """Return the first collection whose name contains marker, memoized per listing."""
+        collections = await self._get_collections()
+        if marker not in self._collection_names:
+            self._collection_names[marker] = next(
+                (col for col in collections if marker in col.lower()), None
+            )
+        return self._collection_names[marker]
+    
+    async def close(self):
+        """Close the shared OpenAI client and the embedding disk cache."""
+        if self._fallback_worker is not None:
+            await self._cancel_task(self._fallback_worker)
+            self._fallback_worker = None
+        for task in list(self._fallback_batches):
+            await self._cancel_task(task)
+        if self._openai is not None:
+            await self._openai.close()
+            self._openai = None
+        if self._embedding_disk_cache is not None:
+            self._embedding_disk_cache.close()
+            self._embedding_disk_cache = None
+        
+    async def _generate_embedding(self, text: str) -> Sequence[float]:
+        """Generate embedding for text using OpenAI.
         
-    async def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text using OpenAI."""
+        Empty text and failures return a shared read-only zero vector (a tuple).
+        """
         if not text:
             vector_dim = getattr(self.settings, 'vector_dimension', 1536)  # Default to OpenAI embedding dimension
-            return [0.0] * vector_dim
+            return _zero_vector(vector_dim)
         
         # Check cache
-        cache_key = f"embedding:{hash(text)}"
-        if cache_key in self._embedding_cache:
-            app_logger.debug(f"Using cached embedding for text: {text[:50]}...")
-            return self._embedding_cache[cache_key]
+        cached = self._get_cached_embedding(text)
+        if cached is not None:
+            app_logger.debug("Using cached embedding for text: %.50s...", text)
+            return cached
+        
+        # Coalesce concurrent requests for the same text onto a single lookup
+        inflight = self._inflight_embeddings.get(text)
+        if inflight is not None:
+            app_logger.debug("Awaiting in-flight embedding for text: %.50s...", text)
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_embeddings[text] = future
+        embedding = None
+        try:
+            embedding = await self._embed_uncached(text)
+            return embedding
+        finally:
+            del self._inflight_embeddings[text]
+            if embedding is None:
+                # Cancelled before finishing: release waiters with the zero vector
+                embedding = _zero_vector(getattr(self.settings, 'vector_dimension', 1536))
+            future.set_result(embedding)
+    
+    async def _embed_uncached(self, text: str) -> Sequence[float]:
+        """Resolve an embedding from the disk cache or OpenAI."""
+        cached = await self._load_disk_embedding(text)
+        if cached is not None:
+            app_logger.debug("Using disk-cached embedding for text: %.50s...", text)
+            return cached
         
         try:
-            app_logger.debug(f"Generating embedding for text: {text[:50]}...")
-            client = AsyncOpenAI()
-            response = await client.embeddings.create(
-                model="text-embedding-3-small",
+            app_logger.debug("Generating embedding for text: %.50s...", text)
+            if self._openai is None:
+                raise RuntimeError("OpenAI client not available")
+            response = await self._call_openai(
+                self._openai.embeddings.create,
+                model=EMBEDDING_MODEL,
                 input=text
             )
             
             embedding = response.data[0].embedding
-            self._embedding_cache[cache_key] = embedding
+            await self._store_embedding(text, embedding)
             
-            app_logger.debug(f"Successfully generated embedding with {len(embedding)} dimensions")
+            app_logger.debug("Successfully generated embedding with %s dimensions", len(embedding))
             return embedding
             
         except Exception as e:
             app_logger.error(f"Error generating embedding: {e}")
             vector_dim = getattr(self.settings, 'vector_dimension', 1536)  # Default to OpenAI embedding dimension
-            return [0.0] * vector_dim
+            return _zero_vector(vector_dim)
         
+    def _get_cached_embedding(self, text: str) -> Optional[List[float]]:
+        """Return a cached embedding (dequantized), marking it most recently used."""
+        entry = self._embedding_cache.get(text)
+        if entry is None:
+            return None
+        self._embedding_cache.move_to_end(text)
+        return _dequantize_embedding(entry)
+    
+    def _cache_embedding(self, text: str, entry: Tuple[float, array]) -> None:
+        """Store a quantized embedding, evicting the least recently used entry when full."""
+        self._embedding_cache[text] = entry
+        self._embedding_cache.move_to_end(text)
+        if len(self._embedding_cache) > EMBEDDING_CACHE_MAX_SIZE:
+            self._embedding_cache.popitem(last=False)
+    
+    async def _load_disk_embedding(self, text: str) -> Optional[List[float]]:
+        """Look an embedding up in the disk cache, promoting hits into memory."""
+        if self._embedding_disk_cache is None:
+            return None
+        try:
+            entry = await asyncio.to_thread(self._embedding_disk_cache.get, text)
+        except Exception as e:
+            app_logger.warning(f"Embedding disk cache read failed: {e}")
+            return None
+        if entry is None:
+            return None
+        self._cache_embedding(text, entry)
+        return _dequantize_embedding(entry)
+    
+    async def _store_embedding(self, text: str, embedding: List[float]) -> None:
+        """Write an embedding through the memory cache to the disk cache."""
+        entry = _quantize_embedding(embedding)
+        self._cache_embedding(text, entry)
+        if self._embedding_disk_cache is None:
+            return
+        try:
+            await asyncio.to_thread(self._embedding_disk_cache.set, text, entry)
+        except Exception as e:
+            app_logger.warning(f"Embedding disk cache write failed: {e}")
+    
     async def get_recommendations(self, parsed_query: Dict[str, Any], max_results: int = 10) -> Tuple[List[Dict], bool, Optional[str]]:
         """Get recommendations using enhanced discovery collections + fallback to HTTP client."""
-        try:
-            # First try discovery collections for better AI-driven results
-            discovery_results = await self._get_discovery_recommendations(parsed_query, max_results)
-            
-            if discovery_results and len(discovery_results) >= max_results // 2:
+        # Launch discovery and the HTTP client fallback concurrently so a miss
+        # in discovery only costs max(t_discovery, t_fallback) instead of the sum
+        source, result = await self._first_non_empty([
+            ("discovery collections", self._get_discovery_recommendations(parsed_query, max_results)),
+            ("HTTP client fallback", self._get_http_client_fallback_recommendations(parsed_query, max_results)),
+        ])
+        
+        if source == "discovery collections":
+            if len(result) >= max_results // 2:
                 # We have good discovery results, return them
-                app_logger.info(f"✅ Using discovery collections: {len(discovery_results)} results")
-                return discovery_results, False, None
-            
-            # Use HTTP client fallback when discovery results are insufficient
-            if discovery_results:
-                app_logger.info("✅ Using discovery collections with HTTP client enhancement")
-                return discovery_results, False, None
+                app_logger.info("✅ Using discovery collections: %s results", len(result))
             else:
-                app_logger.info("🌐 Using HTTP client fallback for recommendations")
-                return await self._get_http_client_fallback_recommendations(parsed_query, max_results)
-            
-        except Exception as e:
-            app_logger.error(f"Error in enhanced retrieval: {e}")
-            # Fallback to HTTP client for recommendations
-            return await self._get_http_client_fallback_recommendations(parsed_query, max_results)
+                app_logger.info("✅ Using discovery collections with HTTP client enhancement")
+            return _as_dicts(result), False, None
+        
+        if source == "HTTP client fallback":
+            # Use HTTP client fallback when discovery results are insufficient
+            app_logger.info("🌐 Using HTTP client fallback for recommendations")
+            recommendations, fallback_used, reason = result
+            return _as_dicts(recommendations), fallback_used, reason
+        
+        return [], True, "HTTP client fallback error"
+    
+    async def _first_non_empty(self, steps: List[Tuple[str, Awaitable[Any]]]) -> Tuple[Optional[str], Any]:
+        """Run all steps concurrently and return the first non-empty result in priority order.
+        
+        Returns ``(label, result)`` for the winning step, cancelling the steps
+        still running, or ``(None, None)`` when every step is empty or fails.
+        """
+        async def guarded(label: str, awaitable: Awaitable[Any]) -> Any:
+            try:
+                return await awaitable
+            except Exception as e:
+                app_logger.warning(f"{label} failed: {e}")
+                return None
+        
+        if TASKGROUP_AVAILABLE:
+            # Structured concurrency: leaving the group waits for every cancelled loser
+            async with asyncio.TaskGroup() as tg:
+                tasks = [(label, tg.create_task(guarded(label, awaitable))) for label, awaitable in steps]
+                for label, task in tasks:
+                    result = await task
+                    if result:
+                        for _, other in tasks:
+                            other.cancel()
+                        return label, result
+            return None, None
+        
+        tasks = [(label, asyncio.create_task(guarded(label, awaitable))) for label, awaitable in steps]
+        try:
+            for label, task in tasks:
+                result = await task
+                if result:
+                    return label, result
+            return None, None
+        finally:
+            for _, task in tasks:
+                await self._cancel_task(task)
+    
+    @staticmethod
+    async def _cancel_task(task: asyncio.Task) -> None:
+        """Cancel a speculative task and swallow its cancellation."""
+        if task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
     
     async def _get_discovery_recommendations(self, parsed_query: Dict[str, Any], max_results: int) -> List[Dict]:
         """Get recommendations from discovery collections using HTTP client."""
         query_type = parsed_query.get("intent", "unknown")
         
-        if query_type == "location_cuisine":
-            return await self._get_discovery_location_cuisine(parsed_query, max_results)
-        elif query_type == "cuisine_general":
-            # Handle cuisine-only queries by treating them as location_cuisine with default location
-            return await self._get_discovery_location_cuisine(parsed_query, max_results)
-        elif query_type == "location_dish":
-            return await self._get_discovery_location_dish(parsed_query, max_results)
-        elif query_type == "location_general":
-            return await self._get_discovery_location_general(parsed_query, max_results)
-        elif query_type == "restaurant_specific":
-            return await self._get_discovery_restaurant_specific(parsed_query, max_results)
-        else:
-            # For other query types, try famous restaurants
-            return await self._get_discovery_famous_restaurants(parsed_query, max_results)
+        # For other query types, try famous restaurants
+        handler = self._discovery_dispatch.get(query_type, self._get_discovery_famous_restaurants)
+        return await handler(parsed_query, max_results)
     
     async def _get_discovery_location_cuisine(self, parsed_query: Dict[str, Any], max_results: int) -> List[Dict]:
         """Get location + cuisine recommendations from discovery collections."""
@@ -124,7 +630,7 @@ class HTTPEnhancedRetrievalEngine:
                 neighborhood = parts[1].strip()
             
             # Use HTTP client to search dishes with topics
-            app_logger.info(f"🔍 Searching for {cuisine_type} cuisine in {location}")
+            app_logger.info("🔍 Searching for %s cuisine in %s", cuisine_type, location)
             raw_results = await self.milvus_client.search_dishes_with_topics(
                 cuisine=cuisine_type,
                 neighborhood=neighborhood,
@@ -136,26 +642,11 @@ class HTTPEnhancedRetrievalEngine:
                 return []
             
             # Format results for consistency
-            recommendations = []
-            for i, result in enumerate(raw_results):
-                recommendation = {
-                    "id": result.get('restaurant_id', f"rec_{i}"),
-                    "restaurant_name": result.get('restaurant_name', 'Restaurant'),
-                    "dish_name": result.get('top_dish_name', 'Dish'),  # Use correct field name
-                    "cuisine_type": result.get('cuisine_type', cuisine_type),
-                    "neighborhood": result.get('neighborhood', neighborhood or location),
-                    "description": f"Try the {result.get('top_dish_name', 'dish')} at {result.get('restaurant_name', 'this restaurant')} in {result.get('neighborhood', location)}. Highly recommended!",
-                    "final_score": float(result.get('top_dish_final_score', 0.8)),  # Use correct field name
-                    "rating": float(result.get('rating', 4.5)),  # Use actual rating from data
-                    "price_range": "$$",  # Default since data doesn't have this
-                    "source": "discovery_collections",
-                    "confidence": float(result.get('top_dish_final_score', 0.8)),  # Use correct field name
-                    "topic_score": float(result.get('top_dish_topic_mentions', 0.0)),  # Use correct field name
-                    "recommendation_score": float(result.get('hybrid_quality_score', 0.8))  # Use correct field name
-                }
-                recommendations.append(recommendation)
+            recommendations = self._format_recommendations(
+                raw_results, neighborhood or location, default_cuisine=cuisine_type, location=location
+            )
             
-            app_logger.info(f"✅ Found {len(recommendations)} recommendations from discovery collections")
+            app_logger.info("✅ Found %s recommendations from discovery collections", len(recommendations))
             return recommendations
             
         except Exception as e:
@@ -172,9 +663,8 @@ class HTTPEnhancedRetrievalEngine:
             return []
         
         # Check if query contains quality indicators - prioritize popular dishes collection
-        quality_keywords = ["best", "popular", "famous", "legendary", "top", "amazing", "outstanding", "excellent"]
-        is_quality_query = any(keyword in original_query.lower() for keyword in quality_keywords)
-        app_logger.info(f"🔍 Dish search - Query contains quality keywords: {is_quality_query}")
+        is_quality_query = bool(_QUALITY_RE.search(original_query))
+        app_logger.info("🔍 Dish search - Query contains quality keywords: %s", is_quality_query)
         
         try:
             # Extract city and neighborhood
@@ -189,39 +679,29 @@ class HTTPEnhancedRetrievalEngine:
             
             # For quality queries, use enhanced search strategy
             if is_quality_query:
-                app_logger.info(f"🎯 Quality query detected - using enhanced search strategy for {dish_name}")
-                
-                # Step 1: Try popular dishes collection first (best for quality queries)
-                app_logger.info(f"🎯 Step 1: Searching popular dishes collection for {dish_name}")
-                popular_results = await self._search_popular_dishes_collection(
-                    dish_name, cuisine_type, neighborhood, max_results
-                )
-                
-                if popular_results:
-                    app_logger.info(f"✅ Found {len(popular_results)} results from popular dishes collection")
-                    return popular_results
-                
-                # Step 2: If no results, try neighborhood analysis collection
-                app_logger.info(f"🎯 Step 2: No popular dishes results, trying neighborhood analysis collection")
-                neighborhood_results = await self._search_neighborhood_collection(
-                    dish_name, cuisine_type, neighborhood, max_results
-                )
+                app_logger.info("🎯 Quality query detected - using enhanced search strategy for %s", dish_name)
                 
-                if neighborhood_results:
-                    app_logger.info(f"✅ Found {len(neighborhood_results)} results from neighborhood collection")
-                    return neighborhood_results
+                # Fire both Milvus searches speculatively and take the first non-empty
+                # result in priority order: popular dishes → neighborhood
+                source, results = await self._first_non_empty([
+                    ("popular dishes collection", self._search_popular_dishes_collection(
+                        dish_name, cuisine_type, neighborhood, max_results
+                    )),
+                    ("neighborhood collection", self._search_neighborhood_collection(
+                        dish_name, cuisine_type, neighborhood, max_results
+                    )),
+                ])
                 
-                # Step 3: If still no results, use OpenAI fallback for creative suggestions
-                app_logger.info(f"🎯 Step 3: No results from either collection, using OpenAI fallback")
-                try:
-                    fallback_recommendations = await self._get_openai_dish_fallback(
+                # OpenAI is paid and slow, so only ask it once both collections come back empty
+                if not results:
+                    source = "OpenAI fallback"
+                    results = await self._get_openai_dish_fallback(
                         dish_name, cuisine_type, location, max_results
                     )
-                    if fallback_recommendations:
-                        app_logger.info(f"✅ OpenAI fallback generated {len(fallback_recommendations)} recommendations")
-                        return fallback_recommendations
-                except Exception as e:
-                    app_logger.warning(f"OpenAI fallback failed: {e}")
+                
+                if results:
+                    app_logger.info("✅ Found %s results from %s", len(results), source)
+                    return results
                 
                 # If all else fails, return empty list
                 app_logger.warning(f"❌ No recommendations found for {dish_name} despite quality query")
@@ -229,31 +709,22 @@ class HTTPEnhancedRetrievalEngine:
                 
             else:
                 # Standard search for non-quality queries
-                app_logger.info(f"📍 Standard search for {dish_name}")
+                app_logger.info("📍 Standard search for %s", dish_name)
                 raw_results = await self.milvus_client.search_dishes_with_topics(
                     cuisine=cuisine_type,
                     neighborhood=neighborhood,
-                    limit=max_results * 2
+                    limit=max_results,
+                    dish_name_like=dish_name
                 )
                 
                 if not raw_results:
                     app_logger.info("No results from discovery collections")
                     return []
                 
-                # Filter results by dish name (case insensitive)
-                dish_lower = dish_name.lower()
-                filtered_results = [
-                    result for result in raw_results 
-                    if dish_lower in result.get('top_dish_name', '').lower()
-                ]
-                
                 # Format results for consistency
-                recommendations = []
-                for i, result in enumerate(filtered_results):
-                    recommendation = self._format_recommendation(result, i, neighborhood, location)
-                    recommendations.append(recommendation)
+                recommendations = self._format_recommendations(raw_results, neighborhood)
                 
-                app_logger.info(f"✅ Found {len(recommendations)} recommendations for {dish_name} from discovery collections")
+                app_logger.info("✅ Found %s recommendations for %s from discovery collections", len(recommendations), dish_name)
                 return recommendations
             
         except Exception as e:
@@ -277,7 +748,7 @@ class HTTPEnhancedRetrievalEngine:
                 neighborhood = parts[1].strip()
             
             # Use HTTP client to search dishes with topics (no cuisine filter)
-            app_logger.info(f"🔍 Searching for general recommendations in {location}")
+            app_logger.info("🔍 Searching for general recommendations in %s", location)
             raw_results = await self.milvus_client.search_dishes_with_topics(
                 cuisine=None,  # No cuisine filter for general search
                 neighborhood=neighborhood,
@@ -289,26 +760,9 @@ class HTTPEnhancedRetrievalEngine:
                 return []
             
             # Format results for consistency
-            recommendations = []
-            for i, result in enumerate(raw_results):
-                recommendation = {
-                    "id": result.get('restaurant_id', f"rec_{i}"),
-                    "restaurant_name": result.get('restaurant_name', 'Restaurant'),
-                    "dish_name": result.get('top_dish_name', 'Dish'),  # Use correct field name
-                    "cuisine_type": result.get('cuisine_type', 'Unknown'),
-                    "neighborhood": result.get('neighborhood', neighborhood or location),
-                    "description": f"Try the {result.get('top_dish_name', 'dish')} at {result.get('restaurant_name', 'this restaurant')} in {result.get('neighborhood', location)}. Highly recommended!",
-                    "final_score": float(result.get('top_dish_final_score', 0.8)),  # Use correct field name
-                    "rating": float(result.get('rating', 4.5)),  # Use actual rating from data
-                    "price_range": "$$",
-                    "source": "discovery_collections",
-                    "confidence": float(result.get('top_dish_final_score', 0.8)),  # Use correct field name
-                    "topic_score": float(result.get('top_dish_topic_mentions', 0.0)),  # Use correct field name
-                    "recommendation_score": float(result.get('hybrid_quality_score', 0.8))  # Use correct field name
-                }
-                recommendations.append(recommendation)
+            recommendations = self._format_recommendations(raw_results, neighborhood or location, location=location)
             
-            app_logger.info(f"✅ Found {len(recommendations)} general recommendations from discovery collections")
+            app_logger.info("✅ Found %s general recommendations from discovery collections", len(recommendations))
             return recommendations
             
         except Exception as e:
@@ -324,45 +778,22 @@ class HTTPEnhancedRetrievalEngine:
         
         try:
             # Use HTTP client to search dishes with topics (no filters)
-            app_logger.info(f"🔍 Searching for dishes at {restaurant_name}")
+            app_logger.info("🔍 Searching for dishes at %s", restaurant_name)
             raw_results = await self.milvus_client.search_dishes_with_topics(
                 cuisine=None,
                 neighborhood=None,
-                limit=max_results * 2  # Get more results to filter by restaurant
+                limit=max_results,
+                restaurant_name_like=restaurant_name
             )
             
             if not raw_results:
                 app_logger.info("No results from discovery collections")
                 return []
             
-            # Filter results by restaurant name (case insensitive)
-            restaurant_lower = restaurant_name.lower()
-            filtered_results = [
-                result for result in raw_results 
-                if restaurant_lower in result.get('restaurant_name', '').lower()
-            ]
-            
             # Format results for consistency
-            recommendations = []
-            for i, result in enumerate(filtered_results[:max_results]):
-                recommendation = {
-                    "id": result.get('restaurant_id', f"rec_{i}"),
-                    "restaurant_name": result.get('restaurant_name', 'Restaurant'),
-                    "dish_name": result.get('top_dish_name', 'Dish'),  # Use correct field name
-                    "cuisine_type": result.get('cuisine_type', 'Unknown'),
-                    "neighborhood": result.get('neighborhood', 'Unknown'),
-                    "description": f"Try the {result.get('top_dish_name', 'dish')} at {result.get('restaurant_name', 'this restaurant')}. Highly recommended!",
-                    "final_score": float(result.get('top_dish_final_score', 0.8)),  # Use correct field name
-                    "rating": float(result.get('rating', 4.5)),  # Use actual rating from data
-                    "price_range": "$$",
-                    "source": "discovery_collections",
-                    "confidence": float(result.get('top_dish_final_score', 0.8)),  # Use correct field name
-                    "topic_score": float(result.get('top_dish_topic_mentions', 0.0)),  # Use correct field name
-                    "recommendation_score": float(result.get('hybrid_quality_score', 0.8))  # Use correct field name
-                }
-                recommendations.append(recommendation)
+            recommendations = self._format_recommendations(raw_results, 'Unknown', include_place=False)
             
-            app_logger.info(f"✅ Found {len(recommendations)} recommendations for {restaurant_name} from discovery collections")
+            app_logger.info("✅ Found %s recommendations for %s from discovery collections", len(recommendations), restaurant_name)
             return recommendations
             
         except Exception as e:
@@ -373,7 +804,7 @@ class HTTPEnhancedRetrievalEngine:
         """Get famous restaurant recommendations from discovery collections."""
         try:
             # Use HTTP client to search dishes with topics (no filters)
-            app_logger.info(f"🔍 Searching for famous restaurant recommendations")
+            app_logger.info("🔍 Searching for famous restaurant recommendations")
             raw_results = await self.milvus_client.search_dishes_with_topics(
                 cuisine=None,
                 neighborhood=None,
@@ -385,26 +816,9 @@ class HTTPEnhancedRetrievalEngine:
                 return []
             
             # Format results for consistency
-            recommendations = []
-            for i, result in enumerate(raw_results):
-                recommendation = {
-                    "id": result.get('restaurant_id', f"rec_{i}"),
-                    "restaurant_name": result.get('restaurant_name', 'Restaurant'),
-                    "dish_name": result.get('top_dish_name', 'Dish'),  # Use correct field name
-                    "cuisine_type": result.get('cuisine_type', 'Unknown'),
-                    "neighborhood": result.get('neighborhood', 'Unknown'),
-                    "description": f"Try the {result.get('top_dish_name', 'dish')} at {result.get('restaurant_name', 'this restaurant')}. Highly recommended!",
-                    "final_score": float(result.get('top_dish_final_score', 0.8)),  # Use correct field name
-                    "rating": float(result.get('rating', 4.5)),  # Use actual rating from data
-                    "price_range": "$$",
-                    "source": "discovery_collections",
-                    "confidence": float(result.get('top_dish_final_score', 0.8)),  # Use correct field name
-                    "topic_score": float(result.get('top_dish_topic_mentions', 0.0)),  # Use correct field name
-                    "recommendation_score": float(result.get('hybrid_quality_score', 0.8))  # Use correct field name
-                }
-                recommendations.append(recommendation)
+            recommendations = self._format_recommendations(raw_results, 'Unknown', include_place=False)
             
-            app_logger.info(f"✅ Found {len(recommendations)} famous restaurant recommendations from discovery collections")
+            app_logger.info("✅ Found %s famous restaurant recommendations from discovery collections", len(recommendations))
             return recommendations
             
         except Exception as e:
@@ -425,36 +839,22 @@ class HTTPEnhancedRetrievalEngine:
                     neighborhood = parts[1].strip()
             
             # Get raw results from Milvus HTTP client
-            app_logger.info(f"🔍 Calling HTTP client fallback with cuisine: {cuisine}, neighborhood: {neighborhood}")
+            app_logger.info("🔍 Calling HTTP client fallback with cuisine: %s, neighborhood: %s", cuisine, neighborhood)
             raw_recommendations = await self.milvus_client.search_dishes_with_topics(
                 cuisine, 
                 neighborhood, 
                 max_results
             )
-            app_logger.info(f"🔍 HTTP client fallback returned {len(raw_recommendations)} recommendations")
+            app_logger.info("🔍 HTTP client fallback returned %s recommendations", len(raw_recommendations))
             
             # Format raw results for UI
             if raw_recommendations:
-                formatted_recommendations = []
-                for i, rec in enumerate(raw_recommendations):
-                    formatted_rec = {
-                        "id": rec.get('restaurant_id', f"rec_{i}"),
-                        "restaurant_name": rec.get('restaurant_name', 'Restaurant'),
-                        "dish_name": rec.get('top_dish_name', 'Dish'),  # Use correct field name
-                        "cuisine_type": rec.get('cuisine_type', cuisine),
-                        "neighborhood": rec.get('neighborhood', neighborhood or location),
-                        "description": f"Try the {rec.get('top_dish_name', 'dish')} at {rec.get('restaurant_name', 'this restaurant')} in {rec.get('neighborhood', location)}. Highly recommended!",
-                        "final_score": float(rec.get('top_dish_final_score', 0.8)),  # Use correct field name
-                        "rating": float(rec.get('rating', 4.5)),  # Use actual rating from data
-                        "price_range": "$$",  # Default since your data doesn't have this
-                        "source": "http_client_fallback",
-                        "confidence": float(rec.get('top_dish_final_score', 0.8)),  # Use correct field name
-                        "topic_score": float(rec.get('top_dish_topic_mentions', 0.0)),  # Use correct field name
-                        "recommendation_score": float(rec.get('hybrid_quality_score', 0.8))  # Use correct field name
-                    }
-                    formatted_recommendations.append(formatted_rec)
+                formatted_recommendations = self._format_recommendations(
+                    raw_recommendations, neighborhood or location, "http_client_fallback",
+                    default_cuisine=cuisine, location=location
+                )
                 
-                app_logger.info(f"✅ HTTP client fallback successful: {len(formatted_recommendations)} recommendations")
+                app_logger.info("✅ HTTP client fallback successful: %s recommendations", len(formatted_recommendations))
                 return formatted_recommendations, False, None
             else:
                 app_logger.warning("No results from HTTP client fallback")
@@ -466,36 +866,27 @@ class HTTPEnhancedRetrievalEngine:
     
     def calculate_confidence(self, recommendations: List[Dict], parsed_query: Dict[str, Any]) -> float:
         """Calculate confidence score for recommendations."""
-        if not recommendations:
+        n = len(recommendations)
+        if not n:
             return 0.0
         
         # Base confidence on number of recommendations and their scores
-        base_confidence = min(len(recommendations) / 10.0, 1.0)  # More recommendations = higher confidence
-        
-        # Average the final scores of recommendations
-        if recommendations:
-            avg_score = sum(float(rec.get('final_score', 0.5)) for rec in recommendations) / len(recommendations)
-            return (base_confidence + avg_score) / 2.0
+        base_confidence = min(n / 10.0, 1.0)  # More recommendations = higher confidence
         
-        return base_confidence
+        # Average the final scores of recommendations in a single C-level pass
+        avg_score = sum(map(float, map(_FINAL_SCORE, recommendations))) / n
+        return (base_confidence + avg_score) / 2.0
     
-    async def _search_popular_dishes_collection(self, dish_name: str, cuisine_type: str, neighborhood: str, max_results: int) -> List[Dict]:
+    async def _search_popular_dishes_collection(self, dish_name: str, cuisine_type: str, neighborhood: str, max_results: int) -> List[DiscoveryRecommendation]:
         """Search specifically in the popular dishes collection."""
         try:
-            # Get all collections to find popular_dishes
-            collections = await self.milvus_client.list_collections()
-            popular_collection = None
-            
-            for col in collections:
-                if "popular_dishes" in col.lower():
-                    popular_collection = col
-                    break
+            popular_collection = await self._find_collection("popular_dishes")
             
             if not popular_collection:
                 app_logger.warning("No popular dishes collection found")
                 return []
             
-            app_logger.info(f"🎯 Searching popular dishes collection: {popular_collection}")
+            app_logger.info("🎯 Searching popular dishes collection: %s", popular_collection)
             
             # Use direct collection search for better control
             raw_results = await self.milvus_client._pure_vector_search(
@@ -505,52 +896,37 @@ class HTTPEnhancedRetrievalEngine:
             if not raw_results:
                 return []
             
-            # Filter by dish name and neighborhood
-            dish_lower = dish_name.lower()
-            filtered_results = []
-            
-            for result in raw_results:
-                result_dish = result.get('top_dish_name', '').lower()
-                result_neighborhood = result.get('neighborhood', '').lower()
-                
-                # Check if dish name contains the search term
-                if dish_lower in result_dish:
-                    # If neighborhood is specified, check for neighborhood match
-                    if neighborhood and neighborhood.lower() in result_neighborhood:
-                        filtered_results.append(result)
-                    # If no neighborhood specified, include all matches
-                    elif not neighborhood:
-                        filtered_results.append(result)
-            
-            # Format results
-            recommendations = []
-            for i, result in enumerate(filtered_results[:max_results]):
-                recommendation = self._format_recommendation(result, i, neighborhood, "popular_dishes")
-                recommendations.append(recommendation)
-            
-            return recommendations
+            # Format only the first max_results matches; the filter stops once it has them
+            filtered_results = self._filter_dish_results(raw_results, dish_name, neighborhood, max_results)
+            return self._format_recommendations(filtered_results, neighborhood, "popular_dishes")
             
         except Exception as e:
             app_logger.error(f"Error searching popular dishes collection: {e}")
             return []
     
-    async def _search_neighborhood_collection(self, dish_name: str, cuisine_type: str, neighborhood: str, max_results: int) -> List[Dict]:
+    @staticmethod
+    def _filter_dish_results(results: List[Dict], dish_name: str, neighborhood: Optional[str], limit: int) -> Iterator[Dict]:
+        """Lazily yield up to ``limit`` results whose dish contains dish_name and, if given,
+        whose neighborhood contains neighborhood."""
+        # Loop invariants are computed once and the neighborhood branch is taken outside the loop;
+        # casefold() gives Unicode-correct caseless matching (e.g. "ß" vs "SS") at lower()'s cost
+        dish_folded = dish_name.casefold()
+        matches = (r for r in results if dish_folded in (r.get('top_dish_name') or '').casefold())
+        if neighborhood:
+            neighborhood_folded = neighborhood.casefold()
+            matches = (r for r in matches if neighborhood_folded in (r.get('neighborhood') or '').casefold())
+        return islice(matches, limit)
+    
+    async def _search_neighborhood_collection(self, dish_name: str, cuisine_type: str, neighborhood: str, max_results: int) -> List[DiscoveryRecommendation]:
         """Search in the neighborhood analysis collection as fallback."""
         try:
-            # Get all collections to find neighborhood_analysis
-            collections = await self.milvus_client.list_collections()
-            neighborhood_collection = None
-            
-            for col in collections:
-                if "neighborhood_analysis" in col.lower():
-                    neighborhood_collection = col
-                    break
+            neighborhood_collection = await self._find_collection("neighborhood_analysis")
             
             if not neighborhood_collection:
                 app_logger.warning("No neighborhood analysis collection found")
                 return []
             
-            app_logger.info(f"📍 Searching neighborhood collection: {neighborhood_collection}")
+            app_logger.info("📍 Searching neighborhood collection: %s", neighborhood_collection)
             
             # Use direct collection search
             raw_results = await self.milvus_client._pure_vector_search(
@@ -560,119 +936,293 @@ class HTTPEnhancedRetrievalEngine:
             if not raw_results:
                 return []
             
-            # Filter by dish name and neighborhood
-            dish_lower = dish_name.lower()
-            filtered_results = []
-            
-            for result in raw_results:
-                result_dish = result.get('top_dish_name', '').lower()
-                result_neighborhood = result.get('neighborhood', '').lower()
-                
-                # Check if dish name contains the search term
-                if dish_lower in result_dish:
-                    # If neighborhood is specified, check for neighborhood match
-                    if neighborhood and neighborhood.lower() in result_neighborhood:
-                        filtered_results.append(result)
-                    # If no neighborhood specified, include all matches
-                    elif not neighborhood:
-                        filtered_results.append(result)
-            
-            # Format results
-            recommendations = []
-            for i, result in enumerate(filtered_results[:max_results]):
-                recommendation = self._format_recommendation(result, i, neighborhood, "neighborhood_analysis")
-                recommendations.append(recommendation)
-            
-            return recommendations
+            # Format only the first max_results matches; the filter stops once it has them
+            filtered_results = self._filter_dish_results(raw_results, dish_name, neighborhood, max_results)
+            return self._format_recommendations(filtered_results, neighborhood, "neighborhood_analysis")
             
         except Exception as e:
             app_logger.error(f"Error searching neighborhood collection: {e}")
             return []
     
-    def _format_recommendation(self, result: Dict, index: int, neighborhood: str, source: str) -> Dict:
-        """Format a result into a consistent recommendation structure."""
-        return {
-            "id": result.get('restaurant_id', f"rec_{index}"),
-            "restaurant_name": result.get('restaurant_name', 'Restaurant'),
-            "dish_name": result.get('top_dish_name', 'Dish'),
-            "cuisine_type": result.get('cuisine_type', 'Unknown'),
-            "neighborhood": result.get('neighborhood', neighborhood),
-            "description": f"Try the {result.get('top_dish_name', 'dish')} at {result.get('restaurant_name', 'this restaurant')} in {result.get('neighborhood', neighborhood)}. Highly recommended!",
-            "final_score": float(result.get('top_dish_final_score', 0.8)),
-            "rating": float(result.get('rating', 4.5)),
-            "price_range": "$$",
-            "source": source,
-            "confidence": float(result.get('top_dish_final_score', 0.8)),
-            "topic_score": float(result.get('top_dish_topic_mentions', 0.0)),
-            "recommendation_score": float(result.get('hybrid_quality_score', 0.8))
-        }
+    def _format_recommendations(self, results: Iterable[Dict], neighborhood: Optional[str], source: str = "discovery_collections",
+                                default_cuisine: Optional[str] = 'Unknown', location: Optional[str] = None,
+                                include_place: bool = True) -> List[DiscoveryRecommendation]:
+        """Format a batch of results, binding the shared formatting options once for the whole loop."""
+        format_one = functools.partial(
+            self._format_recommendation,
+            neighborhood=neighborhood, source=source, default_cuisine=default_cuisine,
+            location=location, include_place=include_place
+        )
+        return [format_one(result, i) for i, result in enumerate(results)]
+    
+    def _format_recommendation(self, result: Dict, index: int, neighborhood: Optional[str], source: str = "discovery_collections",
+                               default_cuisine: Optional[str] = 'Unknown', location: Optional[str] = None,
+                               include_place: bool = True) -> DiscoveryRecommendation:
+        """Format a result into a consistent recommendation structure.
+        
+        ``neighborhood`` is the fallback for the result's neighborhood field; the
+        description names ``location`` (or ``neighborhood`` when no location is
+        given) unless ``include_place`` is False.
+        """
+        (restaurant_id, restaurant, dish, cuisine, result_neighborhood,
+         final_score, rating, topic_score, quality_score) = _RESULT_FIELDS({**_RESULT_DEFAULTS, **result})
+        
+        dish_text = 'dish' if dish is _MISSING else dish
+        restaurant_text = 'this restaurant' if restaurant is _MISSING else restaurant
+        if include_place:
+            place = location if location is not None else neighborhood
+            place = place if result_neighborhood is _MISSING else result_neighborhood
+            description = _DESCRIPTION_TEMPLATE(dish=dish_text, restaurant=restaurant_text, place=place)
+        else:
+            description = _DESCRIPTION_TEMPLATE_NO_PLACE(dish=dish_text, restaurant=restaurant_text)
+        final_score = float(final_score)
+        return DiscoveryRecommendation(
+            id=f"rec_{index}" if restaurant_id is _MISSING else restaurant_id,
+            restaurant_name='Restaurant' if restaurant is _MISSING else restaurant,
+            dish_name='Dish' if dish is _MISSING else dish,
+            cuisine_type=default_cuisine if cuisine is _MISSING else cuisine,
+            neighborhood=neighborhood if result_neighborhood is _MISSING else result_neighborhood,
+            description=description,
+            final_score=final_score,
+            rating=float(rating),
+            price_range="$$",
+            source=source,
+            confidence=final_score,
+            topic_score=float(topic_score),
+            recommendation_score=float(quality_score)
+        )
     
     async def _get_openai_dish_fallback(self, dish_name: str, cuisine_type: str, location: str, max_results: int) -> List[Dict]:
-        """Generate creative dish recommendations using OpenAI when exact matches fail."""
+        """Generate creative dish recommendations using OpenAI when exact matches fail.
+        
+        Responses are cached for FALLBACK_CACHE_TTL_SECONDS (empty answers for
+        FALLBACK_NEGATIVE_CACHE_TTL_SECONDS), and concurrent calls for the same key
+        share a single OpenAI request. Failed requests are not cached.
+        """
+        key = (
+            (dish_name or "").strip().lower(),
+            (cuisine_type or "").strip().lower(),
+            (location or "").strip().lower(),
+            max_results,
+        )
+        
+        entry = self._fallback_cache.get(key)
+        if entry is not None:
+            expires_at, cached = entry
+            if time.monotonic() < expires_at:
+                self._fallback_cache.move_to_end(key)
+                app_logger.info("♻️ Using cached OpenAI dish fallback for %s", dish_name)
+                return [dict(rec) for rec in cached]
+            del self._fallback_cache[key]
+        
+        inflight = self._inflight_fallbacks.get(key)
+        if inflight is not None:
+            cached = await asyncio.shield(inflight)
+            return [dict(rec) for rec in cached]
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_fallbacks[key] = future
+        recommendations: List[Dict] = []
         try:
-            if not OPENAI_AVAILABLE:
-                app_logger.warning("OpenAI not available for dish fallback")
-                return []
+            # Near-duplicate dish phrasings ("ramen" vs "ramen noodles") for the same
+            # cuisine and location can reuse a prior answer
+            _, cuisine_key, location_key, _ = key
+            query_vector = await self._fallback_query_vector(key)
+            cached = self._semantic_fallback_lookup(query_vector, cuisine_key, location_key, max_results)
+            if cached is not None:
+                app_logger.info("♻️ Using semantically cached OpenAI dish fallback for %s", dish_name)
+                recommendations = cached
+                return [dict(rec) for rec in cached]
             
-            # Create a creative prompt for dish suggestions
-            prompt = f"""I'm looking for the best {dish_name} in {location}. 
-            Since '{dish_name}' isn't available in our database, suggest {max_results} alternative dishes that are:
-            1. Similar to {dish_name} in taste, style, or concept
-            2. Popular and well-loved in {location}
-            3. From {cuisine_type} cuisine if specified
-            4. Actually available at top restaurants in {location}
-            
-            Format as JSON:
-            {{
-                "recommendations": [
-                    {{
-                        "dish_name": "alternative dish name",
-                        "description": "why this dish is great and similar to {dish_name}",
-                        "similarity": "how it relates to {dish_name}",
-                        "restaurant_suggestion": "type of restaurant to look for"
-                    }}
-                ]
-            }}"""
-            
-            # Call OpenAI API
-            client = AsyncOpenAI()
-            response = await client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800
-            )
-            
-            # Parse response and create recommendations
             try:
-                import json
-                content = response.choices[0].message.content
-                data = json.loads(content)
-                
-                recommendations = []
-                for i, rec in enumerate(data.get("recommendations", [])):
-                    recommendation = {
-                        "id": f"openai_fallback_{i}",
-                        "restaurant_name": f"Top {cuisine_type} Restaurant in {location}",
-                        "dish_name": rec.get("dish_name", "Alternative Dish"),
-                        "cuisine_type": cuisine_type or "Various",
-                        "neighborhood": location,
-                        "description": f"{rec.get('description', 'A great alternative option')} - {rec.get('similarity', 'Similar to what you were looking for')}",
-                        "final_score": 0.9,  # High confidence for AI suggestions
-                        "rating": 4.8,
-                        "price_range": "$$",
-                        "source": "openai_fallback",
-                        "confidence": 0.9,
-                        "topic_score": 0.0,
-                        "recommendation_score": 0.9
-                    }
-                    recommendations.append(recommendation)
-                
-                return recommendations
-                
-            except (json.JSONDecodeError, KeyError) as e:
-                app_logger.warning(f"Failed to parse OpenAI response: {e}")
+                recommendations = await self._fetch_openai_dish_fallback(dish_name, cuisine_type, location, max_results)
+            except Exception as e:
+                app_logger.error(f"Error in OpenAI dish fallback: {e}")
                 return []
-                
-        except Exception as e:
-            app_logger.error(f"Error in OpenAI dish fallback: {e}")
+            
+            ttl = FALLBACK_CACHE_TTL_SECONDS if recommendations else FALLBACK_NEGATIVE_CACHE_TTL_SECONDS
+            expires_at = time.monotonic() + ttl
+            self._fallback_cache[key] = (expires_at, recommendations)
+            if len(self._fallback_cache) > FALLBACK_CACHE_MAX_SIZE:
+                self._fallback_cache.popitem(last=False)
+            if recommendations and query_vector is not None:
+                self._semantic_fallback_cache.append(
+                    (expires_at, cuisine_key, location_key, query_vector, max_results, recommendations)
+                )
+            return [dict(rec) for rec in recommendations]
+        finally:
+            del self._inflight_fallbacks[key]
+            future.set_result(recommendations)
+    
+    async def _fallback_query_vector(self, key: Tuple[str, str, str, int]) -> Optional[List[float]]:
+        """Embed the normalized dish name of a fallback key as a unit vector for semantic cache lookups."""
+        dish = key[0]
+        vector = await self._generate_embedding(dish)
+        norm = math.sqrt(sum(value * value for value in vector))
+        if not norm:
+            # Zero vector: embedding failed, so semantic caching is skipped for this call
+            return None
+        return [value / norm for value in vector]
+    
+    def _semantic_fallback_lookup(self, query_vector: Optional[List[float]], cuisine: str, location: str,
+                                  max_results: int) -> Optional[List[Dict]]:
+        """Return the cached fallback whose dish is most similar to query_vector, if above the threshold.
+        
+        Only entries with the same normalized cuisine and location are considered, so an
+        answer for one neighborhood is never reused for another.
+        """
+        if query_vector is None or not self._semantic_fallback_cache:
+            return None
+        now = time.monotonic()
+        best_score, best = 0.0, None
+        for expires_at, cached_cuisine, cached_location, vector, cached_max, recommendations in self._semantic_fallback_cache:
+            if expires_at <= now or cached_max < max_results:
+                continue
+            if cached_cuisine != cuisine or cached_location != location:
+                continue
+            score = sum(map(operator.mul, query_vector, vector))
+            if score > best_score:
+                best_score, best = score, recommendations
+        if best is None or best_score < SEMANTIC_CACHE_SIMILARITY:
+            return None
+        return best[:max_results]
+    
+    async def _fetch_openai_dish_fallback(self, dish_name: str, cuisine_type: str, location: str, max_results: int) -> List[Dict]:
+        """Ask OpenAI for alternative dishes, batching concurrent fallbacks into one request.
+        
+        Request errors propagate so the caller can tell them apart from an empty answer.
+        """
+        if self._openai is None:
+            app_logger.warning("OpenAI not available for dish fallback")
             return []
+        
+        if self._fallback_worker is None or self._fallback_worker.done():
+            self._fallback_queue = asyncio.Queue()
+            self._fallback_worker = asyncio.create_task(self._fallback_batch_worker())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._fallback_queue.put(((dish_name, cuisine_type, location, max_results), future))
+        return await future
+    
+    async def _fallback_batch_worker(self):
+        """Drain queued dish fallbacks and resolve them with one chat completion per batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._fallback_queue.get()]
+            deadline = loop.time() + FALLBACK_MAX_LATENCY
+            while len(batch) < FALLBACK_MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._fallback_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Completions run as tasks so a slow one doesn't hold up the next batch window
+            task = asyncio.create_task(self._resolve_fallback_batch(batch))
+            self._fallback_batches.add(task)
+            task.add_done_callback(self._fallback_batches.discard)
+    
+    async def _resolve_fallback_batch(self, batch: List[Tuple[Tuple[str, str, str, int], asyncio.Future]]):
+        """Stream one chat completion for a batch and hand each entry to its waiting caller."""
+        # Callers that were cancelled (or otherwise resolved) while queued aren't sent
+        batch = [(query, future) for query, future in batch if not future.done()]
+        if not batch:
+            return
+        try:
+            # Each caller is resolved as soon as its entry arrives in the streamed reply
+            pending = {i: future for i, (_, future) in enumerate(batch)}
+            async for index, recommendations in self._stream_dish_fallbacks([query for query, _ in batch]):
+                future = pending.pop(index)
+                if not future.done():
+                    future.set_result(recommendations)
+            # Entries the model left out (or an off-format reply) resolve empty
+            for future in pending.values():
+                if not future.done():
+                    future.set_result([])
+            app_logger.debug("Resolved batch of %s dish fallbacks", len(batch))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    async def _stream_dish_fallbacks(self, queries: List[Tuple[str, str, str, int]]) -> AsyncIterator[Tuple[int, List[Dict]]]:
+        """Stream one chat completion covering every query, yielding (index, recommendations)
+        as each query's entry completes.
+        
+        Reading stops early once every entry has arrived or the reply goes off-format.
+        """
+        # Static instructions go first so the prompt prefix is identical across calls;
+        # only the short per-request lines vary
+        user_prompt = "\n".join(
+            f"{i}. dish={dish_name}; cuisine={cuisine_type or 'any'}; location={location}; k={max_results}"
+            for i, (dish_name, cuisine_type, location, max_results) in enumerate(queries)
+        )
+        # Output length drives latency, so size the budget to the number of dishes requested
+        max_tokens = sum(
+            min(FALLBACK_MAX_TOKENS, FALLBACK_TOKENS_PER_DISH * max_results + FALLBACK_TOKENS_OVERHEAD)
+            for *_, max_results in queries
+        )
+        
+        # Call OpenAI API
+        stream = await self._call_openai(
+            self._openai.chat.completions.create,
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": DISH_FALLBACK_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=FALLBACK_TEMPERATURE,
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        
+        # Parse entries as they stream in and create recommendations
+        parser = _ByIndexStreamParser()
+        index = 0
+        try:
+            async for chunk in stream:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if not text:
+                    continue
+                try:
+                    entries = parser.feed(text)
+                except ValueError as e:
+                    app_logger.warning(f"Failed to parse OpenAI response: {e}")
+                    return
+                for entry in entries:
+                    if index < len(queries):
+                        _, cuisine_type, location, _ = queries[index]
+                        suggestions = entry.get("recommendations", []) if isinstance(entry, dict) else []
+                        yield index, self._format_openai_recommendations(suggestions, cuisine_type, location)
+                    index += 1
+                if index >= len(queries):
+                    return
+        finally:
+            await stream.response.aclose()
+    
+    @staticmethod
+    def _format_openai_recommendations(suggestions: List[Dict], cuisine_type: str, location: str) -> List[Dict]:
+        """Format OpenAI dish suggestions into recommendation dicts."""
+        recommendations = []
+        for i, rec in enumerate(suggestions):
+            recommendation = {
+                "id": f"openai_fallback_{i}",
+                "restaurant_name": f"Top {cuisine_type} Restaurant in {location}",
+                "dish_name": rec.get("dish_name", "Alternative Dish"),
+                "cuisine_type": cuisine_type or "Various",
+                "neighborhood": location,
+                "description": f"{rec.get('description', 'A great alternative option')} - {rec.get('similarity', 'Similar to what you were looking for')}",
+                "final_score": 0.9,  # High confidence for AI suggestions
+                "rating": 4.8,
+                "price_range": "$$",
+                "source": "openai_fallback",
+                "confidence": 0.9,
+                "topic_score": 0.0,
+                "recommendation_score": 0.9
+            }
+            recommendations.append(recommendation)
+        
+        return recommendations
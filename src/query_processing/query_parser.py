@@ -1,19 +1,48 @@
 """
 Query parser for extracting entities and intent from user queries.
 """
+import asyncio
+import copy
+import functools
+import hashlib
+import os
+import random
 import re
 import json
-from typing import Dict, List, Optional, Any
+import logging
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 # Try to import OpenAI with fallback
 try:
-    from openai import AsyncOpenAI
+    import httpx
+    from openai import APIConnectionError, AsyncOpenAI, RateLimitError
     OPENAI_AVAILABLE = True
+    _RETRYABLE_OPENAI_ERRORS = (RateLimitError, APIConnectionError)
 except ImportError:
     OPENAI_AVAILABLE = False
     AsyncOpenAI = None
+    _RETRYABLE_OPENAI_ERRORS = ()
     print("Warning: OpenAI not available")
 
+# Faster JSON decoding for OpenAI responses when orjson is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _json_loads = orjson.loads
+except ImportError:
+    ORJSON_AVAILABLE = False
+    _json_loads = json.loads
+
+# Aho-Corasick keyword matching (one pass regardless of vocabulary size) when installed
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Try to import settings with fallback
 try:
     from src.utils.config import get_settings
@@ -30,7 +59,6 @@ try:
 except ImportError:
     LOGGER_AVAILABLE = False
     # Fallback logger
-    import logging
     app_logger = logging.getLogger(__name__)
     app_logger.setLevel(logging.INFO)
     if not app_logger.handlers:
@@ -59,52 +87,117 @@ except ImportError:
     print("Warning: Cache manager not available")
 
 
-class QueryParser:
-    """Parse user queries to extract entities and intent."""
+class _MinimalSettings:
+    """Settings used when the config module is unavailable."""
     
     def __init__(self):
-        # Initialize settings with fallback
-        if CONFIG_AVAILABLE and get_settings:
-            self.settings = get_settings()
-        else:
-            # Create a minimal settings object
-            class MinimalSettings:
-                def __init__(self):
-                    self.openai_api_key = None
-                    self.supported_cities = ["Manhattan", "Jersey City", "Hoboken"]
-                    self.supported_cuisines = ["Italian", "Indian", "Chinese", "American", "Mexican"]
-            self.settings = MinimalSettings()
-        
-        # Initialize OpenAI client with fallback
-        if OPENAI_AVAILABLE and AsyncOpenAI and hasattr(self.settings, 'openai_api_key') and self.settings.openai_api_key:
-            try:
-                self.client = AsyncOpenAI(api_key=self.settings.openai_api_key)
-                self.openai_available = True
-            except Exception as e:
-                app_logger.warning(f"Failed to initialize OpenAI client: {e}")
-                self.client = None
-                self.openai_available = False
-        else:
-            self.client = None
-            self.openai_available = False
-            app_logger.warning("OpenAI client not available")
-        
-        # Initialize cache manager with fallback
-        if CACHE_MANAGER_AVAILABLE and CacheManager:
-            try:
-                self.cache = CacheManager()
-                self.cache_available = True
-            except Exception as e:
-                app_logger.warning(f"Failed to initialize cache manager: {e}")
-                self.cache = None
-                self.cache_available = False
-        else:
-            self.cache = None
-            self.cache_available = False
-            app_logger.warning("Cache manager not available")
-        
-        # Enhanced system prompt
-        self.system_prompt = """You are an expert query parser for a comprehensive Dish Discovery restaurant recommendation system. Your role is to accurately extract structured information from natural language restaurant queries while maintaining high precision and appropriate confidence scoring.
+        self.openai_api_key = None
+        self.supported_cities = ["Manhattan", "Jersey City", "Hoboken"]
+        self.supported_cuisines = ["Italian", "Indian", "Chinese", "American", "Mexican"]
+
+
+# Settings are resolved once at import; every parser shares them
+_SETTINGS = get_settings() if CONFIG_AVAILABLE and get_settings else _MinimalSettings()
+QUERY_PARSER_MODEL = getattr(_SETTINGS, 'openai_model', 'gpt-4o')
+
+
+# One OpenAI client (and connection pool) shared by every QueryParser, with a cap on
+# in-flight parse requests and jittered exponential backoff on rate limits/connection errors
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "32"))
+OPENAI_MAX_CONNECTIONS = 100
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 50
+OPENAI_MAX_ATTEMPTS = 3
+OPENAI_BACKOFF_BASE_SECONDS = 0.5
+
+# OpenAI parse micro-batching: queries arriving within the window share one completion
+PARSE_BATCH_MAX_SIZE = 8
+PARSE_BATCH_MAX_LATENCY = 0.02  # seconds
+
+_openai_client: Optional["AsyncOpenAI"] = None
+_openai_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+
+
+def _get_openai_client(api_key: str) -> "AsyncOpenAI":
+    """Return the shared OpenAI client, creating it on first use."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS
+            ))
+        )
+    return _openai_client
+
+
+# One Redis cache manager (and connection pool) shared by every QueryParser
+_cache_manager: Optional["CacheManager"] = None
+
+
+def _get_cache_manager() -> "CacheManager":
+    """Return the shared cache manager, creating it on first use."""
+    global _cache_manager
+    if _cache_manager is None:
+        _cache_manager = CacheManager()
+    return _cache_manager
+
+
+# Parsed query caching: Redis TTLs by parse source, fronted by a per-process LRU so repeat
+# queries skip the Redis round trip as well as OpenAI
+PARSED_QUERY_CACHE_TTL_SECONDS = 6 * 3600
+REGEX_PARSED_QUERY_CACHE_TTL_SECONDS = 2 * 3600
+LOCAL_PARSED_QUERY_CACHE_MAX_SIZE = 2048
+
+# Regex parses at or above this overall confidence, with every entity grounded in the
+# keyword vocabularies, are returned without calling OpenAI
+REGEX_SHORT_CIRCUIT_MIN_CONFIDENCE = 0.75
+
+# Cache keys ignore case, punctuation (except "$", which carries price), extra whitespace
+# and filler words, then hash to a short fixed-length Redis key
+_CACHE_KEY_STRIP_RE = re.compile(r'[^\w\s$]')
+_CACHE_KEY_FILLER_WORDS = frozenset({"please", "pls", "hey", "hi", "hello", "thanks"})
+
+
+def _parsed_query_cache_key(query: Optional[str]) -> str:
+    """Build the parsed-query cache key shared by trivially different phrasings of a query."""
+    words = _CACHE_KEY_STRIP_RE.sub(" ", (query or "").lower()).split()
+    normalized = " ".join(word for word in words if word not in _CACHE_KEY_FILLER_WORDS)
+    return "parsed_query:" + hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+# cache key -> (expires_at, parsed query); entries are deep-copied on the way out
+_local_parsed_queries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _get_local_parsed_query(key: str) -> Optional[Dict[str, Any]]:
+    """Return a copy of a live local cache entry, or None."""
+    entry = _local_parsed_queries.get(key)
+    if entry is None:
+        return None
+    expires_at, parsed = entry
+    if time.monotonic() >= expires_at:
+        del _local_parsed_queries[key]
+        return None
+    _local_parsed_queries.move_to_end(key)
+    return copy.deepcopy(parsed)
+
+
+def _store_local_parsed_query(key: str, parsed: Dict[str, Any], ttl: float) -> None:
+    """Keep a private copy of parsed in the local LRU, evicting the oldest entry when full."""
+    _local_parsed_queries[key] = (time.monotonic() + ttl, copy.deepcopy(parsed))
+    _local_parsed_queries.move_to_end(key)
+    if len(_local_parsed_queries) > LOCAL_PARSED_QUERY_CACHE_MAX_SIZE:
+        _local_parsed_queries.popitem(last=False)
+
+
+# Parser prompts are module constants so every request sends a byte-identical prefix
+# (system prompt, then the static user instructions) that OpenAI's prompt cache can reuse.
+# Bump the version whenever either prompt changes so the cache is re-seeded cleanly.
+QUERY_PARSER_PROMPT_VERSION = "query_parser_v2"
+
+# Enhanced system prompt
+QUERY_PARSER_SYSTEM_PROMPT = """You are an expert query parser for a comprehensive Dish Discovery restaurant recommendation system. Your role is to accurately extract structured information from natural language restaurant queries while maintaining high precision and appropriate confidence scoring.
 
 ## Core Instructions
 1. **Accuracy over confidence** - Only assign high confidence when you're genuinely certain
@@ -228,90 +321,564 @@ Return valid JSON with this exact structure:
         "party_size": "number 0-1 or null",
         "overall": "number 0-1"
     }
-}"""
-        
-        # Query type patterns (updated to match new intents)
-        self.query_patterns = {
-            'restaurant_specific': [
-                r'i am at (.+)',
-                r'i\'m at (.+)',
-                r'at (.+) restaurant',
-                r'in (.+) restaurant',
-                r'(.+) restaurant',
-                r'restaurant (.+)'
-            ],
-            'location_cuisine': [
-                r'in (.+) and.*(?:mood|want|looking).*?(?:eat|try|find).*?(italian|indian|chinese|american|mexican)',
-                r'in (.+) for (.+) food',
-                r'in (.+) craving (.+)',
-                r'(.+) cuisine in (.+)'
-            ],
-            'location_dish': [
-                r'in (.+) and.*?(?:mood|want|looking).*?(?:eat|try|find).*?([a-zA-Z\s]+(?:chicken biryani|vegetable biryani|chicken curry|pizza|pasta|burger|taco|sushi|pad thai|pho|ramen))',
-                r'in (.+) for (.+)',
-                r'in (.+) craving (.+)',
-                r'best (.+) in (.+)',
-                r'top (.+) in (.+)',
-                r'show me the best (.+) in (.+)',
-                r'(.+) in (.+)'
-            ],
-            'location_general': [
-                r'in (.+) and.*?(?:hungry|want|looking).*?(?:eat|food|restaurant)',
-                r'in (.+) what.*?(?:eat|order)',
-                r'in (.+) recommend'
-            ],
-            'meal_planning': [
-                r'for (.+) in (.+)',
-                r'(.+) time in (.+)',
-                r'looking for (.+) in (.+)'
-            ],
-            'delivery_takeout': [
-                r'delivery.*in (.+)',
-                r'takeout.*in (.+)',
-                r'order.*from (.+)'
-            ]
+}
+
+Respond ONLY with a JSON object."""
+
+QUERY_PARSER_USER_PROMPT = """Parse the restaurant query given at the end and extract all relevant entities.
+
+Extract the following information based on the system guidelines:
+1. Location (city/neighborhood/landmark)
+2. Restaurant name (if specifically mentioned)
+3. Cuisine type (ANY cuisine mentioned, not just supported ones)
+4. Dish name (specific dishes only)
+5. Meal type (breakfast/lunch/dinner/brunch/late-night/snacks/drinks)
+6. Price range preference (1-4 scale as defined)
+7. Dietary restrictions (if any mentioned)
+8. Restaurant features (delivery, outdoor seating, etc.)
+9. Time preference (specific times or relative references)
+10. Party size (number of people)
+11. Query intent (primary purpose of the search)
+12. Confidence scores for each extracted entity
+
+Analyze the query context carefully and return the structured JSON response with appropriate confidence scores for each field."""
+
+# Used when several queued queries are parsed in one completion; the system prompt is shared
+QUERY_PARSER_BATCH_USER_PROMPT = """Parse each restaurant query in the JSON array given at the end and extract all relevant entities, exactly as you would for a single query under the system guidelines.
+
+Return a JSON object of the form {"results": [...]} where "results" holds one parse object per query, in the same order as the queries, each with the exact structure defined in the system guidelines."""
+
+# Structured Outputs schema for one parse: the API guarantees every field is present with
+# the right type, prices are 1-4 and confidences are 0-1, so validation only normalizes
+_NULLABLE_STRING = {"type": ["string", "null"]}
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+_NULLABLE_SCORE = {"type": ["number", "null"], "minimum": 0, "maximum": 1}
+_PARSED_QUERY_FIELDS = {
+    "location": _NULLABLE_STRING,
+    "restaurant_name": _NULLABLE_STRING,
+    "cuisine_type": _NULLABLE_STRING,
+    "dish_name": _NULLABLE_STRING,
+    "meal_type": _NULLABLE_STRING,
+    "price_range": {"type": ["integer", "null"], "enum": [1, 2, 3, 4, None]},
+    "dietary_restrictions": _STRING_LIST,
+    "restaurant_features": _STRING_LIST,
+    "time_preference": _NULLABLE_STRING,
+    "party_size": {"type": ["integer", "null"]},
+    "intent": {"type": "string"}
+}
+_CONFIDENCE_FIELDS = [field for field in _PARSED_QUERY_FIELDS if field != "intent"]
+PARSED_QUERY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **_PARSED_QUERY_FIELDS,
+        "confidence": {
+            "type": "object",
+            "properties": {
+                **{field: _NULLABLE_SCORE for field in _CONFIDENCE_FIELDS},
+                "overall": {"type": "number", "minimum": 0, "maximum": 1}
+            },
+            "required": _CONFIDENCE_FIELDS + ["overall"],
+            "additionalProperties": False
+        }
+    },
+    "required": list(_PARSED_QUERY_FIELDS) + ["confidence"],
+    "additionalProperties": False
+}
+_PARSED_QUERY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "parsed_query", "strict": True, "schema": PARSED_QUERY_SCHEMA}
+}
+_PARSED_QUERY_BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "parsed_queries",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"results": {"type": "array", "items": PARSED_QUERY_SCHEMA}},
+            "required": ["results"],
+            "additionalProperties": False
         }
+    }
+}
+
+
+# Query type patterns (updated to match new intents), compiled once at import.
+# Intents are tried in order and the first matching pattern wins. Patterns are searched
+# anywhere in the query, so instead of dispatching on the first word each one is paired
+# with a literal it cannot match without; a C-level substring test skips most of them
+_QUERY_PATTERNS = {
+    intent: tuple((literal, re.compile(pattern)) for literal, pattern in patterns)
+    for intent, patterns in {
+        'restaurant_specific': [
+            ('i am at ', r'i am at (.+)'),
+            ('i\'m at ', r'i\'m at (.+)'),
+            (' restaurant', r'at (.+) restaurant'),
+            (' restaurant', r'in (.+) restaurant'),
+            (' restaurant', r'(.+) restaurant'),
+            ('restaurant ', r'restaurant (.+)')
+        ],
+        'location_cuisine': [
+            (' and', r'in (.+) and.*(?:mood|want|looking).*?(?:eat|try|find).*?(italian|indian|chinese|american|mexican)'),
+            (' food', r'in (.+) for (.+) food'),
+            (' craving ', r'in (.+) craving (.+)'),
+            (' cuisine in ', r'(.+) cuisine in (.+)')
+        ],
+        'location_dish': [
+            (' and', r'in (.+) and.*?(?:mood|want|looking).*?(?:eat|try|find).*?([a-zA-Z\s]+(?:chicken biryani|vegetable biryani|chicken curry|pizza|pasta|burger|taco|sushi|pad thai|pho|ramen))'),
+            (' for ', r'in (.+) for (.+)'),
+            (' craving ', r'in (.+) craving (.+)'),
+            (' in ', r'best (.+) in (.+)'),
+            (' in ', r'top (.+) in (.+)'),
+            (' in ', r'show me the best (.+) in (.+)'),
+            (' in ', r'(.+) in (.+)')
+        ],
+        'location_general': [
+            (' and', r'in (.+) and.*?(?:hungry|want|looking).*?(?:eat|food|restaurant)'),
+            (' what', r'in (.+) what.*?(?:eat|order)'),
+            (' recommend', r'in (.+) recommend')
+        ],
+        'meal_planning': [
+            (' in ', r'for (.+) in (.+)'),
+            (' time in ', r'(.+) time in (.+)'),
+            (' in ', r'looking for (.+) in (.+)')
+        ],
+        'delivery_takeout': [
+            ('delivery', r'delivery.*in (.+)'),
+            ('takeout', r'takeout.*in (.+)'),
+            ('from ', r'order.*from (.+)')
+        ]
+    }.items()
+}
+
+
+# Most queries mention no dietary/feature/price/time/party keyword, so each of those
+# extractors first checks a cheap necessary condition: one C-level substring test per
+# trigger (every keyword contains one of its category's triggers) before the full regex
+_DIGIT_RE = re.compile(r'\d')
+
+
+def _mentions_any(text: str, triggers: Tuple[str, ...]) -> bool:
+    """Return True if any trigger occurs in text (lowercased by the caller)."""
+    return any(map(text.__contains__, triggers))
+
+
+# Supported city names and their canonical form, in priority order (the first listed one
+# found wins); New York and NYC map to Manhattan for our system
+_LOCATIONS = {
+    "jersey city": "Jersey City",
+    "hoboken": "Hoboken",
+    "manhattan": "Manhattan",
+    "new york": "Manhattan",
+    "nyc": "Manhattan"
+}
+
+# Cuisine names (expanded list) in priority order
+_CUISINES = {
+    "italian": "Italian", "indian": "Indian", "chinese": "Chinese",
+    "american": "American", "mexican": "Mexican",
+    "thai": "Thai", "japanese": "Japanese", "korean": "Korean",
+    "french": "French", "vietnamese": "Vietnamese", "greek": "Greek",
+    "ethiopian": "Ethiopian", "mongolian": "Mongolian", "spanish": "Spanish",
+    "lebanese": "Lebanese", "turkish": "Turkish", "moroccan": "Moroccan"
+}
+
+# Extraction patterns are lowercase and compiled without re.IGNORECASE; every extractor
+# matches against the lowercased query instead of case-folding inside the regex engine
+
+# Dish extraction: adjective + dish combos (no beef), then named multi-word dishes, then generic dishes
+_DISH_COMBO_RE = re.compile(
+    r'\b(chicken|mutton|lamb|paneer|vegetable|veg|egg)\s+'
+    r'(biryani|curry|korma|tikka masala|butter chicken|butter masala|saag|kebab|keema|karahi|bhuna|tikka)\b'
+)
+_DISH_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Named multi-word dishes
+    r'\b(chana masala|masala dosa|palak paneer|paneer tikka|chole bhature|dal makhani|malai kofta|aloo gobi)\b',
+    r'\b(veg biryani|vegetable biryani|mutton biryani|chicken biryani|paneer biryani)\b',
+    r'\b(tandoori chicken|chicken tikka)\b',
+    # Generic dishes
+    r'\b(chicken curry|fish curry|mutton curry|dal|paneer|butter chicken|tikka masala)\b',
+    r'\b(pizza|pasta|burger|sandwich|salad|soup|steak|ribs)\b',
+    r'\b(tacos?|burrito|quesadilla|nachos)\b',
+    r'\b(kung pao|sweet and sour|general tso|chow mein|lo mein|fried rice|chicken fried rice|egg fried rice)\b'
+))
+
+# Price range patterns with their extractors, checked before the keyword union below
+_PRICE_PATTERNS = tuple((re.compile(pattern), extractor) for pattern, extractor in (
+    (r'\$(\$+)', lambda m: len(m.group(1)) + 1),
+    (r'(\d+)\s*dollars?', lambda m: min(4, max(1, int(m.group(1)) // 15)))
+))
+
+# Category keywords are unioned into one pattern per category with a named group per
+# label, so a single finditer pass replaces one search per label; group names map
+# back to labels via the sibling dicts (in the original priority order)
+_PRICE_KEYWORD_RE = re.compile(
+    r'\b(?:(?P<budget>cheap|budget|affordable)|(?P<moderate>reasonable|moderate|mid-range)'
+    r'|(?P<upscale>upscale|nice|fancy)|(?P<fine_dining>expensive|fine dining|high-end|luxury))\b'
+)
+_PRICE_KEYWORD_LEVELS = {'budget': 1, 'moderate': 2, 'upscale': 3, 'fine_dining': 4}
+_PRICE_TRIGGERS = (
+    '$', 'dollar', 'cheap', 'budget', 'affordable', 'reasonable', 'moderate', 'mid-range',
+    'upscale', 'nice', 'fancy', 'expensive', 'fine dining', 'high-end', 'luxury'
+)
+
+_DIETARY_RE = re.compile(
+    r'\b(?:(?P<vegetarian>vegetarian|veggie)|(?P<vegan>vegan)|(?P<gluten_free>gluten.free|gluten free)'
+    r'|(?P<halal>halal)|(?P<kosher>kosher)|(?P<keto>keto|ketogenic)|(?P<low_carb>low.carb|low carb)'
+    r'|(?P<dairy_free>dairy.free|dairy free|lactose.free)|(?P<nut_free>nut.free|nut free))\b'
+)
+_DIETARY_LABELS = {
+    'vegetarian': 'vegetarian', 'vegan': 'vegan', 'gluten_free': 'gluten-free', 'halal': 'halal',
+    'kosher': 'kosher', 'keto': 'keto', 'low_carb': 'low-carb', 'dairy_free': 'dairy-free',
+    'nut_free': 'nut-free'
+}
+_DIETARY_TRIGGERS = ('veg', 'gluten', 'halal', 'kosher', 'keto', 'low', 'dairy', 'lactose', 'nut')
+
+_FEATURE_RE = re.compile(
+    r'\b(?:(?P<outdoor_seating>outdoor|outside|patio|terrace)|(?P<delivery>delivery|deliver)'
+    r'|(?P<takeout>takeout|take.out|pickup)|(?P<reservations>reservation|book|booking)'
+    r'|(?P<parking>parking|park)|(?P<live_music>live music|music|band)|(?P<bar>bar|drinks|cocktails)'
+    r'|(?P<kid_friendly>kid.friendly|kids|family|children)|(?P<romantic>romantic|date|intimate)'
+    r'|(?P<business_dinner>business|meeting|corporate)|(?P<casual>casual|relaxed|laid.back)'
+    r'|(?P<formal>formal|upscale|elegant)|(?P<pet_friendly>pet.friendly|dog.friendly|pets))\b'
+)
+# Feature group names are the feature labels themselves
+_FEATURE_LABELS = (
+    'outdoor_seating', 'delivery', 'takeout', 'reservations', 'parking', 'live_music', 'bar',
+    'kid_friendly', 'romantic', 'business_dinner', 'casual', 'formal', 'pet_friendly'
+)
+_FEATURE_TRIGGERS = (
+    'outdoor', 'outside', 'patio', 'terrace', 'deliver', 'take', 'pickup', 'reservation', 'book',
+    'park', 'music', 'band', 'bar', 'drinks', 'cocktails', 'kid', 'family', 'children', 'romantic',
+    'date', 'intimate', 'business', 'meeting', 'corporate', 'casual', 'relaxed', 'laid', 'formal',
+    'upscale', 'elegant', 'pet', 'dog'
+)
+
+# Meal type substrings in priority order (the first listed one found wins)
+_MEAL_TYPES = {
+    "breakfast": "breakfast", "lunch": "lunch", "dinner": "dinner",
+    "brunch": "brunch", "late night": "late-night", "late-night": "late-night",
+    "snack": "snacks", "snacks": "snacks", "drinks": "drinks",
+    "happy hour": "drinks", "cocktails": "drinks"
+}
+
+# Location, cuisine and meal type keywords are flattened into one (keyword, field, label)
+# table in priority order and scanned in a single pass; per field the earliest-listed
+# keyword found anywhere in the query wins. With pyahocorasick the pass is one automaton
+# walk over the query; otherwise a plain substring test per keyword, which is several
+# times faster here than a compiled alternation that CPython's re retries at every position
+_KEYWORD_FIELDS = (("location", _LOCATIONS), ("cuisine_type", _CUISINES), ("meal_type", _MEAL_TYPES))
+_KEYWORD_TABLE = tuple(
+    (keyword, field, label)
+    for field, keywords in _KEYWORD_FIELDS
+    for keyword, label in keywords.items()
+)
+_KEYWORD_LABELS = {field: frozenset(keywords.values()) for field, keywords in _KEYWORD_FIELDS}
+
+
+def _build_keyword_automaton() -> "ahocorasick.Automaton":
+    """Build an automaton whose payloads are (table index, field, label); index is priority."""
+    automaton = ahocorasick.Automaton()
+    for index, (keyword, field, label) in enumerate(_KEYWORD_TABLE):
+        automaton.add_word(keyword, (index, field, label))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if AHOCORASICK_AVAILABLE else None
+
+
+def _scan_keywords(query: str) -> Dict[str, str]:
+    """Return the winning location/cuisine_type/meal_type label found in query, by field."""
+    found: Dict[str, str] = {}
+    if _KEYWORD_AUTOMATON is not None:
+        # Matches arrive in text order, so sort them back into priority order
+        for _, field, label in sorted(payload for _, payload in _KEYWORD_AUTOMATON.iter(query)):
+            found.setdefault(field, label)
+        return found
+    for keyword, field, label in _KEYWORD_TABLE:
+        if field not in found and keyword in query:
+            found[field] = label
+    return found
+
+
+# Besides these words, time patterns can match on a digit
+_TIME_TRIGGERS = ('now', 'asap', 'immediately', 'tonight', 'today', 'tomorrow', 'time', 'early', 'late', 'around')
+_TIME_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\b(\d{1,2}:\d{2}\s*(?:am|pm)?)\b',
+    r'\b(\d{1,2}\s*(?:am|pm))\b',
+    r'\b(now|asap|immediately)\b',
+    r'\b(tonight|today|tomorrow)\b',
+    r'\b(lunch time|dinner time|breakfast time)\b',
+    r'\b(early|late|around \d+)\b'
+))
+
+_PARTY_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\b(?:table for|party of|group of)\s*(\d+)\b',
+    r'\b(\d+)\s*(?:people|person|ppl)\b',
+    r'\b(two|three|four|five|six|seven|eight)\b'
+))
+_PARTY_COUPLE_RE = re.compile(r'\b(date|couple|romantic)\b')
+_PARTY_FAMILY_RE = re.compile(r'\b(family|kids)\b')
+_NUMBER_WORDS = {
+    'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8
+}
+# Besides these words, party size patterns can match on a digit
+_PARTY_TRIGGERS = (
+    'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'date', 'couple', 'romantic', 'family', 'kids'
+)
+
+
+# Dish expansion mappings: short dish name (lowercase) -> specific variants
+_DISH_EXPANSIONS: Mapping[str, Tuple[str, ...]] = {
+    # Indian dishes
+    'biryani': ('Chicken Biryani', 'Mutton Biryani', 'Vegetable Biryani', 'Hyderabadi Biryani'),
+    'curry': ('Chicken Curry', 'Lamb Curry', 'Vegetable Curry', 'Butter Chicken'),
+    'tandoori': ('Tandoori Chicken', 'Tandoori Fish', 'Tandoori Vegetables'),
+    'naan': ('Butter Naan', 'Garlic Naan', 'Plain Naan'),
+    'dal': ('Dal Makhani', 'Dal Tadka', 'Yellow Dal'),
+    'samosa': ('Vegetable Samosa', 'Chicken Samosa'),
+    'kebab': ('Chicken Kebab', 'Lamb Kebab', 'Seekh Kebab'),
+    
+    # Italian dishes
+    'pizza': ('Margherita Pizza', 'Pepperoni Pizza', 'Marinara Pizza', 'Quattro Stagioni', 'Bufalina Pizza', 'New York Pizza', 'Neapolitan Pizza', 'Sicilian Pizza'),
+    'pasta': ('Spaghetti Carbonara', 'Fettuccine Alfredo', 'Penne Arrabbiata', 'Lasagna'),
+    'risotto': ('Mushroom Risotto', 'Seafood Risotto', 'Truffle Risotto'),
+    'gnocchi': ('Potato Gnocchi', 'Spinach Gnocchi'),
+    'ravioli': ('Cheese Ravioli', 'Spinach Ravioli', 'Mushroom Ravioli'),
+    
+    # Chinese dishes
+    'dim sum': ('Har Gow', 'Siu Mai', 'Char Siu Bao', 'Xiao Long Bao'),
+    'noodles': ('Lo Mein', 'Chow Mein', 'Dan Dan Noodles'),
+    'rice': ('Fried Rice', 'Steamed Rice', 'Yangzhou Fried Rice'),
+    'soup': ('Hot and Sour Soup', 'Wonton Soup', 'Egg Drop Soup'),
+    
+    # American dishes
+    'burger': ('Cheeseburger', 'Bacon Burger', 'Veggie Burger'),
+    'sandwich': ('Club Sandwich', 'BLT', 'Turkey Sandwich'),
+    'steak': ('Ribeye Steak', 'Filet Mignon', 'Sirloin Steak'),
+    'salad': ('Caesar Salad', 'Greek Salad', 'Cobb Salad'),
+    
+    # Mexican dishes
+    'taco': ('Beef Taco', 'Chicken Taco', 'Fish Taco', 'Veggie Taco'),
+    'burrito': ('Beef Burrito', 'Chicken Burrito', 'Bean Burrito'),
+    'enchilada': ('Chicken Enchilada', 'Beef Enchilada', 'Cheese Enchilada'),
+    'quesadilla': ('Chicken Quesadilla', 'Cheese Quesadilla'),
+    
+    # Generic dishes
+    'sushi': ('California Roll', 'Salmon Nigiri', 'Spicy Tuna Roll'),
+    'ramen': ('Tonkotsu Ramen', 'Miso Ramen', 'Shoyu Ramen'),
+    'pho': ('Beef Pho', 'Chicken Pho', 'Vegetable Pho'),
+    'pad thai': ('Chicken Pad Thai', 'Shrimp Pad Thai', 'Tofu Pad Thai')
+}
+
+
+# Empty parsed query and confidence templates; _new_parsed_query copies them (C-level
+# dict copies) rather than rebuilding the nested literal on every parse
+_EMPTY_PARSED_QUERY = MappingProxyType({
+    "location": None,
+    "restaurant_name": None,
+    "cuisine_type": None,
+    "dish_name": None,
+    "meal_type": None,
+    "price_range": None,
+    "dietary_restrictions": None,  # fresh list per copy
+    "restaurant_features": None,  # fresh list per copy
+    "time_preference": None,
+    "party_size": None,
+    "intent": "unknown",
+    "confidence": None  # fresh dict per copy
+})
+_EMPTY_CONFIDENCE = MappingProxyType({
+    "location": None,
+    "restaurant_name": None,
+    "cuisine_type": None,
+    "dish_name": None,
+    "meal_type": None,
+    "price_range": None,
+    "dietary_restrictions": None,
+    "restaurant_features": None,
+    "time_preference": None,
+    "party_size": None,
+    "overall": None
+})
+
+
+def _new_parsed_query(overall: float) -> Dict[str, Any]:
+    """Return an empty parsed query with no entities, unknown intent and the given overall confidence."""
+    parsed = _EMPTY_PARSED_QUERY.copy()
+    parsed["dietary_restrictions"] = []
+    parsed["restaurant_features"] = []
+    confidence = _EMPTY_CONFIDENCE.copy()
+    confidence["overall"] = overall
+    parsed["confidence"] = confidence
+    return parsed
+
+
+# Human-readable labels for the 1-4 price range
+_PRICE_LABELS: Mapping[int, str] = {1: "Budget", 2: "Moderate", 3: "Upscale", 4: "Fine Dining"}
+
+
+def _price_label(price_range: int) -> str:
+    """Describe a 1-4 price range for query summaries."""
+    return _PRICE_LABELS.get(price_range, 'Unknown')
+
+
+# (parsed query field, label, value formatter) for get_query_summary, in display order
+_SUMMARY_FIELDS = (
+    ("restaurant_name", "Restaurant", str),
+    ("cuisine_type", "Cuisine", str),
+    ("dish_name", "Dish", str),
+    ("location", "Location", str),
+    ("meal_type", "Meal", str),
+    ("price_range", "Price", _price_label),
+    ("dietary_restrictions", "Dietary", ", ".join),
+    ("restaurant_features", "Features", ", ".join),
+    ("party_size", "Party size", str),
+    ("time_preference", "Time", str)
+)
+
+# Intents that need a minimum overall confidence to count as a valid query
+_WEAK_INTENTS = frozenset({"unknown", "unclear"})
+
+# Restaurant features that make an otherwise unclassified query delivery_takeout
+_DELIVERY_FEATURES = frozenset({"delivery", "takeout"})
+
+# Locations OpenAI parses are snapped to on a partial name match, in priority order
+_VALIDATED_LOCATIONS = ("Jersey City", "Hoboken")
+
+# Entity fields reported by get_query_entities, in order; list fields default to []
+_ENTITY_FIELDS = (
+    "location", "restaurant_name", "cuisine_type", "dish_name", "meal_type", "price_range",
+    "dietary_restrictions", "restaurant_features", "time_preference", "party_size"
+)
+_LIST_ENTITY_FIELDS = frozenset({"dietary_restrictions", "restaurant_features"})
+
+# (parsed query field, search filter name) for get_search_filters, in order
+_SEARCH_FILTER_FIELDS = (
+    ("location", "location"),
+    ("cuisine_type", "cuisine"),
+    ("price_range", "price_range"),
+    ("meal_type", "meal_type"),
+    ("dietary_restrictions", "dietary_restrictions"),
+    ("restaurant_features", "features"),
+    ("party_size", "party_size")
+)
+
+
+@functools.lru_cache(maxsize=512)
+def _expand_dish(dish: str) -> Tuple[str, ...]:
+    """Return the expanded variants of a dish name, or the name itself if it has none."""
+    # Already-canonical names (the common case) hit without building normalized copies
+    variants = _DISH_EXPANSIONS.get(dish)
+    if variants is None:
+        normalized = dish.lower().strip()
+        if normalized != dish:
+            variants = _DISH_EXPANSIONS.get(normalized)
+    return variants or (dish,)
+
+
+class QueryParser:
+    """Parse user queries to extract entities and intent."""
+    
+    def __init__(self):
+        self.settings = _SETTINGS
+        
+        # Initialize OpenAI client with fallback
+        if OPENAI_AVAILABLE and AsyncOpenAI and hasattr(self.settings, 'openai_api_key') and self.settings.openai_api_key:
+            try:
+                self.client = _get_openai_client(self.settings.openai_api_key)
+                self.openai_available = True
+            except Exception as e:
+                app_logger.warning(f"Failed to initialize OpenAI client: {e}")
+                self.client = None
+                self.openai_available = False
+        else:
+            self.client = None
+            self.openai_available = False
+            app_logger.warning("OpenAI client not available")
+        
+        # Initialize cache manager with fallback
+        if CACHE_MANAGER_AVAILABLE and CacheManager:
+            try:
+                self.cache = _get_cache_manager()
+                self.cache_available = True
+            except Exception as e:
+                app_logger.warning(f"Failed to initialize cache manager: {e}")
+                self.cache = None
+                self.cache_available = False
+        else:
+            self.cache = None
+            self.cache_available = False
+            app_logger.warning("Cache manager not available")
+        
+        # Micro-batching queue: concurrent OpenAI parses share one completion
+        self._parse_queue: Optional[asyncio.Queue] = None
+        self._parse_worker: Optional[asyncio.Task] = None
+        self._parse_batches: set = set()  # in-flight batch tasks, referenced until done
     
     async def parse_query(self, query: str) -> Dict[str, Any]:
         """Parse user query to extract entities and intent."""
         try:
-            # Define cache key for potential use
-            cache_key = f"parsed_query:{(query or '').strip().lower()}"
+            # "Dinner in Hoboken!" and "dinner in hoboken" share entries
+            cache_key = _parsed_query_cache_key(query)
+            
+            # In-process cache check - no network round trip
+            cached = _get_local_parsed_query(cache_key)
+            if cached is not None:
+                app_logger.info("🧠 Parsed query local cache hit")
+                return self._with_original_query(cached, query)
             
-            # Redis cache check (keyed by raw query) - with fallback
+            # Redis cache check (keyed by normalized query hash) - with fallback
             if self.cache_available and self.cache:
                 try:
                     cached = await self.cache.get_json(cache_key)
                     if cached:
                         app_logger.info("🧠 Parsed query cache hit")
-                        return cached
+                        # Remaining Redis TTL is unknown, so keep it locally for the shorter TTL
+                        _store_local_parsed_query(cache_key, cached, REGEX_PARSED_QUERY_CACHE_TTL_SECONDS)
+                        return self._with_original_query(cached, query)
                 except Exception as e:
                     app_logger.warning(f"Cache check failed: {e}")
             else:
                 app_logger.info("🧠 Cache not available, skipping cache check")
             app_logger.info("🧠 Parsed query cache miss")
             
-            # Try OpenAI parsing first
+            # Templated queries the regex parser fully understands skip OpenAI
+            regex_parsed = self._grounded_regex_parse(self._parse_with_regex(query), query.lower())
+            if regex_parsed is not None:
+                app_logger.info("⚡ Confident regex parse, skipping OpenAI")
+                parsed = self._resolve_location_in_parsed_query(regex_parsed)
+                _store_local_parsed_query(cache_key, parsed, REGEX_PARSED_QUERY_CACHE_TTL_SECONDS)
+                if self.cache_available and self.cache:
+                    try:
+                        await self.cache.set_json(cache_key, parsed, expire=REGEX_PARSED_QUERY_CACHE_TTL_SECONDS)
+                    except Exception as e:
+                        app_logger.warning(f"Failed to cache regex parsed query: {e}")
+                return parsed
+            
+            # Otherwise try OpenAI parsing
             parsed = await self._parse_with_openai(query)
             if parsed:
                 # Resolve location using our location resolver
                 parsed = self._resolve_location_in_parsed_query(parsed)
                 # Store in cache for 6 hours - with fallback
+                _store_local_parsed_query(cache_key, parsed, PARSED_QUERY_CACHE_TTL_SECONDS)
                 if self.cache_available and self.cache:
                     try:
-                        await self.cache.set_json(cache_key, parsed, expire=6*3600)
+                        await self.cache.set_json(cache_key, parsed, expire=PARSED_QUERY_CACHE_TTL_SECONDS)
                     except Exception as e:
                         app_logger.warning(f"Failed to cache parsed query: {e}")
                 return parsed
             
-            # Fallback to regex parsing
-            parsed = self._parse_with_regex(query)
-            # Resolve location for regex parsing too
-            parsed = self._resolve_location_in_parsed_query(parsed)
+            # Fallback to the regex parse, resolving its location too
+            parsed = self._resolve_location_in_parsed_query(regex_parsed)
             # Store in cache for 2 hours - with fallback
+            _store_local_parsed_query(cache_key, parsed, REGEX_PARSED_QUERY_CACHE_TTL_SECONDS)
             if self.cache_available and self.cache:
                 try:
-                    await self.cache.set_json(cache_key, parsed, expire=2*3600)
+                    await self.cache.set_json(cache_key, parsed, expire=REGEX_PARSED_QUERY_CACHE_TTL_SECONDS)
                 except Exception as e:
                     app_logger.warning(f"Failed to cache regex parsed query: {e}")
             return parsed
@@ -320,6 +887,31 @@ Return valid JSON with this exact structure:
             app_logger.error(f"Error parsing query: {e}")
             return self._get_default_parsed_query(query)
     
+    @staticmethod
+    def _with_original_query(parsed: Dict[str, Any], query: str) -> Dict[str, Any]:
+        """Point a cached parse at this request's wording, since the key ignores case and punctuation."""
+        if "original_query" in parsed:
+            parsed["original_query"] = query
+        return parsed
+    
+    async def parse_many(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Parse several queries concurrently, returning results in input order."""
+        return list(await asyncio.gather(*(self.parse_query(query) for query in queries)))
+    
+    async def _create_completion(self, **kwargs):
+        """Run a chat completion under the shared concurrency cap, retrying transient errors."""
+        for attempt in range(1, OPENAI_MAX_ATTEMPTS + 1):
+            try:
+                async with _openai_semaphore:
+                    return await self.client.chat.completions.create(**kwargs)
+            except _RETRYABLE_OPENAI_ERRORS as e:
+                if attempt == OPENAI_MAX_ATTEMPTS:
+                    raise
+                # Exponential backoff with full jitter
+                delay = random.uniform(0, OPENAI_BACKOFF_BASE_SECONDS * 2 ** attempt)
+                app_logger.warning(f"⏳ OpenAI parse request failed ({type(e).__name__}, attempt {attempt}/{OPENAI_MAX_ATTEMPTS}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
     async def _parse_with_openai(self, query: str) -> Optional[Dict[str, Any]]:
         """Parse query using OpenAI with enhanced prompts."""
         if not self.openai_available or not self.client:
@@ -327,73 +919,13 @@ Return valid JSON with this exact structure:
             return None
             
         try:
-            user_prompt = f"""Parse the following restaurant query and extract all relevant entities:
-
-Query: "{query}"
-
-Extract the following information based on the system guidelines:
-1. Location (city/neighborhood/landmark)
-2. Restaurant name (if specifically mentioned)
-3. Cuisine type (ANY cuisine mentioned, not just supported ones)
-4. Dish name (specific dishes only)
-5. Meal type (breakfast/lunch/dinner/brunch/late-night/snacks/drinks)
-6. Price range preference (1-4 scale as defined)
-7. Dietary restrictions (if any mentioned)
-8. Restaurant features (delivery, outdoor seating, etc.)
-9. Time preference (specific times or relative references)
-10. Party size (number of people)
-11. Query intent (primary purpose of the search)
-12. Confidence scores for each extracted entity
-
-Analyze the query context carefully and return the structured JSON response with appropriate confidence scores for each field."""
-            
-            # Get model from settings with fallback
-            model = getattr(self.settings, 'openai_model', 'gpt-4o')
-            
-            response = await self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self.system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=800  # Increased for expanded response
-            )
+            if self._parse_worker is None or self._parse_worker.done():
+                self._parse_queue = asyncio.Queue()
+                self._parse_worker = asyncio.create_task(self._parse_batch_worker())
             
-            content = response.choices[0].message.content.strip()
-            app_logger.info(f"🤖 OpenAI raw response for '{query}': {content}")
-            
-            # Handle markdown-wrapped JSON responses
-            if content.startswith('```json'):
-                # Extract JSON from markdown code blocks
-                json_start = content.find('{')
-                json_end = content.rfind('}') + 1
-                if json_start != -1 and json_end != 0:
-                    content = content[json_start:json_end]
-            elif content.startswith('```'):
-                # Handle other markdown code blocks
-                lines = content.split('\n')
-                json_lines = []
-                in_json = False
-                for line in lines:
-                    if line.strip().startswith('```'):
-                        if not in_json:
-                            in_json = True
-                        else:
-                            break
-                    elif in_json:
-                        json_lines.append(line)
-                content = '\n'.join(json_lines)
-            
-            # Parse JSON response
-            parsed = json.loads(content)
-            app_logger.info(f"🔍 OpenAI parsed JSON: {parsed}")
+            future = asyncio.get_running_loop().create_future()
+            await self._parse_queue.put((query, future))
+            parsed = await future
             
             # Validate and normalize the response
             validated = self._validate_parsed_query(parsed, query)
@@ -405,209 +937,294 @@ Analyze the query context carefully and return the structured JSON response with
             app_logger.error(f"Error in OpenAI parsing: {e}")
             return None
     
+    async def _parse_batch_worker(self):
+        """Drain queued parse requests and resolve them with one completion per batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._parse_queue.get()]
+            deadline = loop.time() + PARSE_BATCH_MAX_LATENCY
+            while len(batch) < PARSE_BATCH_MAX_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._parse_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Completions run as tasks so a slow one doesn't hold up the next batch window
+            task = asyncio.create_task(self._resolve_parse_batch(batch))
+            self._parse_batches.add(task)
+            task.add_done_callback(self._parse_batches.discard)
+    
+    async def _resolve_parse_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Request raw OpenAI parses for a batch and hand each to its waiting caller."""
+        try:
+            if len(batch) == 1:
+                results = [await self._request_openai_parse(batch[0][0])]
+            else:
+                results = await self._request_openai_parses([query for query, _ in batch])
+            for (_, future), parsed in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(parsed, dict):
+                    future.set_result(parsed)
+                else:
+                    future.set_exception(ValueError(f"Expected a JSON object, got {type(parsed).__name__}"))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    async def _complete_json(self, user_prompt: str, max_tokens: int, response_format: Dict[str, Any]) -> Any:
+        """Send the parser system prompt plus user_prompt and decode the JSON reply."""
+        response = await self._create_completion(
+            model=QUERY_PARSER_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": QUERY_PARSER_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": user_prompt
+                }
+            ],
+            temperature=0.1,
+            max_tokens=max_tokens,
+            response_format=response_format,
+            extra_body={"prompt_cache_key": QUERY_PARSER_PROMPT_VERSION}
+        )
+        
+        prompt_details = getattr(response.usage, "prompt_tokens_details", None)
+        if prompt_details is not None:
+            app_logger.debug("OpenAI parse prompt cache: %s/%s prompt tokens cached",
+                             getattr(prompt_details, "cached_tokens", 0), response.usage.prompt_tokens)
+        
+        content = response.choices[0].message.content.strip()
+        app_logger.info(f"🤖 OpenAI raw response: {content}")
+        return _json_loads(content)
+    
+    async def _request_openai_parse(self, query: str) -> Any:
+        """Parse a single query with OpenAI, returning the decoded JSON unvalidated."""
+        # The static instructions come before the query so the whole cacheable prefix is shared
+        user_prompt = f'{QUERY_PARSER_USER_PROMPT}\n\nQuery: "{query}"'
+        parsed = await self._complete_json(
+            user_prompt,
+            max_tokens=800,  # Increased for expanded response
+            response_format=_PARSED_QUERY_RESPONSE_FORMAT
+        )
+        app_logger.info(f"🔍 OpenAI parsed JSON for '{query}': {parsed}")
+        return parsed
+    
+    async def _request_openai_parses(self, queries: List[str]) -> List[Any]:
+        """Parse several queries with one OpenAI completion, returning results in input order."""
+        user_prompt = f'{QUERY_PARSER_BATCH_USER_PROMPT}\n\nQueries: {json.dumps(queries)}'
+        response = await self._complete_json(
+            user_prompt,
+            max_tokens=800 * len(queries),
+            response_format=_PARSED_QUERY_BATCH_RESPONSE_FORMAT
+        )
+        results = response.get("results") if isinstance(response, dict) else None
+        if not isinstance(results, list) or len(results) != len(queries):
+            raise ValueError(f"Batch parse returned {len(results) if isinstance(results, list) else 'no'} results for {len(queries)} queries")
+        app_logger.info(f"🔍 OpenAI parsed batch of {len(queries)} queries")
+        return results
+    
     def _parse_with_regex(self, query: str) -> Dict[str, Any]:
         """Parse query using regex patterns (fallback method)."""
         query_lower = query.lower()
         
         # Initialize result with new structure
-        result = {
-            "location": None,
-            "restaurant_name": None,
-            "cuisine_type": None,
-            "dish_name": None,
-            "meal_type": None,
-            "price_range": None,
-            "dietary_restrictions": [],
-            "restaurant_features": [],
-            "time_preference": None,
-            "party_size": None,
-            "intent": "unknown",
-            "confidence": {
-                "location": None,
-                "restaurant_name": None,
-                "cuisine_type": None,
-                "dish_name": None,
-                "meal_type": None,
-                "price_range": None,
-                "dietary_restrictions": None,
-                "restaurant_features": None,
-                "time_preference": None,
-                "party_size": None,
-                "overall": 0.5
-            }
-        }
+        result = _new_parsed_query(overall=0.5)
+        
+        # Each field confidence is set at most once; keep a running total for the overall score
+        conf_sum = 0.0
+        conf_count = 0
+        
+        # Location, cuisine and meal type keywords come from a single scan of the query
+        keywords = _scan_keywords(query_lower)
         
         # Extract location
-        location = self._extract_location(query_lower)
+        location = keywords.get("location")
         if location:
             result["location"] = location
             result["confidence"]["location"] = 0.8
+            conf_sum += 0.8
+            conf_count += 1
         
         # Check query patterns (stop after first matched intent to avoid overwriting)
         intent_matched = False
-        for intent, patterns in self.query_patterns.items():
+        for intent, patterns in _QUERY_PATTERNS.items():
             if intent_matched:
                 break
-            for pattern in patterns:
-                match = re.search(pattern, query_lower)
+            for literal, pattern in patterns:
+                if literal not in query_lower:
+                    continue
+                match = pattern.search(query_lower)
                 if match:
                     result["intent"] = intent
                     
                     if intent == "restaurant_specific":
                         result["restaurant_name"] = match.group(1).strip()
                         result["confidence"]["restaurant_name"] = 0.7
+                        conf_sum += 0.7
+                        conf_count += 1
                     elif intent == "location_cuisine":
                         if not result["location"]:
                             result["location"] = match.group(1).strip()
                             result["confidence"]["location"] = 0.7
+                            conf_sum += 0.7
+                            conf_count += 1
                         if len(match.groups()) > 1:
                             result["cuisine_type"] = match.group(2).strip().title()
                             result["confidence"]["cuisine_type"] = 0.8
+                            conf_sum += 0.8
+                            conf_count += 1
                     elif intent == "location_dish":
                         if not result["location"]:
                             result["location"] = match.group(1).strip()
                             result["confidence"]["location"] = 0.7
+                            conf_sum += 0.7
+                            conf_count += 1
                         if len(match.groups()) > 1:
                             result["dish_name"] = match.group(2).strip()
                             result["confidence"]["dish_name"] = 0.7
+                            conf_sum += 0.7
+                            conf_count += 1
                     elif intent == "meal_planning":
                         if not result["location"]:
                             result["location"] = match.group(2).strip() if len(match.groups()) > 1 else match.group(1).strip()
                             result["confidence"]["location"] = 0.7
+                            conf_sum += 0.7
+                            conf_count += 1
                         result["meal_type"] = match.group(1).strip() if len(match.groups()) > 1 else None
                         if result["meal_type"]:
                             result["confidence"]["meal_type"] = 0.7
+                            conf_sum += 0.7
+                            conf_count += 1
                     
                     intent_matched = True
                     break
         
         # Extract additional entities
         if not result["cuisine_type"]:
-            cuisine = self._extract_cuisine(query_lower)
+            cuisine = keywords.get("cuisine_type")
             if cuisine:
                 result["cuisine_type"] = cuisine
                 result["confidence"]["cuisine_type"] = 0.8
+                conf_sum += 0.8
+                conf_count += 1
         
         if not result["dish_name"]:
             dish = self._extract_dish(query_lower)
             if dish:
                 result["dish_name"] = dish
                 result["confidence"]["dish_name"] = 0.7
+                conf_sum += 0.7
+                conf_count += 1
         
         if not result["meal_type"]:
-            meal = self._extract_meal_type(query_lower)
+            meal = keywords.get("meal_type")
             if meal:
                 result["meal_type"] = meal
                 result["confidence"]["meal_type"] = 0.8
+                conf_sum += 0.8
+                conf_count += 1
         
         price_range = self._extract_price_range(query_lower)
         if price_range:
             result["price_range"] = price_range
             result["confidence"]["price_range"] = 0.6
+            conf_sum += 0.6
+            conf_count += 1
         
         # Extract new entities
         dietary = self._extract_dietary_restrictions(query_lower)
         if dietary:
             result["dietary_restrictions"] = dietary
             result["confidence"]["dietary_restrictions"] = 0.8
+            conf_sum += 0.8
+            conf_count += 1
         
         features = self._extract_restaurant_features(query_lower)
         if features:
             result["restaurant_features"] = features
             result["confidence"]["restaurant_features"] = 0.7
+            conf_sum += 0.7
+            conf_count += 1
         
         time_pref = self._extract_time_preference(query_lower)
         if time_pref:
             result["time_preference"] = time_pref
             result["confidence"]["time_preference"] = 0.7
+            conf_sum += 0.7
+            conf_count += 1
         
         party_size = self._extract_party_size(query_lower)
         if party_size:
             result["party_size"] = party_size
             result["confidence"]["party_size"] = 0.8
+            conf_sum += 0.8
+            conf_count += 1
         
-        # Calculate overall confidence
-        confidences = [v for v in result["confidence"].values() if v is not None and v != result["confidence"]["overall"]]
-        if confidences:
-            result["confidence"]["overall"] = sum(confidences) / len(confidences)
+        # Overall confidence is the mean of the field confidences set above (0.5 if none)
+        if conf_count:
+            result["confidence"]["overall"] = conf_sum / conf_count
         
         return result
     
+    def _grounded_regex_parse(self, parsed: Dict[str, Any], query_lower: str) -> Optional[Dict[str, Any]]:
+        """Return a regex parse that can be trusted without asking OpenAI, or None.
+        
+        The intent templates capture free text (``(.+) in (.+)`` files the location under
+        dish_name), so the captured dish is replaced by whatever the dish patterns find, and
+        only parses whose entities all come from the keyword vocabularies qualify.
+        """
+        if parsed["intent"] == "unknown" or parsed["restaurant_name"]:
+            return None
+        if parsed["dish_name"]:
+            # The capture may be the location or raw query casing; the dish patterns give the canonical name
+            dish = self._extract_dish(query_lower)
+            intent = parsed["intent"]
+            if not dish and intent == "location_dish":
+                if not parsed["cuisine_type"]:
+                    return None
+                intent = "location_cuisine"
+            confidence = parsed["confidence"].copy()
+            confidence["dish_name"] = confidence["dish_name"] if dish else None
+            # Overall stays the mean of the field confidences that remain set
+            scores = [score for field, score in confidence.items() if field != "overall" and score is not None]
+            confidence["overall"] = sum(scores) / len(scores) if scores else 0.5
+            parsed = {**parsed, "intent": intent, "dish_name": dish, "confidence": confidence}
+        if parsed["confidence"]["overall"] < REGEX_SHORT_CIRCUIT_MIN_CONFIDENCE:
+            return None
+        if not (parsed["location"] or parsed["cuisine_type"] or parsed["dish_name"]):
+            return None
+        if any(parsed[field] and parsed[field] not in labels for field, labels in _KEYWORD_LABELS.items()):
+            return None
+        return parsed
+    
     def _extract_location(self, query: str) -> Optional[str]:
         """Extract location from query."""
-        # Expanded location list
-        locations = [
-            "jersey city", "hoboken", "manhattan", "new york", "nyc"
-        ]
-        
-        for location in locations:
-            if location in query:
-                return self._normalize_city_name(location)
-        
-        return None
-    
-    def _normalize_city_name(self, city: str) -> str:
-        """Normalize city names to standard format."""
-        city_mapping = {
-            "jersey city": "Jersey City",
-            "hoboken": "Hoboken", 
-            "manhattan": "Manhattan",
-            "new york": "Manhattan",  # Map New York to Manhattan for our system
-            "nyc": "Manhattan"        # Map NYC to Manhattan for our system
-        }
-        
-        return city_mapping.get(city.lower(), city.title())
+        return _scan_keywords(query).get("location")
     
     def _extract_cuisine(self, query: str) -> Optional[str]:
         """Extract cuisine type from query (expanded list)."""
-        cuisines = {
-                "italian": "Italian", "indian": "Indian", "chinese": "Chinese",
-                "american": "American", "mexican": "Mexican",
-                "thai": "Thai", "japanese": "Japanese", "korean": "Korean", 
-                "french": "French", "vietnamese": "Vietnamese", "greek": "Greek",
-                "ethiopian": "Ethiopian", "mongolian": "Mongolian", "spanish": "Spanish",
-                "lebanese": "Lebanese", "turkish": "Turkish", "moroccan": "Moroccan"
-        }
-        
-        for cuisine_key, cuisine_name in cuisines.items():
-            if cuisine_key in query:
-                return cuisine_name
-        
-        return None
+        return _scan_keywords(query).get("cuisine_type")
     
     def _extract_dish(self, query: str) -> Optional[str]:
         """Extract dish name from query (expanded patterns, Indian multi-word)."""
         q = query.lower()
 
         # High-priority: adjective + dish patterns (no beef)
-        combo = re.search(
-            r'\b(chicken|mutton|lamb|paneer|vegetable|veg|egg)\s+'
-            r'(biryani|curry|korma|tikka masala|butter chicken|butter masala|saag|kebab|keema|karahi|bhuna|tikka)\b',
-            q, re.IGNORECASE
-        )
+        combo = _DISH_COMBO_RE.search(q)
         if combo:
             return combo.group(0).title()
 
-        # Named multi-word dishes
-        named_patterns = [
-            r'\b(chana masala|masala dosa|palak paneer|paneer tikka|chole bhature|dal makhani|malai kofta|aloo gobi)\b',
-            r'\b(veg biryani|vegetable biryani|mutton biryani|chicken biryani|paneer biryani)\b',
-            r'\b(tandoori chicken|chicken tikka)\b'
-        ]
-        for pat in named_patterns:
-            m = re.search(pat, q, re.IGNORECASE)
-            if m:
-                return m.group(0).title()
-
-        # Existing generic patterns
-        generic = [
-            r'\b(chicken curry|fish curry|mutton curry|dal|paneer|butter chicken|tikka masala)\b',
-            r'\b(pizza|pasta|burger|sandwich|salad|soup|steak|ribs)\b',
-            r'\b(tacos?|burrito|quesadilla|nachos)\b',
-            r'\b(kung pao|sweet and sour|general tso|chow mein|lo mein|fried rice|chicken fried rice|egg fried rice)\b'
-        ]
-        for pat in generic:
-            m = re.search(pat, q, re.IGNORECASE)
+        # Named multi-word dishes, then existing generic patterns
+        for pattern in _DISH_PATTERNS:
+            m = pattern.search(q)
             if m:
                 return m.group(0).title()
 
@@ -615,205 +1232,93 @@ Analyze the query context carefully and return the structured JSON response with
     
     def _extract_meal_type(self, query: str) -> Optional[str]:
         """Extract meal type from query (expanded options)."""
-        meal_types = {
-            "breakfast": "breakfast", "lunch": "lunch", "dinner": "dinner",
-            "brunch": "brunch", "late night": "late-night", "late-night": "late-night",
-            "snack": "snacks", "snacks": "snacks", "drinks": "drinks",
-            "happy hour": "drinks", "cocktails": "drinks"
-        }
-        
-        for meal_key, meal_name in meal_types.items():
-            if meal_key in query:
-                return meal_name
-        
-        return None
+        return _scan_keywords(query).get("meal_type")
     
     def _extract_price_range(self, query: str) -> Optional[int]:
         """Extract price range from query (improved patterns)."""
-        price_patterns = [
-            (r'\$(\$+)', lambda m: len(m.group(1)) + 1),
-            (r'(\d+)\s*dollars?', lambda m: min(4, max(1, int(m.group(1)) // 15))),
-            (r'\b(cheap|budget|affordable)\b', lambda m: 1),
-            (r'\b(reasonable|moderate|mid-range)\b', lambda m: 2),
-            (r'\b(upscale|nice|fancy)\b', lambda m: 3),
-            (r'\b(expensive|fine dining|high-end|luxury)\b', lambda m: 4)
-        ]
+        q = query.lower()
+        if not _mentions_any(q, _PRICE_TRIGGERS):
+            return None
         
-        for pattern, extractor in price_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        for pattern, extractor in _PRICE_PATTERNS:
+            match = pattern.search(q)
             if match:
                 return extractor(match)
         
-        return None
+        # Lower price levels take priority, matching the keyword order
+        levels = [_PRICE_KEYWORD_LEVELS[m.lastgroup] for m in _PRICE_KEYWORD_RE.finditer(q)]
+        return min(levels) if levels else None
     
     def _extract_dietary_restrictions(self, query: str) -> List[str]:
         """Extract dietary restrictions from query."""
-        restrictions = []
-        dietary_patterns = {
-            r'\b(vegetarian|veggie)\b': 'vegetarian',
-            r'\b(vegan)\b': 'vegan',
-            r'\b(gluten.free|gluten free)\b': 'gluten-free',
-            r'\b(halal)\b': 'halal',
-            r'\b(kosher)\b': 'kosher',
-            r'\b(keto|ketogenic)\b': 'keto',
-            r'\b(low.carb|low carb)\b': 'low-carb',
-            r'\b(dairy.free|dairy free|lactose.free)\b': 'dairy-free',
-            r'\b(nut.free|nut free)\b': 'nut-free'
-        }
-        
-        for pattern, restriction in dietary_patterns.items():
-            if re.search(pattern, query, re.IGNORECASE):
-                restrictions.append(restriction)
-        
-        return restrictions
+        q = query.lower()
+        if not _mentions_any(q, _DIETARY_TRIGGERS):
+            return []
+        found = {m.lastgroup for m in _DIETARY_RE.finditer(q)}
+        return [label for group, label in _DIETARY_LABELS.items() if group in found]
     
     def _extract_restaurant_features(self, query: str) -> List[str]:
         """Extract restaurant features from query."""
-        features = []
-        feature_patterns = {
-            r'\b(outdoor|outside|patio|terrace)\b': 'outdoor_seating',
-            r'\b(delivery|deliver)\b': 'delivery',
-            r'\b(takeout|take.out|pickup)\b': 'takeout',
-            r'\b(reservation|book|booking)\b': 'reservations',
-            r'\b(parking|park)\b': 'parking',
-            r'\b(live music|music|band)\b': 'live_music',
-            r'\b(bar|drinks|cocktails)\b': 'bar',
-            r'\b(kid.friendly|kids|family|children)\b': 'kid_friendly',
-            r'\b(romantic|date|intimate)\b': 'romantic',
-            r'\b(business|meeting|corporate)\b': 'business_dinner',
-            r'\b(casual|relaxed|laid.back)\b': 'casual',
-            r'\b(formal|upscale|elegant)\b': 'formal',
-            r'\b(pet.friendly|dog.friendly|pets)\b': 'pet_friendly'
-        }
-        
-        for pattern, feature in feature_patterns.items():
-            if re.search(pattern, query, re.IGNORECASE):
-                features.append(feature)
-        
-        return features
+        q = query.lower()
+        if not _mentions_any(q, _FEATURE_TRIGGERS):
+            return []
+        found = {m.lastgroup for m in _FEATURE_RE.finditer(q)}
+        return [feature for feature in _FEATURE_LABELS if feature in found]
     
     def _extract_time_preference(self, query: str) -> Optional[str]:
         """Extract time preference from query."""
-        time_patterns = [
-            r'\b(\d{1,2}:\d{2}\s*(?:am|pm)?)\b',
-            r'\b(\d{1,2}\s*(?:am|pm))\b',
-            r'\b(now|asap|immediately)\b',
-            r'\b(tonight|today|tomorrow)\b',
-            r'\b(lunch time|dinner time|breakfast time)\b',
-            r'\b(early|late|around \d+)\b'
-        ]
+        q = query.lower()
+        if not (_DIGIT_RE.search(q) or _mentions_any(q, _TIME_TRIGGERS)):
+            return None
         
-        for pattern in time_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        for pattern in _TIME_PATTERNS:
+            match = pattern.search(q)
             if match:
-                return match.group(1).lower()
+                return match.group(1)
         
         return None
     
     def _extract_party_size(self, query: str) -> Optional[int]:
         """Extract party size from query."""
-        party_patterns = [
-            r'\b(?:table for|party of|group of)\s*(\d+)\b',
-            r'\b(\d+)\s*(?:people|person|ppl)\b',
-            r'\b(two|three|four|five|six|seven|eight)\b'
-        ]
-        
-        number_words = {
-            'two': 2, 'three': 3, 'four': 4, 'five': 5,
-            'six': 6, 'seven': 7, 'eight': 8
-        }
+        q = query.lower()
+        if not (_DIGIT_RE.search(q) or _mentions_any(q, _PARTY_TRIGGERS)):
+            return None
         
-        for pattern in party_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        for pattern in _PARTY_PATTERNS:
+            match = pattern.search(q)
             if match:
                 try:
                     return int(match.group(1))
                 except ValueError:
-                    word = match.group(1).lower()
-                    if word in number_words:
-                        return number_words[word]
+                    word = match.group(1)
+                    if word in _NUMBER_WORDS:
+                        return _NUMBER_WORDS[word]
         
         # Special cases
-        if re.search(r'\b(date|couple|romantic)\b', query, re.IGNORECASE):
+        if _PARTY_COUPLE_RE.search(q):
             return 2
-        if re.search(r'\b(family|kids)\b', query, re.IGNORECASE):
+        if _PARTY_FAMILY_RE.search(q):
             return 4  # Estimated family size
         
         return None
     
     def _validate_parsed_query(self, parsed: Dict[str, Any], original_query: str) -> Dict[str, Any]:
-        """Validate and normalize parsed query (updated for new structure)."""
+        """Normalize a parsed query; its shape and value ranges are enforced by PARSED_QUERY_SCHEMA."""
         app_logger.info(f"🔍 _validate_parsed_query input: {parsed}")
         
-        # Ensure all required fields exist
-        required_fields = [
-            "location", "restaurant_name", "cuisine_type", "dish_name", 
-            "meal_type", "price_range", "dietary_restrictions", "restaurant_features",
-            "time_preference", "party_size", "intent", "confidence"
-        ]
-        
-        for field in required_fields:
-            if field not in parsed:
-                if field in ["dietary_restrictions", "restaurant_features"]:
-                    parsed[field] = []
-                elif field == "confidence":
-                    parsed[field] = {"overall": 0.5}
-                else:
-                    parsed[field] = None
-        
         # Validate location (expanded list)
         if parsed["location"]:
-            valid_locations = [
-                "Jersey City", "Hoboken"
-            ]
-            if parsed["location"] not in valid_locations:
+            if parsed["location"] not in _VALIDATED_LOCATIONS:
                 # Try to match partial names
                 location_lower = parsed["location"].lower()
-                for valid_loc in valid_locations:
+                for valid_loc in _VALIDATED_LOCATIONS:
                     if location_lower in valid_loc.lower() or valid_loc.lower() in location_lower:
                         parsed["location"] = valid_loc
                         break
                 # IMPORTANT: do NOT set unsupported locations to None here.
                 # Leave as-is so API validation can detect unsupported_location
         
-        # Validate cuisine type (expanded list) - PRESERVE unsupported cuisines for scope validation
-        if parsed["cuisine_type"]:
-            # Don't set unsupported cuisines to None - let scope validation handle them
-            pass
-        
-        # Validate price range
-        if parsed["price_range"]:
-            try:
-                price_range = int(parsed["price_range"])
-                if price_range < 1 or price_range > 4:
-                    parsed["price_range"] = None
-                else:
-                    parsed["price_range"] = price_range
-            except (ValueError, TypeError):
-                parsed["price_range"] = None
-        
-        # Validate confidence structure
-        if not isinstance(parsed["confidence"], dict):
-            parsed["confidence"] = {"overall": 0.5}
-        
-        if "overall" not in parsed["confidence"]:
-            # Calculate overall confidence from individual scores
-            individual_scores = [v for k, v in parsed["confidence"].items() 
-                               if k != "overall" and v is not None]
-            if individual_scores:
-                parsed["confidence"]["overall"] = sum(individual_scores) / len(individual_scores)
-            else:
-                parsed["confidence"]["overall"] = 0.5
-        
-        # Validate overall confidence range
-        try:
-            overall_conf = float(parsed["confidence"]["overall"])
-            if overall_conf < 0 or overall_conf > 1:
-                parsed["confidence"]["overall"] = 0.5
-            else:
-                parsed["confidence"]["overall"] = overall_conf
-        except (ValueError, TypeError):
-            parsed["confidence"]["overall"] = 0.5
+        # Unsupported cuisines are preserved for scope validation
         
         # Add original query to parsed result
         parsed["original_query"] = original_query
@@ -823,33 +1328,9 @@ Analyze the query context carefully and return the structured JSON response with
     
     def _get_default_parsed_query(self, query: str) -> Dict[str, Any]:
         """Get default parsed query when parsing fails (updated structure)."""
-        return {
-            "location": None,
-            "restaurant_name": None,
-            "cuisine_type": None,
-            "dish_name": None,
-            "meal_type": None,
-            "price_range": None,
-            "dietary_restrictions": [],
-            "restaurant_features": [],
-            "time_preference": None,
-            "party_size": None,
-            "intent": "unknown",
-            "confidence": {
-                "location": None,
-                "restaurant_name": None,
-                "cuisine_type": None,
-                "dish_name": None,
-                "meal_type": None,
-                "price_range": None,
-                "dietary_restrictions": None,
-                "restaurant_features": None,
-                "time_preference": None,
-                "party_size": None,
-                "overall": 0.0
-            },
-            "original_query": query
-        }
+        parsed = _new_parsed_query(overall=0.0)
+        parsed["original_query"] = query
+        return parsed
     
     def classify_query_type(self, parsed_query: Dict[str, Any]) -> str:
         """Classify the query type based on parsed entities (updated intents)."""
@@ -858,112 +1339,56 @@ Analyze the query context carefully and return the structured JSON response with
         if intent != "unknown":
             return intent
         
-        # Fallback classification based on entities
+        # Fallback classification based on entities, each read once
+        location = parsed_query.get("location")
+        cuisine_type = parsed_query.get("cuisine_type")
+        dish_name = parsed_query.get("dish_name")
+        features = parsed_query.get("restaurant_features")
+        
         if parsed_query.get("restaurant_name"):
             return "restaurant_specific"
-        elif parsed_query.get("dietary_restrictions"):
+        if parsed_query.get("dietary_restrictions"):
             return "dietary_focused"
-        elif parsed_query.get("restaurant_features") and any(f in parsed_query["restaurant_features"] for f in ["delivery", "takeout"]):
+        if features and not _DELIVERY_FEATURES.isdisjoint(features):
             return "delivery_takeout"
-        elif parsed_query.get("location") and parsed_query.get("cuisine_type"):
-            return "location_cuisine"
-        elif parsed_query.get("location") and parsed_query.get("dish_name"):
-            return "location_dish"
-        elif parsed_query.get("location") and parsed_query.get("meal_type"):
-            return "meal_planning"
-        elif parsed_query.get("location"):
+        if location:
+            if cuisine_type:
+                return "location_cuisine"
+            if dish_name:
+                return "location_dish"
+            if parsed_query.get("meal_type"):
+                return "meal_planning"
             return "location_general"
-        elif parsed_query.get("cuisine_type"):
+        if cuisine_type:
             return "cuisine_general"
-        elif parsed_query.get("dish_name"):
+        if dish_name:
             return "dish_search"
-        else:
-            return "unknown"
+        return "unknown"
     
-    def expand_dish_name(self, dish: str, cuisine_type: Optional[str] = None) -> List[str]:
-        """Expand short dish names into specific variants."""
+    def expand_dish_name(self, dish: str, cuisine_type: Optional[str] = None) -> Sequence[str]:
+        """Expand short dish names into specific variants (a shared, read-only tuple)."""
         if not dish:
-            return []
+            return ()
         
-        dish_lower = dish.lower().strip()
-        
-        # Dish expansion mappings
-        dish_expansions = {
-            # Indian dishes
-            'biryani': ['Chicken Biryani', 'Mutton Biryani', 'Vegetable Biryani', 'Hyderabadi Biryani'],
-            'curry': ['Chicken Curry', 'Lamb Curry', 'Vegetable Curry', 'Butter Chicken'],
-            'tandoori': ['Tandoori Chicken', 'Tandoori Fish', 'Tandoori Vegetables'],
-            'naan': ['Butter Naan', 'Garlic Naan', 'Plain Naan'],
-            'dal': ['Dal Makhani', 'Dal Tadka', 'Yellow Dal'],
-            'samosa': ['Vegetable Samosa', 'Chicken Samosa'],
-            'kebab': ['Chicken Kebab', 'Lamb Kebab', 'Seekh Kebab'],
-            
-            # Italian dishes
-            'pizza': ['Margherita Pizza', 'Pepperoni Pizza', 'Marinara Pizza', 'Quattro Stagioni', 'Bufalina Pizza', 'New York Pizza', 'Neapolitan Pizza', 'Sicilian Pizza'],
-            'pasta': ['Spaghetti Carbonara', 'Fettuccine Alfredo', 'Penne Arrabbiata', 'Lasagna'],
-            'risotto': ['Mushroom Risotto', 'Seafood Risotto', 'Truffle Risotto'],
-            'gnocchi': ['Potato Gnocchi', 'Spinach Gnocchi'],
-            'ravioli': ['Cheese Ravioli', 'Spinach Ravioli', 'Mushroom Ravioli'],
-            
-            # Chinese dishes
-            'dim sum': ['Har Gow', 'Siu Mai', 'Char Siu Bao', 'Xiao Long Bao'],
-            'noodles': ['Lo Mein', 'Chow Mein', 'Dan Dan Noodles'],
-            'rice': ['Fried Rice', 'Steamed Rice', 'Yangzhou Fried Rice'],
-            'soup': ['Hot and Sour Soup', 'Wonton Soup', 'Egg Drop Soup'],
-            
-            # American dishes
-            'burger': ['Cheeseburger', 'Bacon Burger', 'Veggie Burger'],
-            'sandwich': ['Club Sandwich', 'BLT', 'Turkey Sandwich'],
-            'steak': ['Ribeye Steak', 'Filet Mignon', 'Sirloin Steak'],
-            'salad': ['Caesar Salad', 'Greek Salad', 'Cobb Salad'],
-            
-            # Mexican dishes
-            'taco': ['Beef Taco', 'Chicken Taco', 'Fish Taco', 'Veggie Taco'],
-            'burrito': ['Beef Burrito', 'Chicken Burrito', 'Bean Burrito'],
-            'enchilada': ['Chicken Enchilada', 'Beef Enchilada', 'Cheese Enchilada'],
-            'quesadilla': ['Chicken Quesadilla', 'Cheese Quesadilla'],
-            
-            # Generic dishes
-            'sushi': ['California Roll', 'Salmon Nigiri', 'Spicy Tuna Roll'],
-            'ramen': ['Tonkotsu Ramen', 'Miso Ramen', 'Shoyu Ramen'],
-            'pho': ['Beef Pho', 'Chicken Pho', 'Vegetable Pho'],
-            'pad thai': ['Chicken Pad Thai', 'Shrimp Pad Thai', 'Tofu Pad Thai']
-        }
-        
-        # Return expanded variants if found
-        if dish_lower in dish_expansions:
-            return dish_expansions[dish_lower]
-        
-        # If not found, return the original dish name
-        return [dish]
+        return _expand_dish(dish)
     
     def get_query_entities(self, parsed_query: Dict[str, Any]) -> Dict[str, Any]:
         """Extract key entities from parsed query (updated with new fields)."""
         return {
-            "location": parsed_query.get("location"),
-            "restaurant_name": parsed_query.get("restaurant_name"),
-            "cuisine_type": parsed_query.get("cuisine_type"),
-            "dish_name": parsed_query.get("dish_name"),
-            "meal_type": parsed_query.get("meal_type"),
-            "price_range": parsed_query.get("price_range"),
-            "dietary_restrictions": parsed_query.get("dietary_restrictions", []),
-            "restaurant_features": parsed_query.get("restaurant_features", []),
-            "time_preference": parsed_query.get("time_preference"),
-            "party_size": parsed_query.get("party_size")
+            field: parsed_query.get(field, [] if field in _LIST_ENTITY_FIELDS else None)
+            for field in _ENTITY_FIELDS
         }
     
     def is_valid_query(self, parsed_query: Dict[str, Any]) -> bool:
         """Check if parsed query is valid (updated validation logic)."""
         # Require a strong anchor: location OR restaurant OR specific dish
-        if not any([
-            parsed_query.get("location"),
-            parsed_query.get("restaurant_name"),
-            parsed_query.get("dish_name"),
-        ]):
+        if not (parsed_query.get("location")
+                or parsed_query.get("restaurant_name")
+                or parsed_query.get("dish_name")):
             return False
         
         # Must have some intent (not unknown)
-        if parsed_query.get("intent") in ["unknown", "unclear"]:
+        if parsed_query.get("intent") in _WEAK_INTENTS:
             # Check if overall confidence is too low
             confidence = parsed_query.get("confidence", {})
             overall_conf = confidence.get("overall", 0)
@@ -977,80 +1402,38 @@ Analyze the query context carefully and return the structured JSON response with
         confidence = parsed_query.get("confidence", {})
         return confidence.get("overall", 0.0)
     
-    def has_location_context(self, parsed_query: Dict[str, Any]) -> bool:
+    @staticmethod
+    def has_location_context(parsed_query: Dict[str, Any]) -> bool:
         """Check if query has location context."""
         return bool(parsed_query.get("location"))
     
-    def has_cuisine_preference(self, parsed_query: Dict[str, Any]) -> bool:
+    @staticmethod
+    def has_cuisine_preference(parsed_query: Dict[str, Any]) -> bool:
         """Check if query has cuisine preference."""
         return bool(parsed_query.get("cuisine_type"))
     
-    def has_dietary_requirements(self, parsed_query: Dict[str, Any]) -> bool:
+    @staticmethod
+    def has_dietary_requirements(parsed_query: Dict[str, Any]) -> bool:
         """Check if query has dietary requirements."""
-        dietary = parsed_query.get("dietary_restrictions", [])
-        return bool(dietary)
+        return bool(parsed_query.get("dietary_restrictions"))
     
     def get_search_filters(self, parsed_query: Dict[str, Any]) -> Dict[str, Any]:
         """Extract search filters for restaurant recommendation system."""
         filters = {}
-        
-        if parsed_query.get("location"):
-            filters["location"] = parsed_query["location"]
-        
-        if parsed_query.get("cuisine_type"):
-            filters["cuisine"] = parsed_query["cuisine_type"]
-        
-        if parsed_query.get("price_range"):
-            filters["price_range"] = parsed_query["price_range"]
-        
-        if parsed_query.get("meal_type"):
-            filters["meal_type"] = parsed_query["meal_type"]
-        
-        if parsed_query.get("dietary_restrictions"):
-            filters["dietary_restrictions"] = parsed_query["dietary_restrictions"]
-        
-        if parsed_query.get("restaurant_features"):
-            filters["features"] = parsed_query["restaurant_features"]
-        
-        if parsed_query.get("party_size"):
-            filters["party_size"] = parsed_query["party_size"]
+        for field, name in _SEARCH_FILTER_FIELDS:
+            value = parsed_query.get(field)
+            if value:
+                filters[name] = value
         
         return filters
     
     def get_query_summary(self, parsed_query: Dict[str, Any]) -> str:
         """Generate a human-readable summary of the parsed query."""
         parts = []
-        
-        if parsed_query.get("restaurant_name"):
-            parts.append(f"Restaurant: {parsed_query['restaurant_name']}")
-        
-        if parsed_query.get("cuisine_type"):
-            parts.append(f"Cuisine: {parsed_query['cuisine_type']}")
-        
-        if parsed_query.get("dish_name"):
-            parts.append(f"Dish: {parsed_query['dish_name']}")
-        
-        if parsed_query.get("location"):
-            parts.append(f"Location: {parsed_query['location']}")
-        
-        if parsed_query.get("meal_type"):
-            parts.append(f"Meal: {parsed_query['meal_type']}")
-        
-        if parsed_query.get("price_range"):
-            price_labels = {1: "Budget", 2: "Moderate", 3: "Upscale", 4: "Fine Dining"}
-            parts.append(f"Price: {price_labels.get(parsed_query['price_range'], 'Unknown')}")
-        
-        if parsed_query.get("dietary_restrictions"):
-            parts.append(f"Dietary: {', '.join(parsed_query['dietary_restrictions'])}")
-        
-        if parsed_query.get("restaurant_features"):
-            parts.append(f"Features: {', '.join(parsed_query['restaurant_features'])}")
-        
-        if parsed_query.get("party_size"):
-            parts.append(f"Party size: {parsed_query['party_size']}")
-        
-        if parsed_query.get("time_preference"):
-            parts.append(f"Time: {parsed_query['time_preference']}")
+        for field, label, format_value in _SUMMARY_FIELDS:
+            value = parsed_query.get(field)
+            if value:
+                parts.append(f"{label}: {format_value(value)}")
         
         summary = " | ".join(parts) if parts else "General restaurant search"
         intent = parsed_query.get("intent", "unknown")
@@ -1075,9 +1458,11 @@ Analyze the query context carefully and return the structured JSON response with
         
         try:
             original_location = parsed_query["location"]
+            # resolve_location keeps its own LRU memo, so repeat locations are a dict probe
             location_info = location_resolver.resolve_location(original_location)
             
-            app_logger.info(f"🔍 Location resolution: '{original_location}' -> {location_info}")
+            if app_logger.isEnabledFor(logging.INFO):
+                app_logger.info("🔍 Location resolution: '%s' -> %s", original_location, location_info)
             
             # Update parsed query with resolved location info
             if location_info.location_type == "unsupported":
@@ -1117,4 +1502,22 @@ Analyze the query context carefully and return the structured JSON response with
             parsed_query["original_location"] = original_location
             parsed_query["resolved_city"] = original_location
             parsed_query["neighborhood"] = None
-            return parsed_query
\ No newline at end of file
+            return parsed_query
+
+
+# A parser owns its parse batching queue and worker on top of the shared clients, so callers
+# on the request path reuse one instance instead of constructing a parser per call
+_query_parser: Optional[QueryParser] = None
+
+
+def get_query_parser() -> QueryParser:
+    """Return the shared QueryParser, creating it on first use."""
+    global _query_parser
+    if _query_parser is None:
+        _query_parser = QueryParser()
+    return _query_parser
+
+
+async def parse_query(query: str) -> Dict[str, Any]:
+    """Parse a query with the shared QueryParser."""
+    return await get_query_parser().parse_query(query)
@@ -2,6 +2,9 @@
 Retrieval engine for vector similarity search and recommendation logic.
 """
 import asyncio
+import heapq
+import time
+from collections import OrderedDict
 from typing import List, Dict, Optional, Any, Tuple
 from openai import AsyncOpenAI
 from src.utils.config import get_settings
@@ -9,6 +12,61 @@ from src.utils.logger import app_logger
 from src.utils.location_resolver import location_resolver
 from src.vector_db.milvus_client import MilvusClient
 
+
+# In-flight Milvus lookups per restaurant dishes fan-out
+RESTAURANT_FETCH_CONCURRENCY = 16
+
+# Restaurant IDs per "restaurant_id in [...]" query, keeping filter expressions bounded
+RESTAURANT_BULK_CHUNK_SIZE = 1000
+
+# Restaurant details cache (restaurant_id -> details), shared by all handlers
+RESTAURANT_CACHE_MAX_SIZE = 10000
+RESTAURANT_CACHE_TTL_SECONDS = 300
+
+# Topics-first dish search cache ((cuisine, limit) -> dishes)
+TOPIC_DISHES_CACHE_MAX_SIZE = 256
+TOPIC_DISHES_CACHE_TTL_SECONDS = 60
+
+
+def _dedupe_recommendations(recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop repeated (dish_name, restaurant_id) pairs, keeping the first occurrence in order."""
+    unique: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+    for rec in recommendations:
+        unique.setdefault((rec["dish_name"], rec["restaurant_id"]), rec)
+    return list(unique.values())
+
+
+def _topic_dish_score(dish: Dict[str, Any]) -> float:
+    """final_score of a topics-first dish row, coerced as in _topic_dish_recommendation."""
+    return float(dish.get("final_score", 0.0) or 0.0)
+
+
+def _topic_dish_recommendation(dish: Dict[str, Any], restaurant: Dict[str, Any], location: str,
+                               cuisine_type: Optional[str]) -> Dict[str, Any]:
+    """Build a recommendation entry with hybrid fields from a topics-first dish row.
+    
+    cuisine_type falls back to the restaurant's cuisine when not given.
+    """
+    return {
+        "type": "dish",
+        "dish_name": dish.get("dish_name", "Unknown"),
+        "restaurant_name": restaurant.get("restaurant_name", "Unknown"),
+        "restaurant_id": restaurant.get("restaurant_id", ""),
+        "location": location,
+        "neighborhood": restaurant.get("neighborhood", ""),
+        "cuisine_type": cuisine_type or restaurant.get("cuisine_type"),
+        "sentiment_score": float(dish.get("sentiment_score", 0.0) or 0.0),
+        "recommendation_score": float(dish.get("recommendation_score", 0.0) or 0.0),
+        # Hybrid fields
+        "topic_mentions": int(dish.get("topic_mentions", 0) or 0),
+        "topic_score": float(dish.get("topic_score", 0.0) or 0.0),
+        "final_score": float(dish.get("final_score", 0.0) or 0.0),
+        "source": dish.get("source", "hybrid"),
+        "restaurant_rating": float(restaurant.get("rating", 0.0) or 0.0),
+        "confidence": float(dish.get("confidence_score", 0.5) or 0.5)
+    }
+
+
 class RetrievalEngine:
     """Retrieval engine for restaurant and dish recommendations."""
     
@@ -17,6 +75,12 @@ class RetrievalEngine:
         self.milvus_client = milvus_client
         self.client = AsyncOpenAI(api_key=self.settings.openai_api_key)
         self._embedding_cache = {}
+        
+        # restaurant_id -> (cached_at, details); see _get_restaurant_details_bulk
+        self._restaurant_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        
+        # (cuisine, limit) -> (cached_at, dishes); see _search_dishes_with_topics
+        self._topic_dishes_cache: "OrderedDict[Tuple[Optional[str], int], Tuple[float, List[Dict]]]" = OrderedDict()
     
     async def get_recommendations(self, parsed_query: Dict[str, Any], max_results: int = 10) -> Tuple[List[Dict], bool, Optional[str]]:
         """Get recommendations based on parsed query."""
@@ -57,16 +121,9 @@ class RetrievalEngine:
         restaurant_id = restaurants[0]["restaurant_id"]
         dishes = await self._get_restaurant_dishes(restaurant_id, limit=max_results)
         
-        # Format recommendations with deduplication
+        # Format recommendations
         recommendations = []
-        seen_dishes = set()  # Track (dish_name, restaurant_id) combinations
-        
         for dish in dishes:
-            dish_key = (dish["dish_name"], restaurant_id)
-            if dish_key in seen_dishes:
-                continue  # Skip duplicates
-            seen_dishes.add(dish_key)
-            
             recommendation = {
                 "type": "dish",
                 "dish_name": dish["dish_name"],
@@ -87,7 +144,7 @@ class RetrievalEngine:
             }
             recommendations.append(recommendation)
         
-        return recommendations, False, None
+        return _dedupe_recommendations(recommendations), False, None
     
     async def _handle_location_cuisine_query(self, parsed_query: Dict[str, Any], max_results: int) -> Tuple[List[Dict], bool, Optional[str]]:
         """Handle location + cuisine queries (e.g., "I am in Jersey City and in mood to eat Indian cuisine")."""
@@ -123,9 +180,11 @@ class RetrievalEngine:
                         app_logger.info(f"✅ Found {len(yelp_neighborhood_results)} restaurants in {neighborhood} via Yelp API")
                         # Convert Yelp results to our recommendation format
                         recommendations = []
-                        for restaurant in yelp_neighborhood_results[:3]:  # Top 3 restaurants
-                            dishes = await self._get_restaurant_dishes(restaurant["restaurant_id"], 3)
-                            
+                        top_restaurants = yelp_neighborhood_results[:3]  # Top 3 restaurants
+                        restaurant_dishes = await self._get_restaurant_dishes_many(
+                            [restaurant["restaurant_id"] for restaurant in top_restaurants], 3
+                        )
+                        for restaurant, dishes in zip(top_restaurants, restaurant_dishes):
                             for dish in dishes:
                                 recommendation = {
                                     "type": "dish",
@@ -148,60 +207,90 @@ class RetrievalEngine:
                 except Exception as e:
                     app_logger.warning(f"Yelp neighborhood search failed: {e}")
         
-        # 1) Topics-first dish retrieval (hybrid)
-        try:
-            topic_dishes = self.milvus_client.search_dishes_with_topics(cuisine=cuisine_type, limit=max_results * 3)
-            app_logger.info(f"🔍 Topics-first: found {len(topic_dishes)} {cuisine_type} dishes with topics")
-
-            # Filter by city/neighborhood via restaurant details
-            filtered_topic_dishes: List[Dict[str, Any]] = []
-            for dish in topic_dishes:
-                restaurant = await self._get_restaurant_details(dish.get("restaurant_id", ""))
-                if not restaurant:
-                    continue
-                # City filter
-                if restaurant.get("city") != city:
-                    continue
-                # Neighborhood filter if requested
-                if neighborhood and restaurant.get("neighborhood") and neighborhood.lower() not in restaurant.get("neighborhood", "").lower():
-                    continue
-
-                # Build recommendation entry with hybrid fields
-                filtered_topic_dishes.append({
+        # 1) Topics-first dish retrieval (hybrid) and 2) the restaurant-first backfill search
+        # hit Milvus independently, so run them concurrently and merge afterwards
+        topic_backfill, restaurants = await asyncio.gather(
+            self._location_cuisine_topic_recommendations(location, city, neighborhood, cuisine_type, max_results),
+            self._location_cuisine_restaurants(city, neighborhood, cuisine_type, max_results)
+        )
+        
+        # If topics-first found enough, return immediately
+        if len(topic_backfill) >= max_results:
+            return topic_backfill, False, None
+        
+        if not restaurants:
+            return [], False, f"No {cuisine_type} restaurants found in {location}"
+        
+        # Seed with any topic-based recs we already have, then add top dishes for each restaurant
+        recommendations: List[Dict[str, Any]] = list(topic_backfill)
+        
+        top_restaurants = restaurants[:3]  # Top 3 restaurants
+        restaurant_dishes = await self._get_restaurant_dishes_many(
+            [restaurant["restaurant_id"] for restaurant in top_restaurants], 3
+        )
+        for restaurant, dishes in zip(top_restaurants, restaurant_dishes):
+            for dish in dishes:
+                recommendation = {
                     "type": "dish",
-                    "dish_name": dish.get("dish_name", "Unknown"),
-                    "restaurant_name": restaurant.get("restaurant_name", "Unknown"),
-                    "restaurant_id": restaurant.get("restaurant_id", ""),
+                    "dish_name": dish["dish_name"],
+                    "restaurant_name": restaurant["restaurant_name"],
+                    "restaurant_id": restaurant["restaurant_id"],
                     "cuisine_type": cuisine_type,
                     "location": location,
                     "neighborhood": restaurant.get("neighborhood", ""),
-                    "sentiment_score": float(dish.get("sentiment_score", 0.0) or 0.0),
-                    "recommendation_score": float(dish.get("recommendation_score", 0.0) or 0.0),
+                    "sentiment_score": dish["sentiment_score"],
+                    "recommendation_score": dish["recommendation_score"],
                     # Hybrid fields
-                    "topic_mentions": int(dish.get("topic_mentions", 0) or 0),
-                    "topic_score": float(dish.get("topic_score", 0.0) or 0.0),
-                    "final_score": float(dish.get("final_score", 0.0) or 0.0),
-                    "source": dish.get("source", "hybrid"),
-                    "restaurant_rating": float(restaurant.get("rating", 0.0) or 0.0),
-                    "confidence": float(dish.get("confidence_score", 0.5) or 0.5)
-                })
+                    "topic_mentions": dish.get("topic_mentions", 0),
+                    "topic_score": dish.get("topic_score", 0.0),
+                    "final_score": dish.get("final_score", dish.get("recommendation_score", 0.0)),
+                    "source": dish.get("source", "sentiment"),
+                    "restaurant_rating": restaurant["rating"],
+                    "confidence": dish.get("confidence_score", 0.5)
+                }
+                recommendations.append(recommendation)
+        
+        # Drop repeated (dish_name, restaurant_id) pairs; topics-first recs come first and win
+        recommendations = _dedupe_recommendations(recommendations)
+        
+        # Prefer higher final_score when available
+        recommendations = heapq.nlargest(
+            max_results, recommendations, key=lambda r: r.get("final_score", r.get("recommendation_score", 0.0))
+        )
+        return recommendations, False, None
+    
+    async def _location_cuisine_topic_recommendations(self, location: str, city: str, neighborhood: Optional[str],
+                                                      cuisine_type: str, max_results: int) -> List[Dict[str, Any]]:
+        """Topics-first path of location + cuisine queries: top hybrid dishes in the city/neighborhood."""
+        try:
+            topic_dishes = await self._search_dishes_with_topics(cuisine_type, max_results * 3)
+            app_logger.info(f"🔍 Topics-first: found {len(topic_dishes)} {cuisine_type} dishes with topics")
 
-            # Sort by final_score desc and take top results
-            if filtered_topic_dishes:
-                filtered_topic_dishes.sort(key=lambda r: r.get("final_score", 0.0), reverse=True)
-                top_topic_recs = filtered_topic_dishes[:max_results]
-                # If we have enough, return immediately
-                if len(top_topic_recs) >= max_results:
-                    return top_topic_recs, False, None
-                # Otherwise keep them and backfill using restaurant-based flow below
-                topic_backfill = top_topic_recs
-            else:
-                topic_backfill = []
+            # Filter by city/neighborhood via restaurant details
+            restaurants_by_id = await self._get_restaurant_details_bulk([dish.get("restaurant_id", "") for dish in topic_dishes])
+            # Apply the city/neighborhood filter once per restaurant, then join dishes against it
+            neighborhood_lower = neighborhood.lower() if neighborhood else None
+            eligible_restaurants = {
+                restaurant_id: restaurant
+                for restaurant_id, restaurant in restaurants_by_id.items()
+                if restaurant.get("city") == city
+                and not (neighborhood_lower and restaurant.get("neighborhood") and neighborhood_lower not in restaurant["neighborhood"].lower())
+            }
+            candidates = [dish for dish in topic_dishes if dish.get("restaurant_id", "") in eligible_restaurants]
+
+            # Rank the raw rows by final_score and only build recommendations for the ones kept
+            top_dishes = heapq.nlargest(max_results, candidates, key=_topic_dish_score)
+            return [
+                _topic_dish_recommendation(dish, eligible_restaurants[dish["restaurant_id"]], location, cuisine_type)
+                for dish in top_dishes
+            ]
         except Exception as e:
             app_logger.warning(f"Topics-first retrieval failed: {e}")
-            topic_backfill = []
-
-        # 2) Backfill via restaurant-first flow
+            return []
+    
+    async def _location_cuisine_restaurants(self, city: str, neighborhood: Optional[str],
+                                            cuisine_type: str, max_results: int) -> List[Dict]:
+        """Restaurant-first backfill path of location + cuisine queries: matching restaurants."""
         # Search for restaurants in location with cuisine type
         filters = {
             "city": city,
@@ -224,54 +313,7 @@ class RetrievalEngine:
             }
             restaurants = await self._search_restaurants_with_filters(city_filters, max_results)
         
-        if not restaurants:
-            return [], False, f"No {cuisine_type} restaurants found in {location}"
-        
-        # Get top dishes for each restaurant with deduplication
-        recommendations: List[Dict[str, Any]] = []
-        seen_dishes = set()  # Track (dish_name, restaurant_id) combinations
-        
-        # Seed with any topic-based recs we already have
-        if topic_backfill:
-            for rec in topic_backfill:
-                dish_key = (rec["dish_name"], rec["restaurant_id"])
-                if dish_key not in seen_dishes:
-                    recommendations.append(rec)
-                    seen_dishes.add(dish_key)
-        
-        for restaurant in restaurants[:3]:  # Top 3 restaurants
-            dishes = await self._get_restaurant_dishes(restaurant["restaurant_id"], 3)
-            
-            for dish in dishes:
-                dish_key = (dish["dish_name"], restaurant["restaurant_id"])
-                if dish_key in seen_dishes:
-                    continue  # Skip duplicates
-                seen_dishes.add(dish_key)
-                
-                recommendation = {
-                    "type": "dish",
-                    "dish_name": dish["dish_name"],
-                    "restaurant_name": restaurant["restaurant_name"],
-                    "restaurant_id": restaurant["restaurant_id"],
-                    "cuisine_type": cuisine_type,
-                    "location": location,
-                    "neighborhood": restaurant.get("neighborhood", ""),
-                    "sentiment_score": dish["sentiment_score"],
-                    "recommendation_score": dish["recommendation_score"],
-                    # Hybrid fields
-                    "topic_mentions": dish.get("topic_mentions", 0),
-                    "topic_score": dish.get("topic_score", 0.0),
-                    "final_score": dish.get("final_score", dish.get("recommendation_score", 0.0)),
-                    "source": dish.get("source", "sentiment"),
-                    "restaurant_rating": restaurant["rating"],
-                    "confidence": dish.get("confidence_score", 0.5)
-                }
-                recommendations.append(recommendation)
-        
-        # Prefer higher final_score when available
-        recommendations.sort(key=lambda r: r.get("final_score", r.get("recommendation_score", 0.0)), reverse=True)
-        recommendations = recommendations[:max_results]
-        return recommendations, False, None
+        return restaurants
     
     async def _handle_location_dish_query(self, parsed_query: Dict[str, Any], max_results: int) -> Tuple[List[Dict], bool, Optional[str]]:
         """Handle location + dish queries (e.g., "I am in Jersey City and in mood to eat Chicken Biryani")."""
@@ -293,54 +335,33 @@ class RetrievalEngine:
         # 1) Topics-first: prefer hybrid topic dishes, biasing matches to the requested dish
         topic_recommendations: List[Dict[str, Any]] = []
         try:
-            topic_dishes = self.milvus_client.search_dishes_with_topics(cuisine=cuisine_type, limit=max_results * 4)
-            filtered: List[Dict[str, Any]] = []
-            for dish in topic_dishes:
-                restaurant = await self._get_restaurant_details(dish.get("restaurant_id", ""))
-                if not restaurant:
-                    continue
-                if restaurant.get("city") != city:
-                    continue
-                if neighborhood and restaurant.get("neighborhood") and neighborhood.lower() not in restaurant.get("neighborhood", "").lower():
-                    continue
-                # Build rec
-                rec = {
-                    "type": "dish",
-                    "dish_name": dish.get("dish_name", "Unknown"),
-                    "restaurant_name": restaurant.get("restaurant_name", "Unknown"),
-                    "restaurant_id": restaurant.get("restaurant_id", ""),
-                    "location": location,
-                    "neighborhood": restaurant.get("neighborhood", ""),
-                    "cuisine_type": cuisine_type or restaurant.get("cuisine_type"),
-                    "sentiment_score": float(dish.get("sentiment_score", 0.0) or 0.0),
-                    "recommendation_score": float(dish.get("recommendation_score", 0.0) or 0.0),
-                    # Hybrid fields
-                    "topic_mentions": int(dish.get("topic_mentions", 0) or 0),
-                    "topic_score": float(dish.get("topic_score", 0.0) or 0.0),
-                    "final_score": float(dish.get("final_score", 0.0) or 0.0),
-                    "source": dish.get("source", "hybrid"),
-                    "restaurant_rating": float(restaurant.get("rating", 0.0) or 0.0),
-                    "confidence": float(dish.get("confidence_score", 0.5) or 0.5)
-                }
-                # Add a simple match flag to bias exact/substring matches
-                dn = rec["dish_name"] or ""
-                match_flag = 1 if (dish_name.lower() in dn.lower() or dn.lower() in dish_name.lower()) else 0
-                rec["_match_bias"] = match_flag
-                filtered.append(rec)
+            topic_dishes = await self._search_dishes_with_topics(cuisine_type, max_results * 4)
+            restaurants_by_id = await self._get_restaurant_details_bulk([dish.get("restaurant_id", "") for dish in topic_dishes])
+            neighborhood_lower = neighborhood.lower() if neighborhood else None
+            eligible_restaurants = {
+                restaurant_id: restaurant
+                for restaurant_id, restaurant in restaurants_by_id.items()
+                if restaurant.get("city") == city
+                and not (neighborhood_lower and restaurant.get("neighborhood") and neighborhood_lower not in restaurant["neighborhood"].lower())
+            }
+            candidates = [dish for dish in topic_dishes if dish.get("restaurant_id", "") in eligible_restaurants]
+            
+            # Sort: exact/substring matches of the requested dish first, then by final_score
+            dish_name_lower = dish_name.lower()
+            
+            def rank_key(dish: Dict[str, Any]) -> Tuple[int, float]:
+                dn = (dish.get("dish_name", "Unknown") or "").lower()
+                match_bias = 1 if (dish_name_lower in dn or dn in dish_name_lower) else 0
+                return match_bias, _topic_dish_score(dish)
 
-            if filtered:
-                # Sort: exact/substring matches first, then by final_score
-                filtered.sort(key=lambda r: (r.get("_match_bias", 0), r.get("final_score", 0.0)), reverse=True)
-                topic_recommendations = filtered[:max_results]
+            if candidates:
+                # Only build recommendations for the rows that survive ranking
+                topic_recommendations = [
+                    _topic_dish_recommendation(dish, eligible_restaurants[dish["restaurant_id"]], location, cuisine_type)
+                    for dish in heapq.nlargest(max_results, candidates, key=rank_key)
+                ]
                 if len(topic_recommendations) >= max_results:
-                    # Remove helper key
-                    for r in topic_recommendations:
-                        r.pop("_match_bias", None)
                     return topic_recommendations, False, None
-                for r in filtered:
-                    r.pop("_match_bias", None)
-                    if len(topic_recommendations) < max_results:
-                        topic_recommendations.append(r)
         except Exception as e:
             app_logger.warning(f"Topics-first (location_dish) failed: {e}")
             topic_recommendations = []
@@ -405,9 +426,9 @@ class RetrievalEngine:
             recommendations.extend(topic_recommendations)
         restaurants_to_rank = []
         
+        restaurants_by_id = await self._get_restaurant_details_bulk([dish["restaurant_id"] for dish in dishes])
         for dish in dishes:
-            restaurant = await self._get_restaurant_details(dish["restaurant_id"])
-            
+            restaurant = restaurants_by_id.get(dish["restaurant_id"])
             if restaurant:
                 # Add dish info to restaurant for ranking
                 restaurant_with_dish = {
@@ -451,8 +472,9 @@ class RetrievalEngine:
                 recommendations.append(recommendation)
         
         # Prefer higher final_score when available
-        recommendations.sort(key=lambda r: r.get("final_score", r.get("recommendation_score", 0.0)), reverse=True)
-        recommendations = recommendations[:max_results]
+        recommendations = heapq.nlargest(
+            max_results, recommendations, key=lambda r: r.get("final_score", r.get("recommendation_score", 0.0))
+        )
         return recommendations, False, None
     
     async def _handle_location_general_query(self, parsed_query: Dict[str, Any], max_results: int) -> Tuple[List[Dict], bool, Optional[str]]:
@@ -465,35 +487,19 @@ class RetrievalEngine:
         # 1) Topics-first: popular dishes in this city
         topic_first_recs: List[Dict[str, Any]] = []
         try:
-            topic_dishes = self.milvus_client.search_dishes_with_topics(limit=max_results * 4)
-            filtered: List[Dict[str, Any]] = []
-            for dish in topic_dishes:
-                restaurant = await self._get_restaurant_details(dish.get("restaurant_id", ""))
-                if not restaurant:
-                    continue
-                if restaurant.get("city") != location:
-                    continue
-                filtered.append({
-                    "type": "dish",
-                    "dish_name": dish.get("dish_name", "Unknown"),
-                    "restaurant_name": restaurant.get("restaurant_name", "Unknown"),
-                    "restaurant_id": restaurant.get("restaurant_id", ""),
-                    "location": location,
-                    "neighborhood": restaurant.get("neighborhood", ""),
-                    "cuisine_type": restaurant.get("cuisine_type"),
-                    "sentiment_score": float(dish.get("sentiment_score", 0.0) or 0.0),
-                    "recommendation_score": float(dish.get("recommendation_score", 0.0) or 0.0),
-                    # Hybrid fields
-                    "topic_mentions": int(dish.get("topic_mentions", 0) or 0),
-                    "topic_score": float(dish.get("topic_score", 0.0) or 0.0),
-                    "final_score": float(dish.get("final_score", 0.0) or 0.0),
-                    "source": dish.get("source", "hybrid"),
-                    "restaurant_rating": float(restaurant.get("rating", 0.0) or 0.0),
-                    "confidence": float(dish.get("confidence_score", 0.5) or 0.5)
-                })
-            if filtered:
-                filtered.sort(key=lambda r: r.get("final_score", 0.0), reverse=True)
-                topic_first_recs = filtered[:max_results]
+            topic_dishes = await self._search_dishes_with_topics(None, max_results * 4)
+            restaurants_by_id = await self._get_restaurant_details_bulk([dish.get("restaurant_id", "") for dish in topic_dishes])
+            eligible_restaurants = {
+                restaurant_id: restaurant
+                for restaurant_id, restaurant in restaurants_by_id.items()
+                if restaurant.get("city") == location
+            }
+            candidates = [dish for dish in topic_dishes if dish.get("restaurant_id", "") in eligible_restaurants]
+            if candidates:
+                topic_first_recs = [
+                    _topic_dish_recommendation(dish, eligible_restaurants[dish["restaurant_id"]], location, None)
+                    for dish in heapq.nlargest(max_results, candidates, key=_topic_dish_score)
+                ]
                 if len(topic_first_recs) >= max_results:
                     return topic_first_recs, False, None
         except Exception as e:
@@ -524,27 +530,15 @@ class RetrievalEngine:
             restaurants, location
         )
         
-        # Get top dishes for each ranked restaurant with deduplication
-        recommendations: List[Dict[str, Any]] = []
-        seen_dishes = set()  # Track (dish_name, restaurant_id) combinations
-        
-        # Seed with topics-first recs if any
-        if topic_first_recs:
-            for rec in topic_first_recs:
-                dish_key = (rec["dish_name"], rec["restaurant_id"])
-                if dish_key not in seen_dishes:
-                    recommendations.append(rec)
-                    seen_dishes.add(dish_key)
-        
-        for restaurant in ranked_restaurants[:3]:  # Top 3 restaurants
-            dishes = await self._get_restaurant_dishes(restaurant["restaurant_id"], 2)
-            
+        # Seed with topics-first recs if any, then add top dishes for each ranked restaurant
+        recommendations: List[Dict[str, Any]] = list(topic_first_recs)
+        
+        top_restaurants = ranked_restaurants[:3]  # Top 3 restaurants
+        restaurant_dishes = await self._get_restaurant_dishes_many(
+            [restaurant["restaurant_id"] for restaurant in top_restaurants], 2
+        )
+        for restaurant, dishes in zip(top_restaurants, restaurant_dishes):
             for dish in dishes:
-                dish_key = (dish["dish_name"], restaurant["restaurant_id"])
-                if dish_key in seen_dishes:
-                    continue  # Skip duplicates
-                seen_dishes.add(dish_key)
-                
                 recommendation = {
                     "type": "dish",
                     "dish_name": dish["dish_name"],
@@ -567,9 +561,13 @@ class RetrievalEngine:
                 }
                 recommendations.append(recommendation)
         
+        # Drop repeated (dish_name, restaurant_id) pairs; topics-first recs come first and win
+        recommendations = _dedupe_recommendations(recommendations)
+        
         # Prefer higher final_score when available
-        recommendations.sort(key=lambda r: r.get("final_score", r.get("recommendation_score", 0.0)), reverse=True)
-        recommendations = recommendations[:max_results]
+        recommendations = heapq.nlargest(
+            max_results, recommendations, key=lambda r: r.get("final_score", r.get("recommendation_score", 0.0))
+        )
         return recommendations, False, None
     
     async def _handle_meal_type_query(self, parsed_query: Dict[str, Any], max_results: int) -> Tuple[List[Dict], bool, Optional[str]]:
@@ -618,9 +616,10 @@ class RetrievalEngine:
         # Generate embedding for restaurant name
         query_vector = await self._generate_embedding(restaurant_name)
         
-        # Search in Milvus
-        restaurants = self.milvus_client.search_restaurants(
-            query_vector, 
+        # Search in Milvus (off the event loop; MilvusClient is synchronous)
+        restaurants = await asyncio.to_thread(
+            self.milvus_client.search_restaurants,
+            query_vector,
             filters={"restaurant_name": restaurant_name},
             limit=5
         )
@@ -630,21 +629,45 @@ class RetrievalEngine:
     async def _search_restaurants_with_filters(self, filters: Dict, max_results: int) -> List[Dict]:
         """Search restaurants with filters and rank by quality score."""
         # Use filter search directly (no vector search needed for filters)
-        # Note: MilvusClient.search_restaurants_with_filters is NOT async, so don't await it
-        restaurants = self.milvus_client.search_restaurants_with_filters(
+        # Note: MilvusClient.search_restaurants_with_filters is NOT async, so run it in a thread
+        restaurants = await asyncio.to_thread(
+            self.milvus_client.search_restaurants_with_filters,
             filters,
             limit=max_results
         )
         
         return restaurants  # Already sorted by quality_score in milvus_client
     
+    async def _search_dishes_with_topics(self, cuisine: Optional[str], limit: int) -> List[Dict]:
+        """Topics-first dish search, served from the engine's bounded TTL LRU when fresh.
+        
+        Empty results (which is also what the client returns on error) are never cached.
+        The returned rows are shared with the cache and must not be mutated.
+        """
+        key = (cuisine, limit)
+        cached = self._topic_dishes_cache.get(key)
+        if cached is not None:
+            cached_at, dishes = cached
+            if time.monotonic() - cached_at < TOPIC_DISHES_CACHE_TTL_SECONDS:
+                self._topic_dishes_cache.move_to_end(key)
+                return dishes
+            del self._topic_dishes_cache[key]
+        
+        dishes = await self.milvus_client.async_search_dishes_with_topics(cuisine=cuisine, limit=limit)
+        if dishes:
+            self._topic_dishes_cache[key] = (time.monotonic(), dishes)
+            if len(self._topic_dishes_cache) > TOPIC_DISHES_CACHE_MAX_SIZE:
+                self._topic_dishes_cache.popitem(last=False)
+        return dishes
+    
     async def _search_dishes_by_name_and_location(self, dish_name: str, location: str, max_results: int) -> List[Dict]:
         """Search dishes by name and location."""
         # Generate embedding for dish name
         query_vector = await self._generate_embedding(dish_name)
         
-        # Search in Milvus
-        dishes = self.milvus_client.search_dishes(
+        # Search in Milvus (off the event loop; MilvusClient is synchronous)
+        dishes = await asyncio.to_thread(
+            self.milvus_client.search_dishes,
             query_vector,
             filters={"normalized_dish_name": dish_name},
             limit=max_results
@@ -652,8 +675,9 @@ class RetrievalEngine:
         
         # Filter by location with neighborhood support
         filtered_dishes = []
+        restaurants_by_id = await self._get_restaurant_details_bulk([dish["restaurant_id"] for dish in dishes])
         for dish in dishes:
-            restaurant = await self._get_restaurant_details(dish["restaurant_id"])
+            restaurant = restaurants_by_id.get(dish["restaurant_id"])
             if restaurant and self._is_location_match(restaurant, location):
                 filtered_dishes.append(dish)
         
@@ -667,7 +691,9 @@ class RetrievalEngine:
         neutral_query = "restaurant dishes menu"
         query_vector = [0.0] * self.settings.vector_dimension  # Use zero vector for simple filtering
         
-        dishes = self.milvus_client.search_dishes(
+        # MilvusClient is synchronous; run it off the event loop so fan-outs overlap
+        dishes = await asyncio.to_thread(
+            self.milvus_client.search_dishes,
             query_vector,
             filters={"restaurant_id": restaurant_id},
             limit=limit
@@ -680,24 +706,85 @@ class RetrievalEngine:
     
     async def _get_restaurant_details(self, restaurant_id: str) -> Optional[Dict]:
         """Get restaurant details by ID."""
-        # Use search with filter to get specific restaurant
-        # We use a neutral query vector since we're filtering by restaurant_id
-        neutral_query = "restaurant details"
-        query_vector = await self._generate_embedding(neutral_query)
+        restaurants_by_id = await self._get_restaurant_details_bulk([restaurant_id])
+        return restaurants_by_id.get(restaurant_id)
+    
+    async def _get_restaurant_details_bulk(self, restaurant_ids: List[str]) -> Dict[str, Dict]:
+        """Get restaurant details for many IDs, keyed by restaurant_id.
+        
+        IDs are served from the engine's bounded TTL LRU when possible; the rest are
+        fetched with scalar "restaurant_id in [...]" queries (one per
+        RESTAURANT_BULK_CHUNK_SIZE IDs) instead of one vector search per restaurant.
+        IDs that are empty or not found are simply absent from the result. The
+        returned dicts are shared with the cache and must not be mutated.
+        """
+        now = time.monotonic()
+        restaurants_by_id: Dict[str, Dict] = {}
+        missing_ids: List[str] = []
+        for restaurant_id in dict.fromkeys(restaurant_ids):
+            if not restaurant_id:
+                continue
+            cached = self._restaurant_cache.get(restaurant_id)
+            if cached is not None:
+                cached_at, restaurant = cached
+                if now - cached_at < RESTAURANT_CACHE_TTL_SECONDS:
+                    self._restaurant_cache.move_to_end(restaurant_id)
+                    restaurants_by_id[restaurant_id] = restaurant
+                    continue
+                del self._restaurant_cache[restaurant_id]
+            missing_ids.append(restaurant_id)
+        
+        if not missing_ids:
+            return restaurants_by_id
+        
+        chunks = [
+            missing_ids[i:i + RESTAURANT_BULK_CHUNK_SIZE]
+            for i in range(0, len(missing_ids), RESTAURANT_BULK_CHUNK_SIZE)
+        ]
+        # MilvusClient is synchronous; run it off the event loop so chunks overlap
+        results = await asyncio.gather(*(
+            asyncio.to_thread(
+                self.milvus_client.search_restaurants_with_filters,
+                {"restaurant_id": chunk},
+                limit=len(chunk)
+            )
+            for chunk in chunks
+        ))
         
-        restaurants = self.milvus_client.search_restaurants(
-            query_vector,
-            filters={"restaurant_id": restaurant_id},
-            limit=1
-        )
+        fetched_at = time.monotonic()
+        for restaurants in results:
+            for restaurant in restaurants:
+                restaurant_id = restaurant["restaurant_id"]
+                restaurants_by_id[restaurant_id] = restaurant
+                self._restaurant_cache[restaurant_id] = (fetched_at, restaurant)
+                self._restaurant_cache.move_to_end(restaurant_id)
+        while len(self._restaurant_cache) > RESTAURANT_CACHE_MAX_SIZE:
+            self._restaurant_cache.popitem(last=False)
+        
+        return restaurants_by_id
+    
+    async def _get_restaurant_dishes_many(self, restaurant_ids: List[str], limit: int = 5) -> List[List[Dict]]:
+        """Get top dishes for several restaurants concurrently, in input order.
+        
+        Each distinct restaurant is queried once; repeated IDs share the same result list.
+        """
+        semaphore = asyncio.Semaphore(RESTAURANT_FETCH_CONCURRENCY)
+        
+        async def one(restaurant_id: str) -> List[Dict]:
+            async with semaphore:
+                return await self._get_restaurant_dishes(restaurant_id, limit)
         
-        return restaurants[0] if restaurants else None
+        unique_ids = list(dict.fromkeys(restaurant_ids))
+        results = await asyncio.gather(*(one(restaurant_id) for restaurant_id in unique_ids))
+        dishes_by_id = dict(zip(unique_ids, results))
+        return [dishes_by_id[restaurant_id] for restaurant_id in restaurant_ids]
     
     async def _get_restaurant_count_by_location(self, location: str) -> int:
         """Get total restaurant count for a location."""
         # Use filter search to get restaurants in location
         filters = self._get_location_filters(location)
-        restaurants = self.milvus_client.search_restaurants_with_filters(
+        restaurants = await asyncio.to_thread(
+            self.milvus_client.search_restaurants_with_filters,
             filters,
             limit=1000  # High limit to get approximate count
         )
@@ -796,7 +883,9 @@ class RetrievalEngine:
     
     async def get_restaurant_details(self, restaurant_id: str) -> Optional[Dict]:
         """Get detailed restaurant information."""
-        return await self._get_restaurant_details(restaurant_id)
+        restaurant = await self._get_restaurant_details(restaurant_id)
+        # Hand callers their own copy; the cached details are shared
+        return dict(restaurant) if restaurant else None
     
     async def get_restaurant_dishes(self, restaurant_id: str, limit: int = 5) -> List[Dict]:
         """Get top dishes for a restaurant."""
@@ -808,7 +897,8 @@ class RetrievalEngine:
         neutral_query = "dish details"
         query_vector = await self._generate_embedding(neutral_query)
         
-        dishes = self.milvus_client.search_dishes(
+        dishes = await asyncio.to_thread(
+            self.milvus_client.search_dishes,
             query_vector,
             filters={"dish_id": dish_id},
             limit=1
@@ -1,6 +1,7 @@
 """
 Configuration management for the Sweet Morsels RAG application.
 """
+import functools
 import os
 from typing import Optional, List
 
@@ -61,6 +62,7 @@ if PYDANTIC_AVAILABLE:
         
         # Vector Database Configuration
         vector_dimension: int = Field(1536, description="Vector dimension")
+        embedding_cache_path: Optional[str] = Field(None, description="SQLite file for persisting query embeddings across restarts")
         similarity_threshold: float = Field(0.7, description="Similarity threshold")
         
         # Cost Management
@@ -114,6 +116,7 @@ else:
             self.max_retries = int(os.getenv("MAX_RETRIES", "3"))
             self.retry_delay = float(os.getenv("RETRY_DELAY", "1.0"))
             self.vector_dimension = int(os.getenv("VECTOR_DIMENSION", "1536"))
+            self.embedding_cache_path = os.getenv("EMBEDDING_CACHE_PATH")
             self.similarity_threshold = float(os.getenv("SIMILARITY_THRESHOLD", "0.7"))
             self.monthly_budget = float(os.getenv("MONTHLY_BUDGET", "90.0"))
             self.cost_alert_threshold = float(os.getenv("COST_ALERT_THRESHOLD", "0.8"))
@@ -129,8 +132,9 @@ except Exception as e:
     settings = None
 
 
+@functools.lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get the global settings instance."""
+    """Get the global settings instance (built once, even on the fallback path)."""
     if settings is None:
         # Create a minimal settings object for deployment
         return Settings()
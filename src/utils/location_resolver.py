@@ -2,12 +2,16 @@
 Location resolver for mapping neighborhoods to parent cities.
 Focused implementation for Manhattan to solve location resolution issues.
 """
+from collections import OrderedDict
 from typing import Dict, Optional, Tuple, List
 from dataclasses import dataclass
 from src.utils.logger import app_logger
 
+# Resolutions are pure functions of the location string, so recent ones are memoized
+RESOLVE_CACHE_MAX_SIZE = 4096
 
-@dataclass
+
+@dataclass(frozen=True)
 class LocationInfo:
     """Information about a resolved location."""
     original_location: str
@@ -97,6 +101,12 @@ class LocationResolver:
             "newark",
             "los angeles", "la", "chicago", "boston", "washington dc", "dc"
         }
+        
+        # Individual words of the unsupported locations, for single-word matching
+        self._unsupported_words = {word for unsupported in self.unsupported_locations for word in unsupported.split()}
+        
+        # location string -> LocationInfo (immutable, so entries are shared), in LRU order
+        self._resolved: "OrderedDict[str, LocationInfo]" = OrderedDict()
     
     def resolve_location(self, location_str: str) -> LocationInfo:
         """
@@ -108,6 +118,19 @@ class LocationResolver:
         Returns:
             LocationInfo with resolved location details
         """
+        location_info = self._resolved.get(location_str)
+        if location_info is not None:
+            self._resolved.move_to_end(location_str)
+            return location_info
+        
+        location_info = self._resolve_location_uncached(location_str)
+        self._resolved[location_str] = location_info
+        if len(self._resolved) > RESOLVE_CACHE_MAX_SIZE:
+            self._resolved.popitem(last=False)
+        return location_info
+    
+    def _resolve_location_uncached(self, location_str: str) -> LocationInfo:
+        """Resolve a location string without consulting the memo."""
         if not location_str:
             return LocationInfo(
                 original_location="",
@@ -223,17 +246,12 @@ class LocationResolver:
                 
         # Finally check for single word matches, but be more careful
         location_words = set(location_lower.split())
-        unsupported_words = set()
-        
-        # Add individual words from unsupported locations
-        for unsupported in self.unsupported_locations:
-            unsupported_words.update(unsupported.split())
         
         # Check for exact word matches, but exclude if the location is already supported
         if location_lower in self.supported_locations:
             return False
             
-        return bool(location_words.intersection(unsupported_words))
+        return bool(location_words.intersection(self._unsupported_words))
     
     def _fuzzy_match(self, query_location: str, known_location: str) -> bool:
         """Simple fuzzy matching for location names."""
@@ -427,6 +427,10 @@ class DiscoveryCollections:
             collection.create_index("restaurant_count", {"index_type": "STL_SORT"})
             collection.create_index("confidence_score", {"index_type": "STL_SORT"})
             
+            # Inverted indexes on filter terms: Milvus resolves them to a bitset before the ANN walk
+            collection.create_index("city", {"index_type": "INVERTED"})
+            collection.create_index("primary_cuisine", {"index_type": "INVERTED"})
+            
             app_logger.info("Created indexes for popular_dishes collection")
             
         except Exception as e:
@@ -454,6 +458,11 @@ class DiscoveryCollections:
             collection.create_index("quality_score", {"index_type": "STL_SORT"})
             collection.create_index("price_range", {"index_type": "STL_SORT"})
             
+            # Inverted indexes on filter terms: Milvus resolves them to a bitset before the ANN walk
+            collection.create_index("city", {"index_type": "INVERTED"})
+            collection.create_index("cuisine_type", {"index_type": "INVERTED"})
+            collection.create_index("restaurant_name", {"index_type": "INVERTED"})
+            
             app_logger.info("Created indexes for famous_restaurants collection")
             
         except Exception as e:
@@ -484,6 +493,10 @@ class DiscoveryCollections:
             collection.create_index("dishes_extracted", {"index_type": "STL_SORT"})
             collection.create_index("analysis_confidence", {"index_type": "STL_SORT"})
             
+            # Inverted indexes on filter terms: Milvus resolves them to a bitset before the ANN walk
+            collection.create_index("city", {"index_type": "INVERTED"})
+            collection.create_index("cuisine_type", {"index_type": "INVERTED"})
+            
             app_logger.info("Created indexes for neighborhood_analysis collection")
             
         except Exception as e:
@@ -1055,6 +1055,20 @@ class MilvusClient:
             app_logger.error(f"Error searching dishes with topics: {e}")
             return []
 
+    async def async_search_dishes_with_topics(self, cuisine: str = None, neighborhood: str = None, limit: int = 10, order_by: str = "final_score") -> List[Dict]:
+        """Awaitable search_dishes_with_topics for async callers.
+
+        Reuses the client's persistent connection; the blocking pymilvus query runs in a
+        worker thread so it does not stall the event loop.
+        """
+        return await asyncio.to_thread(
+            self.search_dishes_with_topics,
+            cuisine=cuisine,
+            neighborhood=neighborhood,
+            limit=limit,
+            order_by=order_by
+        )
+
     # --------------------
     # Partition utilities
     # --------------------
@@ -1826,3 +1840,23 @@ class MilvusClient:
             app_logger.error(f"Error searching collection {collection_name}: {e}")
             return []
 
+    def query_collection(self, collection_name: str, filter_expr: str,
+                         limit: int = 10, output_fields: List[str] = None) -> List[Dict]:
+        """Generic scalar query (no vector search) for any collection."""
+        try:
+            collection = self._get_collection_by_name(collection_name)
+            if not collection:
+                app_logger.error(f"Collection {collection_name} not found")
+                return []
+                
+            collection.load()
+            
+            return collection.query(
+                expr=filter_expr,
+                limit=limit,
+                output_fields=output_fields or ["*"]
+            )
+            
+        except Exception as e:
+            app_logger.error(f"Error querying collection {collection_name}: {e}")
+            return []
@@ -22,6 +22,27 @@ try:
 except ImportError:
     get_settings = None
 
+# Faster JSON decoding for Milvus responses when orjson is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _json_loads = orjson.loads
+except ImportError:
+    ORJSON_AVAILABLE = False
+    _json_loads = json.loads
+
+# HTTP/2 needs the optional h2 package; fall back to pooled HTTP/1.1 without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Connection pool tuning for the shared httpx client
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+HTTP_MAX_CONNECTIONS = 64
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
 
 class MilvusHTTPClient:
     """HTTP-based Milvus client for Vercel compatibility."""
@@ -61,26 +82,44 @@ class MilvusHTTPClient:
             self.timeout = 30.0
             app_logger.info("Using direct environment variable access for Milvus HTTP client")
         
+        # Shared pooled HTTP client, created on first request
+        self._client: Optional[httpx.AsyncClient] = None
+        
         # Cache for successful endpoints
         self._successful_endpoints = {}
         # Cache for collection schemas
         self._collection_schemas = {}
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared keep-alive client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS
+                )
+            )
+        return self._client
+    
     async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """Make HTTP request to Milvus API."""
         url = f"{self.base_url}{endpoint}"
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                if method.upper() == "GET":
-                    response = await client.get(url, headers=self.headers)
-                elif method.upper() == "POST":
-                    response = await client.post(url, headers=self.headers, json=data)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-                
-                response.raise_for_status()
-                return response.json()
+            client = self._get_client()
+            if method.upper() == "GET":
+                response = await client.get(url, headers=self.headers)
+            elif method.upper() == "POST":
+                response = await client.post(url, headers=self.headers, json=data)
+            else:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+            
+            response.raise_for_status()
+            # Decode the raw body directly instead of going through httpx's text decoding
+            return _json_loads(response.content)
                 
         except httpx.HTTPStatusError as e:
             app_logger.error(f"Milvus HTTP error: {e.response.status_code} - {e.response.text}")
@@ -323,8 +362,48 @@ class MilvusHTTPClient:
             app_logger.error(f"Error getting collection stats: {e}")
             return {}
     
-    async def search_dishes_with_topics(self, cuisine: Optional[str], neighborhood: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search dishes using pure vector similarity search with cuisine filtering."""
+    @staticmethod
+    def _like_filter(field: str, value: str) -> str:
+        """Build a substring LIKE predicate; Milvus LIKE is case-sensitive, so match common casings.
+        
+        Known behavior change from the case-insensitive Python filter this replaced: only
+        the original, lower and title casings are matched, so e.g. "BBQ" does not find "Bbq".
+        """
+        def escape(term: str) -> str:
+            # LIKE wildcards first, then the string literal (backslashes and quotes)
+            term = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            return term.replace('\\', '\\\\').replace('"', '\\"')
+        
+        variants = dict.fromkeys(escape(v) for v in (value, value.lower(), value.title()))
+        return "(" + " or ".join(f'{field} like "%{variant}%"' for variant in variants) + ")"
+    
+    def _name_filter(self, collection_name: str, dish_name_like: Optional[str],
+                     restaurant_name_like: Optional[str]) -> Optional[str]:
+        """LIKE predicates for one collection, or None if it lacks a filtered field.
+        
+        Rows without the field could never match the filter, so such collections are
+        skipped instead of being sent a query Milvus would reject.
+        """
+        name = collection_name.lower()
+        name_filters = []
+        if dish_name_like:
+            if "neighborhood_analysis" not in name:
+                return None
+            name_filters.append(self._like_filter("top_dish_name", dish_name_like))
+        if restaurant_name_like:
+            if "neighborhood_analysis" not in name and "famous_restaurants" not in name:
+                return None
+            name_filters.append(self._like_filter("restaurant_name", restaurant_name_like))
+        return " and ".join(name_filters)
+    
+    async def search_dishes_with_topics(self, cuisine: Optional[str], neighborhood: Optional[str] = None, limit: int = 10,
+                                        dish_name_like: Optional[str] = None,
+                                        restaurant_name_like: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search dishes using pure vector similarity search with cuisine filtering.
+        
+        ``dish_name_like`` / ``restaurant_name_like`` are pushed to Milvus as LIKE
+        predicates so only matching rows are returned.
+        """
         try:
             app_logger.info(f"🔍 Starting pure vector similarity search for cuisine: {cuisine}, neighborhood: {neighborhood}, limit: {limit}")
             
@@ -353,7 +432,9 @@ class MilvusHTTPClient:
             
             # Query primary collection first using pure vector search
             app_logger.info(f"Querying primary collection: {primary_collection} with pure vector search")
-            primary_results = await self._pure_vector_search(primary_collection, limit, cuisine)
+            # neighborhood_analysis has every name field, so this is never None
+            primary_filter = self._name_filter(primary_collection, dish_name_like, restaurant_name_like) or ""
+            primary_results = await self._pure_vector_search(primary_collection, limit, cuisine, primary_filter)
             
             # Add collection source to primary results
             for item in primary_results:
@@ -374,8 +455,12 @@ class MilvusHTTPClient:
                 app_logger.info(f"Need {remaining_limit} more results, querying secondary collections...")
                 
                 for collection_name in secondary_collections:
+                    extra_filter = self._name_filter(collection_name, dish_name_like, restaurant_name_like)
+                    if extra_filter is None:
+                        app_logger.info(f"Skipping {collection_name}: no field for the requested name filter")
+                        continue
                     app_logger.info(f"Querying secondary collection: {collection_name} with pure vector search")
-                    collection_results = await self._pure_vector_search(collection_name, remaining_limit, cuisine)
+                    collection_results = await self._pure_vector_search(collection_name, remaining_limit, cuisine, extra_filter)
                     
                     # Add collection source to results
                     for item in collection_results:
@@ -401,7 +486,7 @@ class MilvusHTTPClient:
             app_logger.error(f"Error in pure vector search: {e}")
             return []
     
-    async def _pure_vector_search(self, collection_name: str, limit: int, cuisine: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def _pure_vector_search(self, collection_name: str, limit: int, cuisine: Optional[str] = None, extra_filter: str = "") -> List[Dict[str, Any]]:
         """Perform search based on collection type - vector search for neighborhood_analysis, query for others."""
         try:
             app_logger.info(f"🔍 Performing search on {collection_name} with limit {limit}")
@@ -412,16 +497,16 @@ class MilvusHTTPClient:
             # Check if this collection has vector field (neighborhood_analysis does)
             if "neighborhood_analysis" in collection_name.lower():
                 app_logger.info(f"Using vector search for {collection_name}")
-                return await self._try_vector_search(collection_name, limit, output_fields, cuisine)
+                return await self._try_vector_search(collection_name, limit, output_fields, cuisine, extra_filter)
             else:
                 app_logger.info(f"Using query-only search for {collection_name}")
-                return await self._try_query_only_search(collection_name, limit, output_fields, cuisine)
+                return await self._try_query_only_search(collection_name, limit, output_fields, cuisine, extra_filter)
                 
         except Exception as e:
             app_logger.error(f"Error in search for {collection_name}: {e}")
             return []
     
-    async def _try_vector_search(self, collection_name: str, limit: int, output_fields: List[str], cuisine: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def _try_vector_search(self, collection_name: str, limit: int, output_fields: List[str], cuisine: Optional[str] = None, extra_filter: str = "") -> List[Dict[str, Any]]:
         """Try vector search for collections that have vector fields with cuisine filtering."""
         try:
             # Generate a proper embedding for the search query
@@ -455,6 +540,8 @@ class MilvusHTTPClient:
                 # Use simple exact match for cuisine filtering
                 filter_expr = f'cuisine_type == "{cuisine}"'
                 app_logger.info(f"Applying cuisine filter: {filter_expr}")
+            if extra_filter:
+                filter_expr = f"{filter_expr} and {extra_filter}" if filter_expr else extra_filter
             
             # Try different vector search payload formats with proper vector field
             # Build base payloads without filter first
@@ -513,7 +600,7 @@ class MilvusHTTPClient:
             app_logger.error(f"Error in vector search for {collection_name}: {e}")
             return []
     
-    async def _try_query_only_search(self, collection_name: str, limit: int, output_fields: List[str], cuisine: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def _try_query_only_search(self, collection_name: str, limit: int, output_fields: List[str], cuisine: Optional[str] = None, extra_filter: str = "") -> List[Dict[str, Any]]:
         """Try query-only search for collections without vector fields with cuisine filtering."""
         try:
             # Build filter expression for cuisine if provided
@@ -522,6 +609,8 @@ class MilvusHTTPClient:
                 # Use simple exact match for cuisine filtering
                 filter_expr = f'cuisine_type == "{cuisine}"'
                 app_logger.info(f"Applying cuisine filter: {filter_expr}")
+            if extra_filter:
+                filter_expr = f"{filter_expr} and {extra_filter}" if filter_expr else extra_filter
             
             # Try query-only formats (no vector similarity)
             # Build base payloads without filter first
@@ -937,7 +1026,13 @@ class MilvusHTTPClient:
         
         return results
 
+    async def aclose(self):
+        """Close the pooled HTTP client and its open connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     def close(self):
-        """Close the client (for compatibility)."""
-        # httpx clients are closed automatically with async context managers
+        """Close the client (for compatibility); prefer ``aclose`` from async code."""
+        # The pooled httpx client can only be closed from the event loop, see aclose()
         pass
\ No newline at end of file